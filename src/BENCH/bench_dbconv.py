@@ -0,0 +1,85 @@
+"""
+Module: BENCH_DBCONV
+
+Description: Batch dot-bracket <-> pair table conversion (DBCONV) of
+             structures of 100 and 1000 nt, as in the export of trajectory
+             checkpoints.
+
+Method: BENCH_DB2PT and BENCH_PT2DB convert distinct structures, each
+        the join of two RANDOM_FOLD halves. BENCH_DB2PT_TRAJ converts
+        NFOLD structures repeated, as the checkpoints of trajectories
+        that stay in the same fold, which DB2PT converts once each.
+        BENCH_PT2DB writes the tables unchecked, BENCH_PT2DB_CHECK with
+        the checks PT2DB makes by default.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Distinct structures, repeated and checked cases
+
+Dependencies: numpy, pytest-benchmark
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+import pytest
+
+from conftest import RANDOM_FOLD
+from dbconv import DB2PT, PT2DB
+
+# Nucleotides of a batch, folds of the repeated batch
+nbatch = 10000000
+nfold = 100
+
+
+def FOLDS(n):
+
+    # NBATCH/N distinct structures from pairs of halves
+
+    nhalf = int(np.sqrt(nbatch // n)) + 1
+
+    half = [ RANDOM_FOLD(n//2,iseed)[1] for iseed in range(nhalf) ]
+
+    return [ a + b for a in half for b in half ][:nbatch // n]
+
+
+def REPEATS(n):
+
+    flds = [ RANDOM_FOLD(n,iseed)[1] for iseed in range(nfold) ]
+
+    return flds * max(1,nbatch // (n * nfold))
+
+
+@pytest.mark.parametrize('n',[100,1000])
+def bench_db2pt(benchmark,n):
+
+    flds = FOLDS(n)
+
+    benchmark(DB2PT,flds)
+
+
+@pytest.mark.parametrize('n',[100,1000])
+def bench_db2pt_traj(benchmark,n):
+
+    flds = REPEATS(n)
+
+    benchmark(DB2PT,flds)
+
+
+@pytest.mark.parametrize('n',[100,1000])
+def bench_pt2db(benchmark,n):
+
+    pt = DB2PT(FOLDS(n))
+
+    benchmark(PT2DB,pt,check=False)
+
+
+@pytest.mark.parametrize('n',[100,1000])
+def bench_pt2db_check(benchmark,n):
+
+    pt = DB2PT(FOLDS(n))
+
+    benchmark(PT2DB,pt)
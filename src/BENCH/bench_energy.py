@@ -0,0 +1,59 @@
+"""
+Module: BENCH_ENERGY
+
+Description: Energy and rate layer benchmarks: ESTRUC on random structures
+             of 100, 1000 and 5000 nt, and LOOP_INIT (all loop energies
+             and reactions) on a fully paired and an unpaired strand.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: pytest-benchmark
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import pytest
+
+from conftest import RANDOM_FOLD, RANDOM_SEQ, HAIRPIN
+from pyfold import PYFOLD_SETUP
+from ENERGY.estruc import ESTRUC
+
+
+@pytest.mark.parametrize('n',[100,1000,5000])
+def bench_estruc(benchmark,params,n):
+
+    seq,fld = RANDOM_FOLD(n)
+
+    rna,ibpi,ibpf,istop = PYFOLD_SETUP(seq,fld,params=params,dgmemo=0)
+    rna.ibsp[:] = ibpi
+
+    e = benchmark(ESTRUC,rna.ekern,rna.ibsp,rna.n)
+
+    benchmark.extra_info['n'] = n
+    benchmark.extra_info['energy'] = e
+
+
+@pytest.mark.parametrize('fold',['paired','unpaired'])
+@pytest.mark.parametrize('n',[100,1000])
+def bench_loop_init(benchmark,params,fold,n):
+
+    if ( fold == 'paired' ):
+        seq,fld = HAIRPIN(n)
+    else:
+        seq,fld = RANDOM_SEQ(n),None
+
+    # no memo, every DELTAG_* is evaluated
+    rna,ibpi,ibpf,istop = PYFOLD_SETUP(seq,fld,params=params,dgmemo=0)
+
+    def run():
+        rna.ibsp[:] = ibpi
+        rna.LOOP_INIT()
+
+    benchmark(run)
+
+    benchmark.extra_info['n'] = n
+    benchmark.extra_info['nl'] = rna.nl
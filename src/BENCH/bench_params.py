@@ -0,0 +1,43 @@
+"""
+Module: BENCH_PARAMS
+
+Description: Load time of every RNA parameter file of PARAMS (the
+             ViennaRNA 2.0 format read by readpar), parsed from the text
+             file (cache=False) and from its compiled bundle (cache=True,
+             see readpar). default.par and vienna13.par are in the 1.x
+             format and the dna_*.par files hold T, neither is read.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      rna_*.par files only
+
+Dependencies: pytest-benchmark
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import os
+import glob
+
+import pytest
+
+from PARAMS.readpar import readpar
+
+pardir = os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','PARAMS')
+parfiles = sorted( os.path.basename(f) for f in glob.glob(os.path.join(pardir,'rna_*.par')) )
+
+
+@pytest.mark.parametrize('cache',[False,True],ids=['parse','bundle'])
+@pytest.mark.parametrize('name',parfiles)
+def bench_readpar(benchmark,name,cache):
+
+    fname = os.path.join(pardir,name)
+
+    # the first call writes the bundle if it is missing or stale
+    if cache:
+        readpar(fname)
+
+    benchmark(readpar,fname,cache)
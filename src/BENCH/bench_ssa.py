@@ -0,0 +1,76 @@
+"""
+Module: BENCH_SSA
+
+Description: SSA layer benchmarks: BENCH_NSTEP (see CONFTEST)
+             SSAREACTION steps from the unfolded strand of a tRNA and of a
+             1 kb 5' UTR, and PYFOLD_ENSEMBLE throughput against the
+             number of worker processes.
+
+Method: Each SSAREACTION run is timed once (one round), from a fresh
+        LOOP_INIT and the same RNG stream. The steps per second and the
+        ensemble trajectories per second are stored in EXTRA_INFO of the
+        JSON output.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: pytest-benchmark
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import os
+
+import pytest
+
+from conftest import RANDOM_SEQ, trna, iseed, nstep, nsim
+from pyfold import PYFOLD_SETUP
+from ssareaction import SSAREACTION
+from tclock import TOUT_CLOCK
+from ensemble import PYFOLD_ENSEMBLE
+from rng import RNG_STREAM
+
+workloads = {'trna': trna, 'utr1k': RANDOM_SEQ(1000)}
+
+
+@pytest.mark.parametrize('name',sorted(workloads))
+def bench_ssareaction(benchmark,params,name):
+
+    rna,ibpi,ibpf,istop = PYFOLD_SETUP(workloads[name],params=params)
+
+    def setup():
+        rna.ibsp[:] = ibpi
+        rna.LOOP_INIT()
+        return (RNG_STREAM(iseed),),{}
+
+    def run(rng):
+        time = 0.0
+        # no output checkpoints
+        clock = TOUT_CLOCK(0.0)
+        for k in range(nstep):
+            _,time = SSAREACTION(rna,rng,time,clock)
+        return time
+
+    time = benchmark.pedantic(run,setup=setup,rounds=1,iterations=1)
+
+    benchmark.extra_info['nstep'] = nstep
+    benchmark.extra_info['time'] = time
+    benchmark.extra_info['steps_per_s'] = nstep / benchmark.stats.stats.mean
+
+
+@pytest.mark.parametrize('nproc',[1,2,4,8])
+def bench_ensemble(benchmark,nproc):
+
+    if ( nproc > (os.cpu_count() or 1) ):
+        pytest.skip('{} workers on {} cores'.format(nproc,os.cpu_count()))
+
+    benchmark.pedantic(PYFOLD_ENSEMBLE,args=(trna,),
+                       kwargs={'nsim': nsim, 'tmax': 1.0e-1, 'iseed': iseed, 'nproc': nproc},
+                       rounds=1,iterations=1)
+
+    benchmark.extra_info['nproc'] = nproc
+    benchmark.extra_info['nsim'] = nsim
+    benchmark.extra_info['traj_per_s'] = nsim / benchmark.stats.stats.mean
@@ -0,0 +1,107 @@
+"""
+Program: COMPARE
+
+Description: Compares a benchmark run against a stored baseline. Both are
+             the JSON files written by pytest-benchmark (--benchmark-json).
+
+Method: Benchmarks are matched by their full name (file, function and
+        parameters). For each the ratio of the mean times
+
+            RATIO = MEAN(RUN) / MEAN(BASELINE)
+
+        is printed with the baseline and run means, and flagged as a
+        regression when RATIO > 1 + TOL or an improvement when
+        RATIO < 1 - TOL. Benchmarks found in only one of the files are
+        listed. The exit status is 1 if any benchmark regressed.
+
+Usage: python BENCH/compare.py baseline.json run.json [tol]
+
+        The stored baseline BENCH/baseline.json is recorded at the
+        default workload sizes (see CONFTEST) with
+
+            cd src
+            pip install -r BENCH/requirements.txt
+            python -m pytest BENCH --benchmark-json=BENCH/baseline.json
+
+        and a run is compared to it with
+
+            python BENCH/compare.py BENCH/baseline.json run.json
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Stored baseline (BENCH/baseline.json)
+
+Dependencies: json
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import sys
+import json
+
+
+def LOAD(fname):
+
+    # Mean time (s) of each benchmark by full name
+
+    with open(fname) as f:
+        data = json.load(f)
+
+    return dict( (b['fullname'],b['stats']['mean']) for b in data['benchmarks'] )
+
+
+def COMPARE(base,run,tol=0.05):
+
+    # Rows (name,mean base,mean run,ratio,flag) of the common benchmarks
+
+    rows = []
+
+    for name in sorted(set(base) & set(run)):
+
+        ratio = run[name] / base[name]
+
+        if ( ratio > 1.0 + tol ):
+            flag = 'SLOWER'
+        elif ( ratio < 1.0 - tol ):
+            flag = 'faster'
+        else:
+            flag = ''
+
+        rows.append((name,base[name],run[name],ratio,flag))
+
+    return rows
+
+
+if __name__ == "__main__":
+
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(2)
+
+    base = LOAD(sys.argv[1])
+    run = LOAD(sys.argv[2])
+    tol = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+
+    rows = COMPARE(base,run,tol)
+
+    width = max([ len(r[0]) for r in rows ] + [9])
+
+    print("{:{w}s}  {:>12s}  {:>12s}  {:>7s}".format('benchmark','baseline (s)','run (s)','ratio',w=width))
+
+    for name,tb,tr,ratio,flag in rows:
+        print("{:{w}s}  {:12.4e}  {:12.4e}  {:7.3f}  {}".format(name,tb,tr,ratio,flag,w=width))
+
+    for name in sorted(set(base) - set(run)):
+        print("only in baseline: {}".format(name))
+
+    for name in sorted(set(run) - set(base)):
+        print("only in run: {}".format(name))
+
+    nslow = sum( 1 for r in rows if r[4] == 'SLOWER' )
+
+    print("{} of {} benchmarks slower than the baseline by more than {:.0%}".format(nslow,len(rows),tol))
+
+    sys.exit(1 if nslow > 0 else 0)
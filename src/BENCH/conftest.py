@@ -0,0 +1,129 @@
+"""
+Module: CONFTEST
+
+Description: Shared workloads of the benchmark suite (BENCH/bench_*.py).
+             Every workload is built from a fixed seed, so runs on
+             different trees time the same folding problems.
+
+Method: RANDOM_FOLD builds a random nested structure of N nt from helices
+        of 3-8 bp with hairpin loops of at least 3 nt, then draws a
+        sequence that can form it (GC, CG, AU, UA, GU or UG for each pair).
+
+        The folding workloads are
+
+          TRNA - yeast tRNA-Phe (76 nt)
+          UTR  - 1 kb mRNA 5' UTR stand-in, a random sequence of the
+                 composition of human 5' UTRs (GC rich)
+
+        The workload sizes are set by the environment variables
+        BENCH_NSTEP (SSAREACTION steps, default 20000) and BENCH_NSIM
+        (ensemble trajectories, default 16). The defaults keep a run of
+        the suite to a few minutes (the 1 kb UTR takes about 8 ms per
+        step) and are the sizes of the stored baseline BENCH/baseline.json;
+        BENCH_NSTEP=1000000 runs the full million steps.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Default sizes of the stored baseline
+
+Dependencies: numpy, pytest, pytest-benchmark (BENCH/requirements.txt)
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+
+from PARAMS.readpar import readpar
+from readdata import READDATA
+from pyfold import parfile
+
+iseed = 61928712
+
+nstep = int(os.environ.get('BENCH_NSTEP',20000))
+nsim = int(os.environ.get('BENCH_NSIM',16))
+
+trna = 'GCGGAUUUAGCUCAGUUGGGAGAGCGCCAGACUGAAGAUCUGGAGGUCCUGUGUUCGAUCCACAGAAUUCGCACCA'
+
+# Pairs and base composition (A,C,G,U) of the random sequences
+pairs = (('G','C'),('C','G'),('A','U'),('U','A'),('G','U'),('U','G'))
+pcomp = (0.22,0.30,0.30,0.18)
+
+
+def RANDOM_SEQ(n,iseed=iseed):
+
+    gen = np.random.default_rng(iseed)
+
+    return ''.join(gen.choice(list('ACGU'),size=n,p=pcomp))
+
+
+def RANDOM_FOLD(n,iseed=iseed):
+
+    # Random nested structure and a sequence that can form it
+
+    # INTEGERS
+    # i,j,k,l,h,m,span
+
+    gen = np.random.default_rng(iseed)
+
+    fld = ['.'] * n
+    seq = list(gen.choice(list('ACGU'),size=n,p=pcomp))
+
+    # Segments [i,j] (0-based) still to be filled
+    stack = [(0,n-1)]
+
+    while stack:
+
+        i,j = stack.pop()
+
+        k = i
+        while ( k <= j ):
+
+            span = j - k + 1
+
+            if ( span >= 11 ) and ( gen.random() < 0.15 ):
+
+                h = int(gen.integers(3,min(8,(span-3)//2)+1))
+                l = int(gen.integers(k+2*h+2,j+1))
+
+                for m in range(h):
+                    fld[k+m] = '('
+                    fld[l-m] = ')'
+                    seq[k+m],seq[l-m] = pairs[int(gen.integers(0,len(pairs)))]
+
+                stack.append((k+h,l-h))
+                k = l + 1
+
+            else:
+                k += 1
+
+    return ''.join(seq),''.join(fld)
+
+
+def HAIRPIN(n):
+
+    # Fully paired strand: one helix closed by a 4 nt loop
+
+    h = (n - 4) // 2
+
+    seq = 'G' * h + 'GAAA' + 'C' * (n - h - 4)
+    fld = '(' * h + '....' + ')' * h + '.' * (n - 2*h - 4)
+
+    return seq,fld
+
+
+@pytest.fixture(scope='session')
+def params():
+
+    # Parameters of PYFOLD
+    READDATA()
+
+    return readpar(parfile)
@@ -0,0 +1,69 @@
+"""
+Program: DIRTY_RESUM
+
+Description: Event-count profiler of the rate updates, the partial sum
+             resums per SSA step.
+
+Method: PYFOLD is run once and the counters of the RNA_STRUC (see
+        RNA_STRUC%COUNTERS) are reported. A step changes the rates of
+        1-2 loops on average, so the resums of a step share few tree
+        nodes and PSUM_TREE%UPDATE stays eager. LOOP_MOVE runs LOOP_REAC
+        once per loop it changes, so there are no repeated loop updates
+        left to defer either.
+
+Usage: python BENCH/dirty_resum.py seq [fld_start] [tmax]
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Synthetic MARK/FLUSH stream removed
+            10/17/2026      LOOP_REAC counters removed with the dirty set
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import os
+import sys
+import time as timer
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+
+
+def PROFILE_RUN(seq,fld_start=None,tmax=1.0):
+
+    # Counters of one PYFOLD trajectory
+
+    from pyfold import PYFOLD_SETUP, PYFOLD_TRAJECTORY
+    from rng import RNG_STREAM
+
+    rna,ibpi,ibpf,istop = PYFOLD_SETUP(seq,fld_start)
+
+    t0 = timer.time()
+    res = PYFOLD_TRAJECTORY(rna,ibpi,ibpf,istop,RNG_STREAM(),0.0,tmax)
+
+    out = rna.COUNTERS()
+    out['events'] = res['nevent']
+    out['wall']   = timer.time() - t0
+
+    return out
+
+
+if __name__ == "__main__":
+
+    if ( len(sys.argv) < 2 ):
+        sys.exit('Usage: python BENCH/dirty_resum.py seq [fld_start] [tmax]')
+
+    seq = sys.argv[1]
+    fld_start = ( sys.argv[2] or None ) if len(sys.argv) > 2 else None
+    tmax = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+
+    out = PROFILE_RUN(seq,fld_start,tmax)
+
+    nevent = max(out['events'],1)
+
+    print("resums    {:10d}  per event {:6.2f}  wall {:8.3f} s".format(
+          out['resum'],out['resum']/nevent,out['wall']))
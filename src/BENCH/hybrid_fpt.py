@@ -0,0 +1,141 @@
+"""
+Program: HYBRID_FPT
+
+Description: Validation harness for SSA_HYBRID. Runs the same folding
+             problem with the exact SSA and with the accelerated SSA and
+             compares the first passage time (FPT) distributions with a
+             two sample Kolmogorov-Smirnov test.
+
+Method: The ensembles use independent seeds (ISEED and ISEED+1). The KS
+        statistic
+
+            D = MAX | F_EXACT(t) - F_HYBRID(t) |
+
+        is computed over the pooled FPTs and its p-value from the
+        asymptotic Kolmogorov distribution with the effective sample size
+        NE = N1*N2/(N1+N2). Trajectories that do not reach the stop
+        structure before TMAX are reported but not included.
+
+        The block of a flicker pair is exact whatever TOL, so a large TOL
+        (many blocks) is the stronger test. With the Turner 2004 tables
+        the escape probability of a helix end is rarely below 0.5 and
+        the default TOL = 0.05 samples almost no blocks.
+
+Results: Opening of a 6 bp hairpin, 1000 trajectories per ensemble,
+
+            python BENCH/hybrid_fpt.py GCAUAUGAAAAUAUGC
+                   '((((((....))))))' '................' 1000 1000 TOL
+
+            TOL     mean FPT (uS)   SSA steps   blocks   KS D    p
+            exact       5.693         485257         0
+            0.05        5.776         492295         0   0.030  0.75
+            0.9         5.632         262036     84043   0.039  0.43
+            0.99        5.698         258503     90892   0.030  0.75
+
+        At TOL = 0.05 no block is sampled and the two ensembles differ
+        only by their seeds. The blocks replace 134k flicker events and
+        half of the SSA steps, but the wall time is unchanged (100-110 s
+        per ensemble).
+
+Usage: python BENCH/hybrid_fpt.py seq fld_start fld_stop [nsim] [tmax] [tol]
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Independent seeds, flicker blocks reported
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import os
+import sys
+import time as timer
+
+import numpy as np
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+
+from pyfold import PYFOLD
+
+
+def KS_2SAMP(x1,x2):
+
+    # Two sample KS statistic and asymptotic p-value
+
+    x1 = np.sort(np.asarray(x1,dtype=np.float64))
+    x2 = np.sort(np.asarray(x2,dtype=np.float64))
+
+    n1 = len(x1)
+    n2 = len(x2)
+
+    xall = np.concatenate((x1,x2))
+
+    f1 = np.searchsorted(x1,xall,side='right') / float(n1)
+    f2 = np.searchsorted(x2,xall,side='right') / float(n2)
+
+    d = float(np.max(np.abs(f1 - f2)))
+
+    ne = n1 * n2 / float(n1 + n2)
+    z = (np.sqrt(ne) + 0.12 + 0.11/np.sqrt(ne)) * d
+
+    # Q_KS(z) = 2 SUM (-1)**(k-1) EXP(-2 k**2 z**2)
+    k = np.arange(1,101)
+    p = 2.0 * np.sum((-1.0)**(k-1) * np.exp(-2.0 * k**2 * z**2))
+
+    return d,float(min(max(p,0.0),1.0))
+
+
+def VALIDATE_HYBRID(seq,fld_start,fld_stop,nsim=200,tmax=1.0,tol=0.05,iseed=61928712):
+
+    # FPTs and run times of the exact and accelerated SSA
+
+    out = {}
+
+    for label,hybrid,jseed in (('exact',None,iseed),('hybrid',tol,iseed+1)):
+
+        t0 = timer.time()
+        results = PYFOLD(seq,fld_start,fld_stop,nsim=nsim,tmax=tmax,hybrid=hybrid,iseed=jseed)
+        t1 = timer.time()
+
+        out[label] = {
+            'fpt'    : [ res['time'] for res in results if res['fpt'] ],
+            'nevent' : sum( res['nevent'] for res in results ),
+            'nblock' : sum( res.get('nblock',0) for res in results ),
+            'nflick' : sum( res.get('nflick',0) for res in results ),
+            'wall'   : t1 - t0,
+        }
+
+    d,p = KS_2SAMP(out['exact']['fpt'],out['hybrid']['fpt'])
+
+    out['ks'] = d
+    out['pvalue'] = p
+
+    return out
+
+
+if __name__ == "__main__":
+
+    if len(sys.argv) < 4:
+        print(__doc__)
+        sys.exit(1)
+
+    seq,fld_start,fld_stop = sys.argv[1:4]
+
+    nsim = int(sys.argv[4]) if len(sys.argv) > 4 else 200
+    tmax = float(sys.argv[5]) if len(sys.argv) > 5 else 1.0
+    tol  = float(sys.argv[6]) if len(sys.argv) > 6 else 0.05
+
+    out = VALIDATE_HYBRID(seq,fld_start,fld_stop,nsim,tmax,tol)
+
+    for label in ('exact','hybrid'):
+        r = out[label]
+        print("{:8s} reached {:6d}/{:d}  mean FPT {:12.4e}  steps {:10d}  blocks {:8d}  flicker {:8d}  wall {:8.2f} s".format(
+              label,len(r['fpt']),nsim,
+              np.mean(r['fpt']) if r['fpt'] else float('nan'),
+              r['nevent'],r['nblock'],r['nflick'],r['wall']))
+
+    print("KS D = {:.4f}  p = {:.4f}".format(out['ks'],out['pvalue']))
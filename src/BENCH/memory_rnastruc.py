@@ -0,0 +1,88 @@
+"""
+Program: MEMORY_RNASTRUC
+
+Description: Compares the memory used by the RNA_STRUC work arrays in the
+             original layout (class-level Python lists of length mxnt,
+             reallocated by CLEAR_LOOPS) against the per-instance NumPy
+             layout sized to the sequence.
+
+Usage: python BENCH/memory_rnastruc.py
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+
+from rnavar import mxnt
+from class_rnafold import RNA_STRUC
+
+class RNA_STRUC_LISTS(object):
+
+    # Original layout: ten lists of mxnt shared at class level and eight
+    # of them reallocated on the instance by every CLEAR_LOOPS call
+
+    def __init__(self):
+
+        self.iseq = [0]*mxnt
+        self.ibsp = [0]*mxnt
+        self.link = [0]*mxnt
+        self.loop = [0]*mxnt
+        self.nhlx = [0]*mxnt
+        self.nsgl = [0]*mxnt
+        self.psum = [0.0]*mxnt
+        self.ptot = [0.0]*mxnt
+        self.wrk1 = [0.0]*mxnt
+        self.wrk2 = [0.0]*mxnt
+
+    def CLEAR_LOOPS(self):
+
+        self.link = [0]*mxnt
+        self.loop = [0]*mxnt
+        self.nhlx = [0]*mxnt
+        self.nsgl = [0]*mxnt
+
+        self.wrk1 = [0.0]*mxnt
+        self.wrk2 = [0.0]*mxnt
+
+        self.psum = [0.0]*mxnt
+        self.ptot = [0.0]*mxnt
+
+
+def MEASURE(make):
+
+    tracemalloc.start()
+    rna = make()
+    rna.CLEAR_LOOPS()
+    current,peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    t = timeit.timeit(rna.CLEAR_LOOPS,number=100) / 100.0
+
+    return current,peak,t
+
+
+if __name__ == "__main__":
+
+    print("{:>6s} {:>12s} {:>12s} {:>12s} {:>12s} {:>10s} {:>10s}".format(
+          'n','old (B)','new (B)','old peak','new peak','old clr','new clr'))
+
+    for n in (100,1000,10000):
+
+        old = MEASURE(RNA_STRUC_LISTS)
+        new = MEASURE(lambda: RNA_STRUC(n))
+
+        print("{:6d} {:12d} {:12d} {:12d} {:12d} {:9.2f}us {:9.2f}us".format(
+              n,old[0],new[0],old[1],new[1],old[2]*1e6,new[2]*1e6))
@@ -0,0 +1,104 @@
+"""
+Program: TLOOP_LOOKUP
+
+Description: Micro-benchmark of the special tetraloop lookup over all 4^6
+             closing pair + loop contexts. Compares the original linear
+             scan of params.tetraloops (loop converted to a string on
+             every call) against the packed-code lookup of TLOOP.
+
+Usage: python BENCH/tloop_lookup.py [paramfile]
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import os
+import sys
+import timeit
+import itertools
+
+import numpy as np
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+
+from PARAMS.readpar import readpar
+from ENERGY.ekernel import ENERGY_KERNEL
+from ENERGY.tloop import TLOOP
+
+letters = 'ACGU'
+
+def TLOOP_SCAN(params,ilist,el):
+
+    # Original lookup: build the loop string and scan the table
+
+    cl = ['']*6
+
+    for i in range(6):
+        cl[i] = letters[ilist[i]]
+
+    cwrk = ''.join(cl)
+
+    for i in range(100):
+        if params.tetraloops[i] == '':
+            break
+        if params.tetraloops[i] == cwrk:
+            el += params.dG_tetraloops[i]
+
+    return el
+
+
+if __name__ == "__main__":
+
+    if len(sys.argv) > 1:
+        paramfile = sys.argv[1]
+    else:
+        paramfile = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 '..','PARAMS','rna_turner2004.par')
+
+    params = readpar(paramfile)
+
+    # All 4^6 contexts laid end to end, context c starts at 6*c+1
+    contexts = list(itertools.product(range(4),repeat=6))
+    nctx = len(contexts)
+
+    n = 6*nctx
+    iseq = np.zeros(n+4,dtype=np.int32)
+    for c,ctx in enumerate(contexts):
+        iseq[6*c+1:6*c+7] = np.asarray(ctx) + 1
+
+    ekern = ENERGY_KERNEL(params,iseq,n)
+    ipos = [ 6*c+1 for c in range(nctx) ]
+
+    # Both lookups must agree on every context
+    for c,ctx in enumerate(contexts):
+        e1 = TLOOP_SCAN(params,ctx,0.0)
+        e2 = TLOOP(ekern,ipos[c],0.0,4)
+        assert e1 == e2, "Mismatch for {}".format(''.join(letters[k] for k in ctx))
+
+    def RUN_SCAN():
+        for ctx in contexts:
+            TLOOP_SCAN(params,ctx,0.0)
+
+    def RUN_PACK():
+        for i in ipos:
+            TLOOP(ekern,i,0.0,4)
+
+    nrep = 20
+
+    t1 = min(timeit.repeat(RUN_SCAN,number=1,repeat=nrep)) / nctx
+    t2 = min(timeit.repeat(RUN_PACK,number=1,repeat=nrep)) / nctx
+
+    nhit = sum(1 for ctx in contexts if TLOOP_SCAN(params,ctx,0.0) != 0.0)
+
+    print("contexts        : {:10d}".format(nctx))
+    print("tetraloops      : {:10d}".format(nhit))
+    print("scan   (ns/call): {:10.1f}".format(1.0e9*t1))
+    print("packed (ns/call): {:10.1f}".format(1.0e9*t2))
+    print("speedup         : {:10.1f}x".format(t1/t2))
@@ -15,6 +15,7 @@ History:
 Version     Date            Comment
 --------    -------         --------------------
             09/28/2017      Original Code
+            10/17/2026      1-based IBSP, energy of the changed loops (DELTAG_LOOP)
 
 Dependencies:
 
@@ -22,30 +23,21 @@ Author(s): Alex Reis
            Copyright (c) 2017 (Please refer to LICENCE)
 """
 
+from ENERGY.deltag_loop import DELTAG_LOOP
+
 def DELTAG_HI(rna,i,j):
 
     # INTEGER
-    # i,j,n
-
-    # REAL
-    # ei,ef,es
+    # i,j
 
     # DOUBLE PRECISION
     # dg
 
-    n = rna.n
-
-    #=== Initial Energy ===#
-
-    ei = ESTACK(rna.iseq,i-1,j+1,i,j,n)
-    es = ESTACK(rna.iseq,i,j,i+1,j-1,n)
-
-    ei += es
-
-    #=== Final Energy ===#
+    # LOOP_REAC walks the helix from its 3' end
+    if ( i > j ): i,j = j,i
 
-    ef = EBULGE(rna.iseq,i-1,j+1,i+1,i-1,n)
+    #=== Stack i-1,j+1 becomes a 1x1 interior loop ===#
 
-    dg = float(ef) - float(ei)
+    dg = DELTAG_LOOP(rna,(i-1,i),((i,j),),())
 
-    return dg
\ No newline at end of file
+    return dg
@@ -0,0 +1,135 @@
+"""
+Function: DELTAG_LOOP (RNA,KEYS,IREM,IADD)
+
+Description: Computes the difference in free energy of an RNA fold due to
+             a move that removes the base pairs IREM and adds the base
+             pairs IADD, from the energy of the loops changed by the move.
+             Shared by the DELTAG_* energy functions of the moves.
+
+Method: The energy of a fold (see ESTRUC) is the energy of the external
+        loop plus one term for every base pair i-j (i < j), the energy of
+        the loop it closes,
+
+              EPAIR(i) = ESTACK(i,j,i+1,j-1)   if i+1 pairs with j-1
+                       = ELOOP(i,j)            otherwise
+
+              EPAIR(N) = ELOOP(N,1)            the external loop
+
+        A move only changes the terms of the loops that hold one of its
+        nt, before or after the move. These are listed in KEYS by the 5'
+        nt of their closing pair (N for the external loop). The sum of
+        EPAIR over KEYS is taken for the fold and for the fold with the
+        move applied to RNA%IBSP, which is then restored,
+
+              DG = SUM EPAIR'(KEYS) - SUM EPAIR(KEYS)
+
+        A key that is not the 5' nt of a pair in a fold adds 0.
+
+          OUTER(i,j) - key of the loop outside the pair i-j, the helix
+                       stack i-1,j+1 or the loop of RNA%LINK(j).
+
+Arguments:
+
+            RNA - Class containing information about the RNA fold and
+                  the RNA sequence.
+           KEYS - Loops changed by the move, by the 5' nt of the closing
+                  pair.
+           IREM - Base pairs (i,j) removed by the move.
+           IADD - Base pairs (i,j) added by the move.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies:
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+from ENERGY.eloop import ELOOP
+from ENERGY.estack import ESTACK
+
+def EPAIR(ekern,ibsp,i,n):
+
+    # INTEGER
+    # i,j,n
+
+    if ( i == n ):
+        return ELOOP(ekern,ibsp,n,1,n)
+
+    j = ibsp[i]
+
+    if ( j <= i ):
+        return 0.0e0
+
+    if ( ibsp[i+1] == j-1 ):
+        return ESTACK(ekern,i,j,i+1,j-1,n)
+
+    return ELOOP(ekern,ibsp,i,j,n)
+
+
+def OUTER(rna,i,j):
+
+    # INTEGER
+    # i,j
+
+    if ( i > j ): i,j = j,i
+
+    if ( rna.ibsp[i-1] == j+1 ) and ( i > 1 ):
+        return i - 1
+
+    return rna.loop[rna.link[j]]
+
+
+def DELTAG_LOOP(rna,keys,irem,iadd):
+
+    # INTEGER
+    # n,i,j,k
+    # ibsp(n)
+
+    # REAL
+    # ei,ef
+
+    ekern = rna.ekern
+    ibsp = rna.ibsp
+    n = rna.n
+
+    keys = set(keys)
+
+    #=== Initial Energy ===#
+
+    ei = 0.0e0
+    for k in keys:
+        ei += EPAIR(ekern,ibsp,k,n)
+
+    #=== Apply Move ===#
+
+    for i,j in irem:
+        ibsp[i] = 0
+        ibsp[j] = 0
+
+    for i,j in iadd:
+        ibsp[i] = j
+        ibsp[j] = i
+
+    #=== Final Energy ===#
+
+    ef = 0.0e0
+    for k in keys:
+        ef += EPAIR(ekern,ibsp,k,n)
+
+    #=== Restore Fold ===#
+
+    for i,j in iadd:
+        ibsp[i] = 0
+        ibsp[j] = 0
+
+    for i,j in irem:
+        ibsp[i] = j
+        ibsp[j] = i
+
+    dg = float(ef) - float(ei)
+
+    return dg
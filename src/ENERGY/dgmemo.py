@@ -0,0 +1,178 @@
+"""
+Class: DG_MEMO (MAXSIZE,VERIFY)
+
+Description: Bounded LRU memo table in front of the DELTAG_HE, DELTAG_HR,
+             DELTAG_HM and DELTAG_HD energy functions. LOOP_REAC calls
+             them for every helix end of a loop each time a neighbouring
+             loop changes, and most of these calls see a local context
+             that has been evaluated before.
+
+Method: The functions read the sequence (fixed for an RNA_STRUC), the
+        helix end II-JJ (and KK for DELTAG_HD), the loop faced by the end
+        (RNA%LINK(JJ)) and, for the retraction and diffusion moves that
+        merge or reshape it, the loop behind the end (RNA%LINK(II)). The
+        key is
+
+            (FUNCTION,II,JJ,KK,SIG(LINK(JJ)),SIG(LINK(II)))
+
+        where the loop signature SIG is RNA%LSIG, the XOR of the Zobrist
+        keys of the closing pair of the loop and of the pair of every helix
+        in it (see LOOP_LINK). This fixes which nt of the loop are paired
+        and to what, the loop sizes (NHLX, NSGL) and, for the external
+        loop, N. LOOP_MOVE and LOOP_GROW keep it up to date, so a key is
+        built in O(1) instead of walking both loops. Two loops share a
+        signature by chance with probability 2**-64; VERIFY would catch it.
+
+        The table holds at most MAXSIZE energies and drops the least
+        recently used one when full. With VERIFY > 0 one hit in every
+        1/VERIFY is recomputed and compared to the stored energy, which
+        raises an exception if the key misses an input.
+
+Arguments:
+
+        MAXSIZE - Maximum number of stored energies.
+         VERIFY - Fraction of hits recomputed as a check (0 = off).
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Loop signature read from RNA%LSIG
+
+Dependencies:
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+from collections import OrderedDict
+
+from ENERGY.deltag_he import DELTAG_HE
+from ENERGY.deltag_hr import DELTAG_HR
+from ENERGY.deltag_hm import DELTAG_HM
+from ENERGY.deltag_hd import DELTAG_HD
+
+# Largest difference accepted by the verification mode (kcal/mol)
+vtol = 1.0e-9
+
+
+class DG_MEMO(object):
+
+    def __init__(self,maxsize=65536,verify=0.0):
+
+        if ( verify < 0.0 ) or ( verify > 1.0 ):
+            raise ValueError("Verification fraction must be in [0,1], got {}.".format(verify))
+
+        self.maxsize = maxsize
+        self.verify = verify
+
+        # recompute every nstride-th hit
+        self.nstride = int(round(1.0/verify)) if verify > 0.0 else 0
+
+        self.table = OrderedDict()
+
+        # Counters per function name
+        self.nhit = {}
+        self.nmiss = {}
+        self.ncheck = 0
+        self.nevict = 0
+
+    def CLEAR(self):
+
+        self.table.clear()
+
+    def LOOP_SIG(self,rna,indx):
+
+        # Signature of loop INDX, 0 for no loop
+
+        if ( indx == 0 ):
+            return 0
+
+        return rna.lsig[indx]
+
+    def DELTAG(self,fn,rna,ii,jj,kk=0):
+
+        # FN(RNA,II,JJ[,KK]) through the memo table
+
+        # FLOAT
+        # dg,dgc
+
+        name = fn.__name__
+        table = self.table
+
+        key = (name,ii,jj,kk,
+               self.LOOP_SIG(rna,rna.link[jj]),
+               self.LOOP_SIG(rna,rna.link[ii]))
+
+        dg = table.get(key)
+
+        if dg is not None:
+
+            table.move_to_end(key)
+
+            nhit = self.nhit.get(name,0) + 1
+            self.nhit[name] = nhit
+
+            if ( self.nstride > 0 ) and ( nhit % self.nstride == 0 ):
+
+                dgc = fn(rna,ii,jj,kk) if kk else fn(rna,ii,jj)
+                self.ncheck += 1
+
+                if ( abs(dgc - dg) > vtol ):
+                    raise Exception('ERROR: {} memo mismatch at {}-{} ({}): {} != {}'.format(
+                                    name,ii,jj,kk,dg,dgc))
+
+            return dg
+
+        self.nmiss[name] = self.nmiss.get(name,0) + 1
+
+        dg = fn(rna,ii,jj,kk) if kk else fn(rna,ii,jj)
+
+        table[key] = dg
+
+        if ( len(table) > self.maxsize ):
+            table.popitem(last=False)
+            self.nevict += 1
+
+        return dg
+
+    def STATS(self):
+
+        # Hit rates per function and totals
+
+        out = {}
+
+        for name in sorted(set(self.nhit) | set(self.nmiss)):
+            nhit = self.nhit.get(name,0)
+            nmiss = self.nmiss.get(name,0)
+            out[name] = {'hit': nhit, 'miss': nmiss,
+                         'rate': nhit / float(nhit + nmiss)}
+
+        out['size']   = len(self.table)
+        out['evict']  = self.nevict
+        out['checks'] = self.ncheck
+
+        return out
+
+
+#=== Memoized energy functions ===#
+
+def MEMO_HE(rna,ii,jj):
+    if rna.dgmemo is None:
+        return DELTAG_HE(rna,ii,jj)
+    return rna.dgmemo.DELTAG(DELTAG_HE,rna,ii,jj)
+
+def MEMO_HR(rna,ii,jj):
+    if rna.dgmemo is None:
+        return DELTAG_HR(rna,ii,jj)
+    return rna.dgmemo.DELTAG(DELTAG_HR,rna,ii,jj)
+
+def MEMO_HM(rna,ii,jj):
+    if rna.dgmemo is None:
+        return DELTAG_HM(rna,ii,jj)
+    return rna.dgmemo.DELTAG(DELTAG_HM,rna,ii,jj)
+
+def MEMO_HD(rna,ii,jj,kk):
+    if rna.dgmemo is None:
+        return DELTAG_HD(rna,ii,jj,kk)
+    return rna.dgmemo.DELTAG(DELTAG_HD,rna,ii,jj,kk)
@@ -1,5 +1,5 @@
 """
-Function: EBULGE (ISEQ,I,J,IP,JP,N)
+Function: EBULGE (EKERN,I,J,IP,JP,N)
 
 Description: Computes the energy of an RNA bulge with two helices using the
              empirical INN energy model.
@@ -15,8 +15,7 @@ Method: Uses the MFOLD 3.0 energy function for RNA given by:
 
 Arguments:
 
-         ISEQ - Array of length N containing the sequence
-                in numerical code (A=1,C=2,G=3,U=4)
+        EKERN - Energy kernel (ENERGY_KERNEL) of the sequence.
             I - Nucleotide position of the starting basepair 5'.
             J - Nucleotide position of the starting basepair 3'.
            IP - Nucleotide position of the ending basepair 3'.
@@ -27,6 +26,8 @@ History:
 Version     Date            Comment
 --------    -------         --------------------
             09/28/2017      Original Code
+            10/17/2026      Table lookups through ENERGY_KERNEL
+            10/17/2026      Beta of the parameter set (EKERN%BETA)
 
 Dependencies:
 
@@ -35,20 +36,29 @@ Author(s): Alex Reis
 """
 
 import math
-from rnavar import eau,beta
+from rnavar import eau
 
-def EBULGE(iseq,i,j,ip,jp,n):
+from ENERGY.tstack import TSTACK
+from ENERGY.tstacki import TSTACKI
+from ENERGY.tint11 import TINT11
+from ENERGY.tint12 import TINT12
+from ENERGY.tint22 import TINT22
+
+def EBULGE(ekern,i,j,ip,jp,n):
 
     # INTEGER
     # i,j,ip,jp,n
     # iseq(n)
     # k,ibul,imin,imax
-    # n1,n2,nt,na,ilist(8)
+    # n1,n2,nt,na
 
     # REAL
     # eb
     # x,c,f(4)
 
+    iseq = ekern.iseq
+    params = ekern.params
+
     eb = 0.0e0
 
     n1 = ip - i - 1 # number of nt on 5' side of bulge/int loop
@@ -60,7 +70,7 @@ def EBULGE(iseq,i,j,ip,jp,n):
     imin = min(n1,n2)
     imax = max(n1,n2)
 
-    c = 1.750e0 / float(beta)
+    c = 1.750e0 / float(ekern.beta)
 
     #=== Get Bulge Type ===#
 
@@ -98,12 +108,7 @@ def EBULGE(iseq,i,j,ip,jp,n):
         # 5' (i) A . X (ip) 3'
         # 3' (j) U   Y (jp) 5'
 
-        ilist[0] = iseq[i]
-        ilist[1] = iseq[j]
-        ilist[2] = iseq[ip]
-        ilist[3] = iseq[jp]
-
-        eb = TSTACK(ilist,eb)
+        eb = TSTACK(ekern,i,j,ip,jp,eb)
 
     elif ibul == 1:
 
@@ -122,96 +127,52 @@ def EBULGE(iseq,i,j,ip,jp,n):
         # 5' (i) A . X (ip) 3'
         # 3' (j) U . Y (jp) 5'
 
-        ilist[0] = iseq[i]
-        ilist[1] = iseq[j]
-        ilist[2] = iseq[i+1]
-        ilist[3] = iseq[j-1]
-        ilist[4] = iseq[ip]
-        ilist[5] = iseq[jp]
-
-        eb = TINT11(ilist,eb)
+        eb = TINT11(ekern,i,j,i+1,j-1,ip,jp,eb)
 
     elif ibul == 3:
 
         # 5' (i) A .   X (ip) 3'
         # 3' (j) U . . Y (jp) 5'
 
-        ilist[0] = iseq[i]
-        ilist[1] = iseq[j]
-        ilist[2] = iseq[i+1]
-        ilist[3] = iseq[j-1]
-        ilist[4] = iseq[j-2]
-        ilist[5] = iseq[ip]
-        ilist[6] = iseq[jp]
-
-        eb = TINT12(ilist,eb)
+        eb = TINT12(ekern,i,j,i+1,j-1,j-2,ip,jp,eb)
 
     elif ibul == 4:
 
         # 5' (i) A . . X (ip) 3'
         # 3' (j) U   . Y (jp) 5'
 
-        ilist[0] = iseq[jp]
-        ilist[1] = iseq[ip]
-        ilist[2] = iseq[jp+1]
-        ilist[3] = iseq[ip-1]
-        ilist[4] = iseq[ip-2]
-        ilist[5] = iseq[j]
-        ilist[6] = iseq[i]
-
-        eb = TINT12(ilist,eb)
+        eb = TINT12(ekern,jp,ip,jp+1,ip-1,ip-2,j,i,eb)
 
     elif ibul == 5:
 
         # 5' (i) A . . X (ip) 3'
         # 3' (j) U . . Y (jp) 5'
 
-        ilist[0] = iseq[i]
-        ilist[1] = iseq[j]
-        ilist[2] = iseq[i+1]
-        ilist[3] = iseq[j-1]
-        ilist[4] = iseq[ip-1]
-        ilist[5] = iseq[jp+1]
-        ilist[6] = iseq[ip]
-        ilist[7] = iseq[jp]
-
-        eb = TINT22(ilist,eb)
+        eb = TINT22(ekern,i,j,i+1,j-1,ip-1,jp+1,ip,jp,eb)
 
     elif ibul == 6:
 
         # 5' (i) A X .. G (ip) 3'
         # 3' (j) U Y .. C (jp) 5'
 
-        ilist[0] = iseq[i]
-        ilist[1] = iseq[j]
-        ilist[2] = iseq[i+1]
-        ilist[3] = iseq[j-1]
-
         #=== GAIL Rule ===#
 
-        if ( imin == 1 and imax > 2 ):
-
-            ilist[2] = 0
-            ilist[3] = 0
+        # mismatch is taken as A-A (table index 0)
 
-        eb = TSTACKI(ilist,eb)
+        if ( imin == 1 and imax > 2 ):
+            eb += ekern.dg_stacki[ekern.ioff[3][i]+ekern.ioff[2][j]]
+        else:
+            eb = TSTACKI(ekern,i,j,i+1,j-1,eb)
 
         # 5' (i) A .. X G (ip) 3'
         # 3' (j) U .. Y C (jp) 5'
 
-        ilist[0] = iseq[jp]
-        ilist[1] = iseq[ip]
-        ilist[2] = iseq[jp+1]
-        ilist[3] = iseq[ip-1]
-
         #=== GAIL Rule ===#
 
         if ( imin == 1 and imax > 2 ):
-
-            ilist[2] = 0
-            ilist[3] = 0
-
-        eb = TSTACKI(ilist,eb)
+            eb += ekern.dg_stacki[ekern.ioff[3][jp]+ekern.ioff[2][ip]]
+        else:
+            eb = TSTACKI(ekern,jp,ip,jp+1,ip-1,eb)
 
     else:
 
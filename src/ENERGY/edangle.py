@@ -1,5 +1,5 @@
 """
-Function: EDANGLE (ISEQ,I,J,K,N)
+Function: EDANGLE (EKERN,I,J,K,N)
 
 Description: Computes the energy of a dangling nucleotide over a basepair
              using the empirical INN model.
@@ -14,8 +14,7 @@ Method: Uses the MFOLD 3.0 energy function for RNA @ T=37 given by:
 
 Arguments:
 
-         ISEQ - Array of length N containing the sequence
-                in numerical code (A=1,C=2,G=3,U=4)
+        EKERN - Energy kernel (ENERGY_KERNEL) of the sequence.
             I - Nucleotide position of the basepair 5'.
             J - Nucleotide position of the basepair 3'.
             K - Nucleotide position of the dangling nucleotide.
@@ -25,6 +24,8 @@ History:
 Version     Date            Comment
 --------    -------         --------------------
             09/28/2017      Original Code
+            10/17/2026      Table lookups through ENERGY_KERNEL
+            10/17/2026      1-based positions, K < 1 is off the sequence
 
 Dependencies:
 
@@ -32,19 +33,20 @@ Author(s): Alex Reis
            Copyright (c) 2017 (Please refer to LICENCE)
 """
 
-def EDANGLE(iseq,i,j,k,n):
+from ENERGY.tdangle3 import TDANGLE3
+from ENERGY.tdangle5 import TDANGLE5
+
+def EDANGLE(ekern,i,j,k,n):
 
     # INTEGER
     # i,j,k,n
-    # iseq(n)
-    # list(3); now called ilist(3)
 
     # REAL
     # ed
 
     ed = 0.0e0
 
-    if ( k < 0 ): return ed
+    if ( k < 1 ): return ed
     if ( k > n ): return ed
 
     if ( k == i+1 ):
@@ -52,43 +54,27 @@ def EDANGLE(iseq,i,j,k,n):
         # 5' (i) A X (k) 3'
         # 3' (j) U       5'
 
-        ilist[0] = iseq[i]
-        ilist[1] = iseq[j]
-        ilist[2] = iseq[k]
-
-        ed = TDANGLE3(ilist)
+        ed = TDANGLE3(ekern,i,j,k,ed)
 
     elif ( k == j-1 ):
 
         # 5' (i) A       3'
         # 3' (j) U X (k) 5'        
 
-        ilist[0] = iseq[i]
-        ilist[1] = iseq[j]
-        ilist[2] = iseq[k]
-
-        ed = TDANGLE5(ilist)
+        ed = TDANGLE5(ekern,i,j,k,ed)
 
     elif ( k == j+1 ):
 
         # 5'       A (i) 3'
         # 3' (k) X U (j) 5'
 
-        ilist[0] = iseq[j]
-        ilist[1] = iseq[i]
-        ilist[2] = iseq[k]
-
-        ed = TDANGLE3(ilist)
+        ed = TDANGLE3(ekern,j,i,k,ed)
 
     elif ( k == i-1 ):
 
         # 5' (k) X A (i) 3'
         # 3'       U (j) 5'
 
-        ilist[0] = iseq[j]
-        ilist[1] = iseq[i]
-        ilist[2] = iseq[k]
-
-        ed = TDANGLE5(ilist)
+        ed = TDANGLE5(ekern,j,i,k,ed)
 
-    return ed
\ No newline at end of file
+    return ed
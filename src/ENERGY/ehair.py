@@ -1,5 +1,5 @@
 """
-Subroutine: EHAIR (ISEQ,I,J,N,EH)
+Subroutine: EHAIR (EKERN,I,J,N,EH)
 
 Purpose: Computes the energy of an RNA hairpin turn using the
          empirical MFOLD 3.0 energy function.
@@ -15,8 +15,7 @@ Method: Uses the MFOLD 3.0 energy function for RNA @ T=37 given by:
 
 Arguments:
 
-         ISEQ - Array of length N containing the sequence
-                in numerical code (A=1,C=2,G=3,U=4)
+        EKERN - Energy kernel (ENERGY_KERNEL) of the sequence.
             I - Nucleotide position of the loop basepair 5'.
             J - Nucleotide position of the loop basepair 3'.
             N - Number of nucleotides in the sequence.
@@ -26,6 +25,10 @@ History:
 Version     Date            Comment
 --------    -------         --------------------
             09/28/2017      Original Code
+            10/17/2026      Sequence and tables through ENERGY_KERNEL
+            10/17/2026      Special hairpins by packed code (TLOOP)
+            10/17/2026      Beta of the parameter set (EKERN%BETA)
+            10/17/2026      Bonuses in the ISEQ code (A=1,...,U=4)
 
 Dependencies:
 
@@ -34,25 +37,30 @@ Author(s): Alex Reis
 """
 
 import math
-from rnavar import eau,beta
+from rnavar import eau
 
-def EHAIR(iseq,i,j,n):
+from ENERGY.tloop import TLOOP
+from ENERGY.tstackh import TSTACKH
+
+def EHAIR(ekern,i,j,n):
 
     # INTEGER
     # i,j,n
     # iseq(n)
-    # ilist(8)
     # k,ic,nl
 
     # REAL
     # x,c
     # eh
 
+    iseq = ekern.iseq
+    params = ekern.params
+
     eh = 0.0e0
 
     nl = j - i - 1
 
-    c = 1.750e0 / float(beta)
+    c = 1.750e0 / float(ekern.beta)
 
     #=== Tables of specific hairpin loops ===#
 
@@ -60,13 +68,7 @@ def EHAIR(iseq,i,j,n):
 
     if ( nl == 3 ):
 
-        ilist[0] = iseq[i]
-        ilist[1] = iseq[i+1]
-        ilist[2] = iseq[i+2]
-        ilist[3] = iseq[i+3]
-        ilist[4] = iseq[i+4]
-
-        eh = TLOOP(ilist,eh,nl)
+        eh = TLOOP(ekern,i,eh,nl)
 
         if eh != 0.0e0:
             return eh
@@ -75,14 +77,7 @@ def EHAIR(iseq,i,j,n):
 
     elif ( nl == 4 ):
 
-        ilist[0] = iseq[i]
-        ilist[1] = iseq[i+1]
-        ilist[2] = iseq[i+2]
-        ilist[3] = iseq[i+3]
-        ilist[4] = iseq[i+4]
-        ilist[5] = iseq[i+5]
-
-        eh = TLOOP(ilist,eh,nl)
+        eh = TLOOP(ekern,i,eh,nl)
 
         if eh != 0.0e0:
             return eh
@@ -91,16 +86,7 @@ def EHAIR(iseq,i,j,n):
 
     elif ( nl == 6 ):
 
-        ilist[0] = iseq[i]
-        ilist[1] = iseq[i+1]
-        ilist[2] = iseq[i+2]
-        ilist[3] = iseq[i+3]
-        ilist[4] = iseq[i+4]
-        ilist[5] = iseq[i+5]
-        ilist[6] = iseq[i+6]
-        ilist[7] = iseq[i+7]
-
-        eh = TLOOP(ilist,eh,nl)
+        eh = TLOOP(ekern,i,eh,nl)
 
         if eh != 0.0e0:
             return eh
@@ -127,23 +113,18 @@ def EHAIR(iseq,i,j,n):
         # 5' (i) A X (i+1) LOOP
         # 3' (j) U Y (j+1) LOOP
 
-        ilist[0] = iseq[i]
-        ilist[1] = iseq[j]
-        ilist[2] = iseq[i+1]
-        ilist[3] = iseq[j-1]
-
-        eh = TSTACKH(ilist,eh)
+        eh = TSTACKH(ekern,i,j,i+1,j-1,eh)
 
     #=== TERM 3 ---> Bonuses ===#
 
     #=== GGG Hairpin Bonus ===#
 
-    if ( iseq[i] == 2 and iseq[j] == 3 ):
+    if ( iseq[i] == 3 and iseq[j] == 4 ):
 
         ic = 0
 
-        for k in xrange(max(0,i-2),i):
-            if ( iseq[k] == 2 ): ic += 1
+        for k in range(max(1,i-2),i):
+            if ( iseq[k] == 3 ): ic += 1
 
         if ( ic == 2 ): eh -= params.dG_bonuses[2]
 
@@ -153,8 +134,8 @@ def EHAIR(iseq,i,j,n):
 
     ic = 0
 
-    for k in xrange(i+1,j):
-        if ( iseq[k] == 1 ): ic += 1
+    for k in range(i+1,j):
+        if ( iseq[k] == 2 ): ic += 1
 
     if ( ic == nl ):
         if ( nl == 3 ):
@@ -167,8 +148,8 @@ def EHAIR(iseq,i,j,n):
 
     if ( nl == 3 ):
 
-        if ( iseq[i] == 3 ): eh += eau
-        if ( iseq[j] == 3 ): eh += eau
+        if ( iseq[i] == 4 ): eh += eau
+        if ( iseq[j] == 4 ): eh += eau
 
     # ^I think the AU penalty applies regardless of whether the
     # hairpin loop is a triloop or not
@@ -0,0 +1,135 @@
+"""
+Class: ENERGY_KERNEL (PARAMS,ISEQ,N)
+
+Description: Sequence specific lookup tables for the empirical INN energy
+             model, built once per parameter set and sequence and shared
+             by all of the E* and T* energy functions.
+
+Method: The MFOLD 3.0 tables of PARAMS (dG_stack, dG_stackh, dG_stacki,
+        dG_dangle3/5, dG_int11/21/22) are flattened into contiguous
+        arrays. For a table with D dimensions of size 4 the entry
+
+              TABLE(i1,i2,...,iD) = FLAT(4**(D-1)*i1 + ... + 4*iD-1 + iD)
+
+        and the stride products are precomputed for every nucleotide of
+        the sequence,
+
+              IOFF(p,k) = 4**p * IC(k),   IC(k) = ISEQ(k) - 1 (A=0,...,U=3)
+
+        so that a table lookup for the nucleotides at positions k1,...,kD
+        is a sum of D list reads and a single read of the flat table.
+
+        Helix stacks are always between adjacent basepairs (i,j) and
+        (i+1,j-1), so their table index splits into a 5' part that only
+        depends on i and a 3' part that only depends on j,
+
+              STK5(i) = 64*IC(i) + 4*IC(i+1)
+              STK3(j) = 16*IC(j) +   IC(j-1)
+
+        and ESTACK is one read of the flat stack table. This gives the
+        per-(i,j) stacking energy of every possible pair of the sequence
+        in O(N) memory instead of a dense N x N table.
+
+        For the special hairpins of NL = 3, 4 and 6 nt the closing pair
+        and loop starting at nucleotide i are packed into a base-4 code
+        (see PARAMS.readpar.packloop),
+
+              LPACK(NL,i) = IC(i)*4**(NL+1) + ... + IC(i+NL+1)
+
+        which TLOOP looks up in the loop indexes of PARAMS.
+
+Arguments:
+
+        PARAMS - Free energy parameters (FreeEnergyParameters), at the
+                 temperature of the simulation (see at_temperature).
+          ISEQ - Array containing the sequence in numerical code
+                 (A=1,C=2,G=3,U=4), 0 for the padding.
+             N - Number of nucleotides in the sequence.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+from array import array
+
+import numpy as np
+
+
+def FLAT(table):
+
+    # Contiguous row-major copy of a parameter table
+    return array('d',np.ascontiguousarray(table,dtype=np.float64).ravel())
+
+
+class ENERGY_KERNEL(object):
+
+    __slots__ = ('params','n','beta','iseq','ic','ioff','stk5','stk3','lpack',
+                 'dg_stack','dg_stackh','dg_stacki',
+                 'dg_dangle3','dg_dangle5',
+                 'dg_int11','dg_int21','dg_int22')
+
+    def __init__(self,params,iseq,n):
+
+        # INTEGER
+        # n,k,p,m,nl,code,mask
+
+        self.params = params
+        self.n = n
+
+        # 1/RT at the temperature of the parameter set
+        self.beta = params.beta
+
+        #=== Sequence ===#
+
+        self.iseq = [ int(x) for x in iseq ]
+
+        m = len(self.iseq)
+
+        # Table index of each nt, the padding maps to 0
+        self.ic = [ max(x-1,0) for x in self.iseq ]
+
+        # IOFF(p,k) = 4**p * IC(k)
+        self.ioff = [ [ (4**p)*c for c in self.ic ] for p in range(8) ]
+
+        #=== Adjacent Helix Stacks ===#
+
+        o = self.ioff
+
+        self.stk5 = [ o[3][k] + o[1][k+1] for k in range(m-1) ] + [0]
+        self.stk3 = [0] + [ o[2][k] + o[0][k-1] for k in range(1,m) ]
+
+        #=== Special Hairpin Codes ===#
+
+        self.lpack = {}
+
+        for nl in (3,4,6):
+
+            pack = [0]*m
+            code = 0
+            mask = 4**(nl+2)
+
+            # rolling code of the nl+2 nt ending at k
+            for k in range(m):
+                code = (4*code + self.ic[k]) % mask
+                if ( k >= nl+1 ):
+                    pack[k-nl-1] = code
+
+            self.lpack[nl] = pack
+
+        #=== Flat Tables ===#
+
+        self.dg_stack   = FLAT(params.dG_stack)
+        self.dg_stackh  = FLAT(params.dG_stackh)
+        self.dg_stacki  = FLAT(params.dG_stacki)
+        self.dg_dangle3 = FLAT(params.dG_dangle3)
+        self.dg_dangle5 = FLAT(params.dG_dangle5)
+        self.dg_int11   = FLAT(params.dG_int11)
+        self.dg_int21   = FLAT(params.dG_int21)
+        self.dg_int22   = FLAT(params.dG_int22)
@@ -1,5 +1,5 @@
 """
-Function: ELOOP (ISEQ,IBSP,I,J,N)
+Function: ELOOP (EKERN,IBSP,I,J,N)
 
 Description: Computes the energy of an RNA loop using the empirical INN model.
 
@@ -21,20 +21,25 @@ Method: Uses the MFOLD 3.0 energy function for RNA given by:
 
 Arguments:
 
-          ISEQ - Array of length N containing the sequence
-                 in numerical code (A=1,C=2,G=3,U=4)
+         EKERN - Energy kernel (ENERGY_KERNEL) of the sequence.
           IBSP - Array of dimension (N) containing the information
                  on base pairs in the RNA fold.
                  IBSP(i) = j  [i base pairs with j]
-                 IBSP(i) = -1 [i is single stranded]
-             I - Nucleotide position of the 5' most nucleotide.
-             J - Nucleotide position of the 3' most nucleotide.
+                 IBSP(i) = 0  [i is single stranded]
+                 Positions are 1-based, IBSP(1..N).
+             I - Nucleotide position of the 5' most nucleotide
+                 (N for the external loop).
+             J - Nucleotide position of the 3' most nucleotide
+                 (1 for the external loop).
              N - Number of nucleotides in the sequence.
 
 History:
 Version     Date            Comment
 --------    -------         --------------------
             09/28/2017      Original Code
+            10/17/2026      Sequence and tables through ENERGY_KERNEL
+            10/17/2026      Beta of the parameter set (EKERN%BETA)
+            10/17/2026      1-based IBSP (0 unpaired), MBL term in EMULTI
 
 Dependencies:
 
@@ -42,26 +47,29 @@ Author(s): Alex Reis
            Copyright (c) 2017 (Please refer to LICENCE)
 """
 
-import math
-from rnavar import em,eh,es,beta
+from ENERGY.ehair import EHAIR
+from ENERGY.ebulge import EBULGE
+from ENERGY.edangle import EDANGLE
+from ENERGY.emulti import EMULTI
 
-def ELOOP(iseq,ibsp,i,j,n):
+def ELOOP(ekern,ibsp,i,j,n):
 
     # INTEGER
-    # i,j,n,nh,ns,tns,indx
-    # iseq(n),ibsp(n),nsl(n)
+    # i,j,n,nh,ns,ins,ilast
+    # iseq(n),ibsp(n),lns(0:nh)
 
     # REAL
-    # x,c,ed,e3,e5,el,asym
+    # ed,e3,e5,el
+
+    ic = ekern.ic
+    params = ekern.params
 
     el = 0.0e0
 
     nh = 0
     ns = 0
     ins = 0
-    lns = []
-
-    c = 1.750e0 / float(beta)
+    lns = [0]
 
     #=== Internal Loop iloop = 1 ===#
     #=== External Loop iloop = 0 ===#
@@ -79,12 +87,13 @@ def ELOOP(iseq,ibsp,i,j,n):
     while ( k <= ke ):
 
         # unpaired nt
-        if ( ibsp[k] == -1 ):
+        if ( ibsp[k] == 0 ):
             ins += 1
 
         # new helix in loop
         elif ( ibsp[k] >  k ):
             lns[nh] = ins
+            lns.append(0)
             ns += ins
             ins = 0
             nh += 1
@@ -103,26 +112,26 @@ def ELOOP(iseq,ibsp,i,j,n):
 
     if ( nh == 1 and iloop == 1 ):
 
-        el = EHAIR(iseq,i,j,n)
+        el = EHAIR(ekern,i,j,n)
 
     elif ( nh == 2 and iloop == 1 ):
 
         ip = i + 1
-        while ( ibsp[ip] == -1 ):
+        while ( ibsp[ip] == 0 ):
             ip += 1
 
         jp = ibsp[ip]
 
-        el = EBULGE(iseq,i,j,ip,jp,n)
+        el = EBULGE(ekern,i,j,ip,jp,n)
 
     else:
 
         e3 = 0.0e0
+        ilast = -1
 
         if ( iloop == 0 ):
 
             k = ks
-            # ilast = 0 # not used
 
         elif ( iloop == 1 ):
 
@@ -132,40 +141,14 @@ def ELOOP(iseq,ibsp,i,j,n):
             k = ip + 1
             ilast = k
 
-            if ( k >= 0 and k <= n-1 ) and ( ibsp[k] == -1 ):
-                e3 = EDANGLE(iseq,ip,jp,k,n)
-
-            if ( params.MBLmodel == 2 ):
-
-                # calculate average asymmetry of MBL
-                asym = 0.0e0
-                for indx in xrange(1,nh+1):
-                    asym += float( abs( lns[indx] - lns[indx-1] ) )
-                asym /= float(nh)
-                asym = min(2.0,asym)
-
-                el  = params.MBLinit[0]               # a
-                el += params.MBLinit[1] * float(asym) # b
-                el += params.MBLinit[2] * float(nh)   # c
-
-                if (nh == 3) and (ns < 2):
-                    el += params.MBLinit[4] # dG_strain
-
-            elif ( ns <= 6 ):
-                el  = params.MBLinit[0]               # a, (em)
-                el += params.MBLinit[1] * float(ns)   # b, (es)
-                el += params.MBLinit[2] * float(nh)   # c, (eh)
+            if ( ibsp[k] == 0 ):
+                e3 = EDANGLE(ekern,ip,jp,k,n)
 
-            else:
-                el  = params.MBLinit[0]
-                el += params.MBLinit[1] * 6.0e0
-                x   = float(ns) / 6.0e0
-                el += c * math.log(x)
-                el += params.MBLinit[2] * float(nh)
+            el = EMULTI(ekern,nh,ns,lns)
 
         while ( k <= ke ):
 
-            if ( ibsp[k] != -1 ):
+            if ( ibsp[k] != 0 ):
 
                 ip = k
                 jp = ibsp[k]
@@ -174,8 +157,8 @@ def ELOOP(iseq,ibsp,i,j,n):
 
                 e5 = 0.0e0
 
-                if ( kp >= 0 and kp <= n-1 ) and ( ibsp[kp] == -1 ):
-                    e5 = EDANGLE(iseq,ip,jp,kp,n)
+                if ( kp >= 1 ) and ( ibsp[kp] == 0 ):
+                    e5 = EDANGLE(ekern,ip,jp,kp,n)
 
                 # pick 3' (H1) or 5' (H2) dangle if same nt
                 if ( ilast == kp ):
@@ -183,15 +166,15 @@ def ELOOP(iseq,ibsp,i,j,n):
                 else:
                     ed = e3 + e5
 
-                el = el + ed + params.dG_AUP[iseq[ip]][iseq[jp]]
+                el = el + ed + params.dG_AUP[ic[ip]][ic[jp]]
 
                 kp = jp + 1
                 ilast = kp
 
                 e3 = 0.0e0
 
-                if ( kp >= 0 and kp <= n-1 ) and ( ibsp[kp] == -1 ):
-                    e3 = EDANGLE(iseq,ip,jp,kp,n)
+                if ( kp <= n ) and ( ibsp[kp] == 0 ):
+                    e3 = EDANGLE(ekern,ip,jp,kp,n)
 
                 if ( k != ke ):
                     k = ibsp[k]
@@ -200,4 +183,4 @@ def ELOOP(iseq,ibsp,i,j,n):
         if ( iloop == 0 ):
             el += e3
 
-    return el
\ No newline at end of file
+    return el
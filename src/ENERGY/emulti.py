@@ -0,0 +1,91 @@
+"""
+Function: EMULTI (EKERN,NH,NS,LNS)
+
+Description: Initiation free energy of a multi-branch loop (MBL) of the
+             empirical INN model, shared by ELOOP and the DELTAG_* loop
+             energy changes.
+
+Method: PARAMS%MBLMODEL selects the MBL model of the parameter set,
+
+        MBLMODEL = 2 (Turner 2004, asymmetry model):
+
+           EM = a + b*ASYM + c*NH [+ GS if NH = 3 and NS < 2]
+
+           ASYM = MIN(2, SUM |LNS(k) - LNS(k-1)| / NH),  k = 1..NH
+
+        otherwise (Turner 1999, linear model):
+
+           EM = a + b*NS + c*NH                IF NS <= 6
+              = a + b*6  + c*NH + d*LOG(NS/6)  IF NS  > 6
+
+           where a,b,c = PARAMS%MBLINIT(0:2)
+                 GS    = PARAMS%MBLINIT(3), strain of a 3-way junction
+                 d     = 1.75 KT
+
+Arguments:
+
+         EKERN - Energy kernel (ENERGY_KERNEL) of the sequence.
+            NH - Number of helices in the loop, the closing one included.
+            NS - Number of single stranded nt in the loop.
+           LNS - Single stranded nt between consecutive helices of the
+                 loop, LNS(k) after helix k and LNS(0) = LNS(NH).
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies:
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import math
+
+def EMULTI(ekern,nh,ns,lns):
+
+    # INTEGER
+    # nh,ns,indx
+    # lns(0:nh)
+
+    # REAL
+    # em,x,c,asym
+
+    params = ekern.params
+
+    mbl = params.MBLinit
+
+    if ( params.MBLmodel == 2 ):
+
+        # average asymmetry of the MBL
+        asym = 0.0e0
+        for indx in range(1,nh+1):
+            asym += float( abs( lns[indx] - lns[indx-1] ) )
+        asym /= float(nh)
+        asym = min(2.0,asym)
+
+        em  = mbl[0]               # a
+        em += mbl[1] * asym        # b
+        em += mbl[2] * float(nh)   # c
+
+        if ( nh == 3 ) and ( ns < 2 ):
+            em += mbl[3] # dG_strain
+
+    elif ( ns <= 6 ):
+
+        em  = mbl[0]               # a, (em)
+        em += mbl[1] * float(ns)   # b, (es)
+        em += mbl[2] * float(nh)   # c, (eh)
+
+    else:
+
+        c = 1.750e0 / float(ekern.beta)
+
+        x   = float(ns) / 6.0e0
+        em  = mbl[0]
+        em += mbl[1] * 6.0e0
+        em += c * math.log(x)
+        em += mbl[2] * float(nh)
+
+    return em
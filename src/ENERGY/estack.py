@@ -1,5 +1,5 @@
 """
-Function: ESTACK (ISEQ,I,J,IP,JP,N)
+Function: ESTACK (EKERN,I,J,IP,JP,N)
 
 Description: Computes the energy of a helix stacking between two bp using
              the empirical INN energy model.
@@ -13,10 +13,13 @@ Method: Uses the MFOLD 3.0 energy function for RNA given by:
 
               NOTE: I < IP and JP < J
 
+        The stack is a single read of the flat stack table of the energy
+        kernel, indexed by the precomputed 5' and 3' offsets of I and J.
+        IP = I+1 and JP = J-1 are assumed (adjacent basepairs).
+
 Arguments:
 
-         ISEQ - Array of length N containing the sequence
-                in numerical code (A=1,C=2,G=3,U=4)
+        EKERN - Energy kernel (ENERGY_KERNEL) of the sequence.
             I - Nucleotide position of the first basepair 5'.
             J - Nucleotide position of the first basepair 3'.
            IP - Nucleotide position of the second basepair 5'.
@@ -27,6 +30,7 @@ History:
 Version     Date            Comment
 --------    -------         --------------------
             09/28/2017      Original Code
+            10/17/2026      Precomputed stack offsets of ENERGY_KERNEL
 
 Dependencies:
 
@@ -34,26 +38,17 @@ Author(s): Alex Reis
            Copyright (c) 2017 (Please refer to LICENCE)
 """
 
-def ESTACK(iseq,i,j,ip,jp,n):
+def ESTACK(ekern,i,j,ip,jp,n):
 
     # INTEGER
     # i,j,ip,jp,n
-    # iseq(n)
-    # ilist(4)
 
     # REAL
     # es
 
-    es = 0.0e0
-
     # 5' (i) A X (ip) 3'
     # 3' (j) U Y (jp) 5'
 
-    ilist[0] = iseq[i]
-    ilist[1] = iseq[j]
-    ilist[2] = iseq[ip]
-    ilist[3] = iseq[jp]
-
-    es = TSTACK(ilist,es)
+    es = ekern.dg_stack[ekern.stk5[i]+ekern.stk3[j]]
 
     return es
@@ -1,5 +1,5 @@
 """
-Module: ESTUC (ISEQ,IBSP,N)
+Module: ESTUC (EKERN,IBSP,N)
 
 Description: Computes the energy of an RNA secondary structure using the
              empirical INN model.
@@ -10,18 +10,20 @@ Method: Uses the MFOLD 3.0 energy function for RNA given by:
 
 Arguments:
 
-          ISEQ - Array of length N containing the sequence
-                 in numerical code (A=1,C=2,G=3,U=4)
+         EKERN - Energy kernel (ENERGY_KERNEL) of the sequence.
           IBSP - Array of dimension (N) containing the information
                  on base pairs in the RNA fold.
                  IBSP(i) = j  [i base pairs with j]
-                 IBSP(i) = -1 [i is single stranded]
+                 IBSP(i) = 0  [i is single stranded]
+                 Positions are 1-based, IBSP(1..N).
              N - Number of nucleotides in the sequence.
 
 History:
 Version     Date            Comment
 --------    -------         --------------------
             09/28/2017      Original Code
+            10/17/2026      Sequence and tables through ENERGY_KERNEL
+            10/17/2026      1-based IBSP (0 unpaired) as RNA%IBSP
 
 Dependencies:
 
@@ -29,17 +31,20 @@ Author(s): Alex Reis
            Copyright (c) 2017 (Please refer to LICENCE)
 """
 
-def ESTRUC(iseq,ibsp,n):
+from ENERGY.eloop import ELOOP
+from ENERGY.estack import ESTACK
+
+def ESTRUC(ekern,ibsp,n):
 
     # INTEGER
-    # iseq(n),ibsp(n)
+    # ibsp(n)
     # i,j,ip,jp
     # il,nl,loop(n)
 
     # REAL
     # e,el,es
 
-    loop = [0 for _ in range(n)]
+    loop = [0 for _ in range(n+1)]
 
     e  = 0.0e0
     el = 0.0e0
@@ -48,9 +53,9 @@ def ESTRUC(iseq,ibsp,n):
     #=== Find Loops ===#
 
     nl = 1
-    loop[0] = n - 1
+    loop[0] = n
 
-    for i in xrange(0,n):
+    for i in range(1,n+1):
 
         j = ibsp[i]
 
@@ -70,11 +75,11 @@ def ESTRUC(iseq,ibsp,n):
         i = loop[il]
         j = ibsp[i]
 
-        if ( i == n - 1 ): j = 0
+        if ( i == n ): j = 1
 
         #=== Loop Energy ===#
 
-        el = ELOOP(iseq,ibsp,i,j,n)
+        el = ELOOP(ekern,ibsp,i,j,n)
 
         e += el
 
@@ -83,13 +88,13 @@ def ESTRUC(iseq,ibsp,n):
         ip = i - 1
         jp = j + 1
 
-        if ( ip < 0   ): continue
-        if ( jp > n-1 ): continue
-        if ( i  > j   ): continue
+        if ( ip < 1 ): continue
+        if ( jp > n ): continue
+        if ( i  > j ): continue
 
         while ( ibsp[ip] == jp ):
 
-            es = ESTACK(iseq,ip,jp,i,j,n)
+            es = ESTACK(ekern,ip,jp,i,j,n)
 
             e += es
 
@@ -99,8 +104,7 @@ def ESTRUC(iseq,ibsp,n):
             ip -= 1
             jp += 1
 
-            if ( ip < 0   ): break
-            if ( jp > n-1 ): break
+            if ( ip < 1 ): break
+            if ( jp > n ): break
 
     return e
-
@@ -1,5 +1,5 @@
 '''
-Subroutine: TDANGLE5 (LIST,ES)
+Subroutine: TDANGLE5 (EKERN,K1,K2,K3,ES)
 
 Purpose: Performs a table lookup for the stacking interaction
          between a dangling base and a basepair in a helix.
@@ -8,23 +8,24 @@ Method: Uses the MFOLD 3.0 energy function table for RNA @ T=37.
 
 Arguments:
 
-         LIST - Array of length 3 containing the nucleotides in
-                numerical code (A=1,C=2,G=3,U=4) for the
-                following locations:
+        EKERN - Energy kernel (ENERGY_KERNEL) of the sequence.
+        K1-K3 - Nucleotide positions of the following
+                locations:
 
                 5' (1) A       3'
                 3' (2) U X (3) 5'
 
-                where LIST(1) = letter code for position 1 etc.
+                where K1 = position of location 1 etc.
 
            ES - (OUTPUT) MFOLD 3.0 stacking energy of the sequence
-                provided in LIST.
+                at positions K1-K3.
 
 History:
 
 Version    Date         Comment
 --------   ----------   -----------------------
            01/01/2015   Original Code
+           10/17/2026   Flat table lookup through ENERGY_KERNEL
 
 Dependencies:
 
@@ -36,18 +37,18 @@ Author(s): Alex Reis
            Copyright (c) 2015 (Please Refer to LICENCE)
 '''
 
-def TDANGLE5(ilist,es):
+def TDANGLE5(ekern,k1,k2,k3,es):
 
     # INTEGERS
-    # ilist(3),i1,i2,i3
+    # k1,k2,k3,indx
 
     # REAL
     # es
 
-    i1 = ilist[0]
-    i2 = ilist[1]
-    i3 = ilist[2]
+    o = ekern.ioff
 
-    es += params.dG_dangle5[i1,i2,i3]
+    indx = o[2][k1] + o[1][k2] + o[0][k3]
 
-    return es
\ No newline at end of file
+    es += ekern.dg_dangle5[indx]
+
+    return es
@@ -1,5 +1,5 @@
 '''
-Subroutine: TINT22 (LIST,EB)
+Subroutine: TINT22 (EKERN,K1,K2,K3,K4,K5,K6,K7,K8,EB)
 
 Purpose: Performs a table lookup for the internal energy for two mismatch
          pairs between two basepairs in a helix.
@@ -8,25 +8,26 @@ Method: Uses the MFOLD 3.0 energy function table for RNA @ T=37.
 
 Arguments:
 
-         LIST - Array of length 4 containing the nucleotides in
-                numerical code (A=1,C=2,G=3,U=4) for the
-                following locations:
+        EKERN - Energy kernel (ENERGY_KERNEL) of the sequence.
+        K1-K8 - Nucleotide positions of the following
+                locations:
 
                         (3)(5)        
                 5' (1) A .  . X (7) 3'
                 3' (2) U .  . Y (8) 5'
                         (4)(6)             
 
-                where LIST(1) = letter code for position 1 etc.
+                where K1 = position of location 1 etc.
 
            EB - (OUTPUT) MFOLD 3.0 internal loop energy of the sequence
-                provided in LIST.
+                at positions K1-K8.
 
 History:
 
 Version    Date         Comment
 --------   ----------   -----------------------
            01/01/2015   Original Code
+           10/17/2026   Flat table lookup through ENERGY_KERNEL
 
 Dependencies:
 
@@ -38,23 +39,19 @@ Author(s): Eric Dykeman
            Copyright (c) 2015 (Please Refer to LICENCE)
 '''
 
-def TINT22(ilist,eb):
+def TINT22(ekern,k1,k2,k3,k4,k5,k6,k7,k8,eb):
 
     # INTEGERS
-    # ilist(8),i1,i2,i3,i4,i5,i6,i7,i8
+    # k1,k2,k3,k4,k5,k6,k7,k8,indx
 
     # REAL
     # eb
 
-    i1 = ilist[0]
-    i2 = ilist[1]
-    i3 = ilist[2]
-    i4 = ilist[3]
-    i5 = ilist[4]
-    i6 = ilist[5]
-    i7 = ilist[6]
-    i8 = ilist[7]
+    o = ekern.ioff
 
-    eb += params.dG_int22[i1,i2,i3,i4,i5,i6,i7,i8]
+    indx = o[7][k1] + o[6][k2] + o[5][k3] + o[4][k4] + \
+           o[3][k5] + o[2][k6] + o[1][k7] + o[0][k8]
 
-    return eb
\ No newline at end of file
+    eb += ekern.dg_int22[indx]
+
+    return eb
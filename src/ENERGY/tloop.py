@@ -1,31 +1,36 @@
 '''
-Subroutine: TLOOP (LIST,EL)
+Subroutine: TLOOP (EKERN,I,EL,NL)
 
 Purpose: Performs a table lookup for the special bonus energies
          for various tetra-loops.
 
 Method: Uses the MFOLD 3.0 energy function table for RNA @ T=37.
 
+        The closing pair and loop are taken as the base-4 packed code
+        precomputed by the energy kernel, LPACK(NL,I), and looked up in
+        the tri-, tetra- or hexaloop index built by readpar, so no
+        strings are built and the tables are not scanned.
+
 Arguments:
 
-         LIST - Array of length N containing the nucleotides in
-                numerical code (A=0,C=1,G=2,U=3) for the
-                following locations:
+        EKERN - Energy kernel (ENERGY_KERNEL) of the sequence.
+            I - Nucleotide position of the loop basepair 5',
+                location 1 below:
 
                     1 2 3 4 5 6
                 5'  A W X Y Z U   3'
                       L O O P
 
-                where LIST(1) = letter code for position 1 etc.
-
            EL - (OUTPUT) MFOLD 3.0 tetra-loop bonus energy of the
-                sequence provided in LIST.
+                loop closed by I.
+           NL - Number of nucleotides in the loop (3, 4 or 6).
 
 History:
 
 Version    Date         Comment
 --------   ----------   -----------------------
            01/01/2015   Original Code
+           10/17/2026   O(1) lookup of the packed loop code
 
 Dependencies:
 
@@ -37,18 +42,15 @@ Author(s): Alex Reis
            Copyright (c) 2015 (Please Refer to LICENCE)
 '''
 
-def TLOOP(ilist,el,nl):
+def TLOOP(ekern,i,el,nl):
 
     # ARGUMENTS/VARIABLES
     # INTEGERS
-    # ilist(8), nl, i
-    # STRINGS
-    # cl(8)
+    # i, nl, irow
     # REAL INOUT
     # el
 
-    # cwrk?
-
+    params = ekern.params
 
     # Triloops
     #      0 1 2 3 4      #
@@ -56,19 +58,10 @@ def TLOOP(ilist,el,nl):
 
     if nl == 3:
 
-        for i in xrange(5):
-            if   ilist[i] == 0: cl[i] = 'A'
-            elif ilist[i] == 1: cl[i] = 'C'
-            elif ilist[i] == 2: cl[i] = 'G'
-            else:               cl[i] = 'U' # ilist[i] == 3
-
-        cwrk = ''.join(ilist[:5])
+        irow = params.triloop_index.get(ekern.lpack[3][i])
 
-        for i in xrange(100):
-            if params.triloops[i] == '':
-                break
-            if params.triloops[i] == cwrk:
-                el += params.dG_triloops[i]
+        if irow is not None:
+            el += params.dG_triloops[irow]
 
     # Tetraloops
     #      1 2 3 4 5 6      #
@@ -77,19 +70,10 @@ def TLOOP(ilist,el,nl):
 
     elif nl == 4:
 
-        for i in xrange(6):
-            if   ilist[i] == 0: cl[i] = 'A'
-            elif ilist[i] == 1: cl[i] = 'C'
-            elif ilist[i] == 2: cl[i] = 'G'
-            else:               cl[i] = 'U' # ilist[i] == 3
+        irow = params.tetraloop_index.get(ekern.lpack[4][i])
 
-        cwrk = ''.join(ilist[:6])
-
-        for i in xrange(100):
-            if params.tetraloops[i] == '':
-                break
-            if params.tetraloops[i] == cwrk:
-                el += params.dG_tetraloops[i]
+        if irow is not None:
+            el += params.dG_tetraloops[irow]
 
     # Hexaloops
     #      0 1 2 3 4 5 6 7      #
@@ -98,18 +82,9 @@ def TLOOP(ilist,el,nl):
 
     else: # nl == 6:
 
-        for i in xrange(8):
-            if   ilist[i] == 0: cl[i] = 'A'
-            elif ilist[i] == 1: cl[i] = 'C'
-            elif ilist[i] == 2: cl[i] = 'G'
-            else:               cl[i] = 'U' # ilist[i] == 3
-
-        cwrk = ''.join(ilist[:6])
-
-        for i in xrange(100):
-            if params.hexaloops[i] == '':
-                break
-            if params.hexaloops[i] == cwrk:
-                el += params.dG_hexaloops[i]
-    
-    return el
\ No newline at end of file
+        irow = params.hexaloop_index.get(ekern.lpack[6][i])
+
+        if irow is not None:
+            el += params.dG_hexaloops[irow]
+
+    return el
@@ -1,5 +1,5 @@
 '''
-Subroutine: TSTACKI (LIST,ES)
+Subroutine: TSTACKI (EKERN,K1,K2,K3,K4,ES)
 
 Purpose: Performs a table lookup for the stacking interaction of
          the two nucleotides positioned over a closing basepair in
@@ -9,23 +9,24 @@ Method: Uses the MFOLD 3.0 energy function table for RNA @ T=37.
 
 Arguments:
 
-         LIST - Array of length 4 containing the nucleotides in
-                numerical code (A=1,C=2,G=3,U=4) for the
-                following locations:
+        EKERN - Energy kernel (ENERGY_KERNEL) of the sequence.
+        K1-K4 - Nucleotide positions of the following
+                locations:
 
                 5' (1) A X (3) 3' INTERNAL LOOP
                 3' (2) U Y (4) 5' INTERNAL LOOP
 
-                where LIST(1) = letter code for position 1 etc.
+                where K1 = position of location 1 etc.
 
            ES - (OUTPUT) MFOLD 3.0 stacking energy of the sequence
-                provided in LIST.
+                at positions K1-K4.
 
 History:
 
 Version    Date         Comment
 --------   ----------   -----------------------
            01/01/2015   Original Code
+           10/17/2026   Flat table lookup through ENERGY_KERNEL
 
 Dependencies:
 
@@ -37,19 +38,18 @@ Author(s): Alex Reis
            Copyright (c) 2015 (Please Refer to LICENCE)
 '''
 
-def TSTACKI(ilist,es):
+def TSTACKI(ekern,k1,k2,k3,k4,es):
 
     # INTEGERS
-    # ilist(4),i,i1,i2,i3,i4
+    # k1,k2,k3,k4,indx
 
     # REAL
     # es
 
-    i1 = ilist[0]
-    i2 = ilist[1]
-    i3 = ilist[2]
-    i4 = ilist[3]
+    o = ekern.ioff
 
-    es += params.dG_stacki[i1,i2,i3,i4]
+    indx = o[3][k1] + o[2][k2] + o[1][k3] + o[0][k4]
 
-    return es
\ No newline at end of file
+    es += ekern.dg_stacki[indx]
+
+    return es
@@ -1,7 +1,18 @@
 import os
 import sys
+import json
+import hashlib
+from collections import OrderedDict
 import numpy as np
 
+# gas constant (kcal/mol/K) and temperature (K) of the parameter tables
+gcons = 1.987206e-3
+temp37 = 310.15e0
+
+# LRU of temperature rescaled parameter sets, (sha256,T) -> params
+tcache = OrderedDict()
+tcache_size = 32
+
 def num(s):
     try:
         return float(s)
@@ -11,6 +22,14 @@ def num(s):
 # nucleotide to index conversion dict
 convert = {'A': 0,'C': 1, 'G': 2, 'U': 3}
 
+def packloop(loop):
+    # base-4 packed integer code of a loop sequence (A=0,C=1,G=2,U=3),
+    # first nt in the most significant digit
+    code = 0
+    for c in loop:
+        code = 4*code + convert[c]
+    return code
+
 # ordered list of possible base pairs used in the parameter files
 # basepairs = ['CG','GC','GU','UG','AU','UA']
 basepairs = [ (1,2), (2,1), (2,3), (3,2), (0,3), (3,0) ]
@@ -25,9 +44,9 @@ class FreeEnergyParameters:
         self.dG_int11      = np.zeros(shape=tuple([4]*6), dtype=float)
         self.dG_int21      = np.zeros(shape=tuple([4]*7), dtype=float)
         self.dG_int22      = np.zeros(shape=tuple([4]*8), dtype=float)
-        self.dG_hloop      = np.zeros(30, dtype=float)
-        self.dG_bulge      = np.zeros(30, dtype=float)
-        self.dG_iloop      = np.zeros(30, dtype=float)
+        self.dG_hloop      = np.zeros(31, dtype=float)
+        self.dG_bulge      = np.zeros(31, dtype=float)
+        self.dG_iloop      = np.zeros(31, dtype=float)
         self.dG_triloops   = np.zeros(100, dtype=float)
         self.dG_tetraloops = np.zeros(100, dtype=float)
         self.dG_hexaloops  = np.zeros(100, dtype=float)
@@ -40,9 +59,9 @@ class FreeEnergyParameters:
         self.dH_int11      = np.zeros(shape=tuple([4]*6), dtype=float)
         self.dH_int21      = np.zeros(shape=tuple([4]*7), dtype=float)
         self.dH_int22      = np.zeros(shape=tuple([4]*8), dtype=float)
-        self.dH_hloop      = np.zeros(30, dtype=float)
-        self.dH_bulge      = np.zeros(30, dtype=float)
-        self.dH_iloop      = np.zeros(30, dtype=float)
+        self.dH_hloop      = np.zeros(31, dtype=float)
+        self.dH_bulge      = np.zeros(31, dtype=float)
+        self.dH_iloop      = np.zeros(31, dtype=float)
         self.dH_triloops   = np.zeros(100, dtype=float)
         self.dH_tetraloops = np.zeros(100, dtype=float)
         self.dH_hexaloops  = np.zeros(100, dtype=float)
@@ -51,19 +70,250 @@ class FreeEnergyParameters:
         self.tetraloops = ['']*100
         self.hexaloops = ['']*100
 
+        # packloop(loop) -> row of the loop in the tables above
+        self.triloop_index   = {}
+        self.tetraloop_index = {}
+        self.hexaloop_index  = {}
+
         # Other added parameters - see bottom of readpar()
         self.dG_bonuses    = np.zeros(6, dtype=float)
         self.MBLmodel      = 0
         self.MBLinit       = np.zeros(4, dtype=float)
         self.dG_AU         = 0.0
-        self.dG_AUP        = np.zeros(shape=tuple(4,4), dtype=float)
+        self.dG_AUP        = np.zeros(shape=(4,4), dtype=float)
         self.dG_asym       = np.zeros(6, dtype=float)
+        self.dG_maxasym    = 0.0
 
         self.dH_bonuses    = np.zeros(6, dtype=float)
 
+        # Temperature (K) of the dG tables and matching 1/RT
+        self.temp          = temp37
+        self.beta          = 1.0 / (gcons * temp37)
+
+    def at_temperature(self,T):
+
+        # Parameters rescaled to temperature T (K) from the 37 C tables,
+        #
+        #     dG(T) = dH - T * (dH - dG37) / 310.15
+        #
+        # for every dG_* table with a dH_* counterpart. The tables are
+        # concatenated and rescaled in a single vectorized pass, the new
+        # tables are views into the result. A rescaled set keeps its 37 C
+        # set in base37 and is rescaled again from it, never from its own
+        # dG(T) tables. Parameter sets with a sha256 (from readpar) are
+        # memoized on (sha256 of the .par file,T).
+
+        T = float(T)
+
+        base = getattr(self,'base37',None)
+        if base is not None:
+            return base.at_temperature(T)
+
+        if self.temp != temp37:
+            raise ValueError("Parameters at {} K have no 37 C tables to rescale from.".format(self.temp))
+
+        sha = getattr(self,'sha256',None)
+        key = (sha,T)
+
+        if sha is not None and key in tcache:
+            tcache.move_to_end(key)
+            return tcache[key]
+
+        names = []
+        for name,value in sorted(vars(self).items()):
+            if not name.startswith('dG_') or not isinstance(value,np.ndarray):
+                continue
+            dh = getattr(self,'dH_' + name[3:],None)
+            if isinstance(dh,np.ndarray) and dh.shape == value.shape:
+                names.append(name)
+
+        dg = np.concatenate([ np.ravel(getattr(self,name)) for name in names ])
+        dh = np.concatenate([ np.ravel(getattr(self,'dH_' + name[3:])) for name in names ])
+
+        # entries without a finite dG or dH (INF in the .par file) keep dG
+        fin = np.isfinite(dg) & np.isfinite(dh)
+        dgt = dg.copy()
+        dgt[fin] = dh[fin] - T * (dh[fin] - dg[fin]) / temp37
+
+        params = FreeEnergyParameters.__new__(FreeEnergyParameters)
+        params.__dict__.update(vars(self))
+
+        offset = 0
+        for name in names:
+            shape = getattr(self,name).shape
+            size = int(np.prod(shape))
+            setattr(params,name,dgt[offset:offset+size].reshape(shape))
+            offset += size
+
+        params.temp = T
+        params.beta = 1.0 / (gcons * T)
+        params.base37 = self
+
+        if sha is not None:
+            tcache[key] = params
+            while len(tcache) > tcache_size:
+                tcache.popitem(last=False)
+
+        return params
+
+
+
+# ========================================================================
+# Compiled parameter bundles
+#
+# A parsed .par file is cached next to it as
+#
+#   <paramfile>.npy  - every numeric table concatenated into one flat
+#                      float64 array (loaded with mmap_mode='r', so the
+#                      pages are shared by all the processes using it)
+#   <paramfile>.json - bundle version, sha256 of the .par file and the
+#                      (offset,shape) of each table in the .npy, plus the
+#                      loop strings and scalar parameters
+#
+# The .json is written last and acts as the commit marker of the bundle.
+# A single .npy is used rather than an .npz because np.load ignores
+# mmap_mode for zip archives.
+
+bundle_version = 3
+
+def parhash(paramfile):
+
+    h = hashlib.sha256()
+    with open(paramfile,'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def bundlepaths(paramfile):
+
+    return paramfile + '.npy', paramfile + '.json'
+
+
+def compilepar(params,paramfile,sha=None):
+
+    # serialize params into the bundle of paramfile
+
+    if sha is None:
+        sha = parhash(paramfile)
+
+    npyfile,jsonfile = bundlepaths(paramfile)
+
+    layout  = {}
+    strings = {}
+    scalars = {}
+    tables  = []
+    offset  = 0
+
+    for name,value in sorted(vars(params).items()):
+        if isinstance(value,np.ndarray):
+            layout[name] = [offset,list(value.shape)]
+            tables.append(np.asarray(value,dtype=np.float64).ravel())
+            offset += value.size
+        elif isinstance(value,list):
+            strings[name] = value
+        elif isinstance(value,(bool,int,float)):
+            scalars[name] = value
+
+    header = {}
+    header['version'] = bundle_version
+    header['sha256']  = sha
+    header['layout']  = layout
+    header['strings'] = strings
+    header['scalars'] = scalars
+
+    # write to temporary files and rename so that a reader never sees a
+    # partially written bundle
+    with open(npyfile + '.tmp','wb') as f:
+        np.save(f,np.concatenate(tables))
+    os.replace(npyfile + '.tmp',npyfile)
+
+    with open(jsonfile + '.tmp','w') as f:
+        json.dump(header,f)
+    os.replace(jsonfile + '.tmp',jsonfile)
+
+
+def loadpar(paramfile,sha=None):
 
+    # params from the bundle of paramfile, None if it is missing or stale
 
-def readpar(paramfile):
+    if sha is None:
+        sha = parhash(paramfile)
+
+    npyfile,jsonfile = bundlepaths(paramfile)
+
+    try:
+        with open(jsonfile,'r') as f:
+            header = json.load(f)
+    except (IOError,OSError,ValueError):
+        return None
+
+    if header.get('version') != bundle_version: return None
+    if header.get('sha256')  != sha: return None
+
+    try:
+        flat = np.load(npyfile,mmap_mode='r')
+    except (IOError,OSError,ValueError):
+        return None
+
+    params = FreeEnergyParameters.__new__(FreeEnergyParameters)
+
+    # read-only views into the mapped file
+    for name,(offset,shape) in header['layout'].items():
+        size = int(np.prod(shape))
+        setattr(params,name,flat[offset:offset+size].reshape(shape))
+
+    for name,value in header['strings'].items():
+        setattr(params,name,value)
+
+    for name,value in header['scalars'].items():
+        setattr(params,name,value)
+
+    # loop indexes are rebuilt from the loop strings
+    params.triloop_index   = {}
+    params.tetraloop_index = {}
+    params.hexaloop_index  = {}
+
+    for loops,index in ((params.triloops,params.triloop_index),
+                        (params.tetraloops,params.tetraloop_index),
+                        (params.hexaloops,params.hexaloop_index)):
+        for i,loop in enumerate(loops):
+            if loop == '':
+                break
+            index[packloop(loop)] = i
+
+    return params
+
+
+def readpar(paramfile,cache=True):
+
+    # Load the compiled bundle of paramfile when it is fresh, otherwise
+    # parse the text file and regenerate the bundle
+
+    if not cache:
+        params = parsepar(paramfile)
+        params.sha256 = parhash(paramfile)
+        return params
+
+    sha = parhash(paramfile)
+
+    params = loadpar(paramfile,sha)
+
+    if params is None:
+
+        params = parsepar(paramfile)
+
+        try:
+            compilepar(params,paramfile,sha)
+        except (IOError,OSError):
+            pass # read-only parameter directory, run uncached
+
+    params.sha256 = sha
+
+    return params
+
+
+def parsepar(paramfile):
 
     params = FreeEnergyParameters()
 
@@ -89,10 +339,10 @@ def readpar(paramfile):
     next(readlines) # skip table column headers line
 
     # process stack free energies
-    for i in xrange(6):
+    for i in range(6):
         line = next(readlines)
-        values = map(num,line.split()[:6])
-        for j in xrange(6):
+        values = list(map(num,line.split()[:6]))
+        for j in range(6):
             XY = basepairs[i]
             WZ = basepairs[j]
             params.dG_stack[ XY[0], XY[1], WZ[1], WZ[0] ] = values[j]
@@ -103,10 +353,10 @@ def readpar(paramfile):
     readlines = iter(data['# stack_enthalpies'])
     next(readlines)
 
-    for i in xrange(6):
+    for i in range(6):
         line = next(readlines)
-        values = map(num,line.split()[:6])
-        for j in xrange(6):
+        values = list(map(num,line.split()[:6]))
+        for j in range(6):
             XY = basepairs[i]
             WZ = basepairs[j]
             params.dH_stack[ XY[0], XY[1], WZ[1], WZ[0] ] = values[j]
@@ -121,12 +371,12 @@ def readpar(paramfile):
 
     readlines = iter(data['# mismatch_hairpin'])
 
-    for i in xrange(6):
-        for j in xrange(-1,4):
+    for i in range(6):
+        for j in range(-1,4):
             line = next(readlines)
             if j == -1:
                 continue
-            values = map(num,line.split()[1:5])
+            values = list(map(num,line.split()[1:5]))
             XY = basepairs[i]
             params.dG_stackh[ XY[0], XY[1],j, : ] = values
 
@@ -134,12 +384,12 @@ def readpar(paramfile):
 
     readlines = iter(data['# mismatch_hairpin_enthalpies'])
 
-    for i in xrange(6):
-        for j in xrange(-1,4):
+    for i in range(6):
+        for j in range(-1,4):
             line = next(readlines)
             if j == -1:
                 continue
-            values = map(num,line.split()[1:5])
+            values = list(map(num,line.split()[1:5]))
             XY = basepairs[i]
             params.dH_stackh[ XY[0], XY[1],j, : ] = values
 
@@ -153,12 +403,12 @@ def readpar(paramfile):
 
     readlines = iter(data['# mismatch_interior'])
 
-    for i in xrange(6):
-        for j in xrange(-1,4):
+    for i in range(6):
+        for j in range(-1,4):
             line = next(readlines)
             if j == -1:
                 continue
-            values = map(num,line.split()[1:5])
+            values = list(map(num,line.split()[1:5]))
             XY = basepairs[i]
             params.dG_stacki[ XY[0], XY[1],j, : ] = values
 
@@ -166,12 +416,12 @@ def readpar(paramfile):
 
     readlines = iter(data['# mismatch_interior_enthalpies'])
 
-    for i in xrange(6):
-        for j in xrange(-1,4):
+    for i in range(6):
+        for j in range(-1,4):
             line = next(readlines)
             if j == -1:
                 continue
-            values = map(num,line.split()[1:5])
+            values = list(map(num,line.split()[1:5]))
             XY = basepairs[i]
             params.dH_stacki[ XY[0], XY[1],j, : ] = values
 
@@ -187,9 +437,9 @@ def readpar(paramfile):
     readlines = iter(data['# dangle5'])
     next(readlines)
 
-    for i in xrange(6):
+    for i in range(6):
         line = next(readlines)
-        values = map(num,line.split()[1:5])
+        values = list(map(num,line.split()[1:5]))
         XY = basepairs[i]
         params.dG_dangle5[ XY[1], XY[0], : ] = values
 
@@ -198,9 +448,9 @@ def readpar(paramfile):
     readlines = iter(data['# dangle5_enthalpies'])
     next(readlines)
 
-    for i in xrange(6):
+    for i in range(6):
         line = next(readlines)
-        values = map(num,line.split()[1:5])
+        values = list(map(num,line.split()[1:5]))
         XY = basepairs[i]
         params.dH_dangle5[ XY[1], XY[0], : ] = values
 
@@ -216,9 +466,9 @@ def readpar(paramfile):
     readlines = iter(data['# dangle3'])
     next(readlines)
 
-    for i in xrange(6):
+    for i in range(6):
         line = next(readlines)
-        values = map(num,line.split()[1:5])
+        values = list(map(num,line.split()[1:5]))
         XY = basepairs[i]
         params.dG_dangle3[ XY[1], XY[0], : ] = values
 
@@ -227,9 +477,9 @@ def readpar(paramfile):
     readlines = iter(data['# dangle3_enthalpies'])
     next(readlines)
 
-    for i in xrange(6):
+    for i in range(6):
         line = next(readlines)
-        values = map(num,line.split()[1:5])
+        values = list(map(num,line.split()[1:5]))
         XY = basepairs[i]
         params.dH_dangle3[ XY[1], XY[0], : ] = values
 
@@ -266,12 +516,12 @@ def readpar(paramfile):
         while values:
             nts = values[1].replace('..','')
             if len(nts) < 4:
-                for _ in xrange(6):
+                for _ in range(6):
                     line = next(readlines)
             else:
                 X = [convert[n] for n in "".join(nts)]
                 line = next(readlines) # skip N row
-                for i in xrange(4):
+                for i in range(4):
                     line = next(readlines)
                     values = line.split()[1:]
                     params.dG_int11[ X[0], X[1], i, :, X[3], X[2] ] = values
@@ -315,12 +565,12 @@ def readpar(paramfile):
         while values:
             nts = values[1].replace('.','')
             if len(nts) < 5 or nts.find('@') > -1:
-                for _ in xrange(6):
+                for _ in range(6):
                     line = next(readlines)
             else:
                 X = [convert[n] for n in "".join(nts)]
                 line = next(readlines) # skip N row
-                for i in xrange(4):
+                for i in range(4):
                     line = next(readlines)
                     values = line.split()[1:]
                     params.dG_int21[ X[0], X[1], X[2], :, i, X[4], X[3] ] = values
@@ -367,9 +617,9 @@ def readpar(paramfile):
         while values:
             nts = values[1].replace('.','')
             X = [convert[n] for n in "".join(nts)]
-            for i in xrange(4):
+            for i in range(4):
                 line = next(readlines)
-                values = map(num,line.split())
+                values = list(map(num,line.split()))
                 params.dG_int22[ X[0], X[1], X[2], :, X[3], i, X[5], X[4] ] = values
             line = next(readlines)
             values = line.split()
@@ -381,7 +631,7 @@ def readpar(paramfile):
 
     readlines = iter(data['# hairpin'])
     line = next(readlines)
-    values = line.split()[1:]
+    values = line.split()
 
     elh = []
     while values:
@@ -394,7 +644,7 @@ def readpar(paramfile):
 
     readlines = iter(data['# hairpin_enthalpies'])
     line = next(readlines)
-    values = line.split()[1:]
+    values = line.split()
 
     hlh = []
     while values:
@@ -409,7 +659,7 @@ def readpar(paramfile):
 
     readlines = iter(data['# bulge'])
     line = next(readlines)
-    values = line.split()[1:]
+    values = line.split()
 
     elb = []
     while values:
@@ -422,7 +672,7 @@ def readpar(paramfile):
 
     readlines = iter(data['# bulge_enthalpies'])
     line = next(readlines)
-    values = line.split()[1:]
+    values = line.split()
 
     hlb = []
     while values:
@@ -437,7 +687,7 @@ def readpar(paramfile):
 
     readlines = iter(data['# interior'])
     line = next(readlines)
-    values = line.split()[1:]
+    values = line.split()
 
     eli = []
     while values:
@@ -450,7 +700,7 @@ def readpar(paramfile):
 
     readlines = iter(data['# interior_enthalpies'])
     line = next(readlines)
-    values = line.split()[1:]
+    values = line.split()
 
     hli = []
     while values:
@@ -476,6 +726,7 @@ def readpar(paramfile):
         params.triloops[i]   = values[0]
         params.dG_triloops[i] = num(values[1])
         params.dH_triloops[i] = num(values[2])
+        params.triloop_index[packloop(values[0])] = i
         i += 1
 
     readlines = iter(data['# Tetraloops'])
@@ -487,6 +738,7 @@ def readpar(paramfile):
         params.tetraloops[i]   = values[0]
         params.dG_tetraloops[i] = num(values[1])
         params.dH_tetraloops[i] = num(values[2])
+        params.tetraloop_index[packloop(values[0])] = i
         i += 1
 
     readlines = iter(data['# Hexaloops'])
@@ -498,17 +750,38 @@ def readpar(paramfile):
         params.hexaloops[i]   = values[0]
         params.dG_hexaloops[i] = num(values[1])
         params.dH_hexaloops[i] = num(values[2])
+        params.hexaloop_index[packloop(values[0])] = i
         i += 1
 
+    params.dG_triloops /= 100.0
+    params.dH_triloops /= 100.0
+    params.dG_tetraloops /= 100.0
+    params.dH_tetraloops /= 100.0
+    params.dG_hexaloops /= 100.0
+    params.dH_hexaloops /= 100.0
+
     # ========================================================================
     # Asymmetry of internal loop penalty (Ninio equation)
+    # m  m_dH  max
 
-    raise Exception('Write import here')
+    values = []
+    for line in data['# NINIO']:
+        if line and not line.startswith('/*'):
+            values = list(map(num,line.split()))
+            break
+
+    if values:
+        params.dG_asym[:] = values[0] / 100.0
+        params.dG_maxasym = values[2] / 100.0
 
     # ========================================================================
     # Hairpin loop bonuses and penalties
 
-    if paramfile == 'rna_turner1999.par':
+    parname = os.path.basename(paramfile)
+
+    if parname != 'rna_turner2004.par':
+
+        # Turner 1999 values, also used for the other parameter files
 
         # hairpin loop bonuses
         params.dG_bonuses[0] = -0.8 # UU or GA first mismatch
@@ -528,8 +801,6 @@ def readpar(paramfile):
 
         # Internal Loops
         params.dG_AU      = 0.5
-        params.dG_asym[:] = 0.5
-        params.dG_maxasym = 3.0
 
         # terminal mismatches
         # not used b/c internal stack
@@ -545,7 +816,7 @@ def readpar(paramfile):
         params.MBLinit[1] = -0.3 # b
         params.MBLinit[2] = -0.3 # c
 
-    elif paramfile == 'rna_turner20004.par':
+    else:
 
         # Hairpin Loops
         params.dG_bonuses[0] = -0.9 # UU or GA first mismatch
@@ -564,8 +835,6 @@ def readpar(paramfile):
 
         # Internal Loops
         params.dG_AU      = 0.7
-        params.dG_asym[:] = 0.6
-        params.dG_maxasym = 3.0
 
         # terminal mismatches
         # not used b/c internal stack
@@ -583,10 +852,11 @@ def readpar(paramfile):
         params.MBLinit[3] =  3.14 # dG_strain
 
 
-    self.dG_AUP[0][3] = params.dG_AU
-    self.dG_AUP[3][0] = params.dG_AU
-    self.dG_AUP[2][3] = params.dG_AU
-    self.dG_AUP[3][2] = params.dG_AU
+    # terminal A-U / G-U penalty, A=0,C=1,G=2,U=3 as the other tables
+    params.dG_AUP[0][3] = params.dG_AU
+    params.dG_AUP[3][0] = params.dG_AU
+    params.dG_AUP[2][3] = params.dG_AU
+    params.dG_AUP[3][2] = params.dG_AU
 
     return params
 
@@ -0,0 +1,21 @@
+"""
+Module: CONFTEST
+
+Description: Shared set up of the unit tests (TESTS/test_*.py). The tests
+             import the modules of the package directory as PYFOLD does.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import os
+import sys
+
+sys.path.insert(0,os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
@@ -0,0 +1,142 @@
+"""
+Module: TEST_BPAGG
+
+Description: Base pair probability time course (BP_AGGREGATOR) against
+             the pair counts of the written structures, and the merge of
+             the aggregators of several workers.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy, pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import collections
+
+import numpy as np
+import pytest
+
+from bpagg import BP_AGGREGATOR
+from tclock import TOUT
+
+n = 40
+
+
+class PAIRS(object):
+
+    # Structure of N nt as RNA%IBSP, the only field the sink reads
+
+    def __init__(self,gen):
+
+        self.n = n
+        self.ibsp = np.zeros(n+1,dtype=np.int64)
+
+        perm = gen.permutation(np.arange(1,n+1))
+        for k in range(0,int(gen.integers(0,n//2))*2,2):
+            i,j = perm[k],perm[k+1]
+            self.ibsp[i] = j
+            self.ibsp[j] = i
+
+
+def TRAJECTORIES(ntraj,nout=6,iseed=3):
+
+    # Structures written at the first NOUT checkpoints of NTRAJ
+    # trajectories, some stopping early
+
+    gen = np.random.default_rng(iseed)
+
+    trajs = []
+    for isim in range(1,ntraj+1):
+        nc = int(gen.integers(1,nout+1))
+        trajs.append([ (TOUT(ic),PAIRS(gen)) for ic in range(nc) ])
+
+    return trajs
+
+
+def FILL(agg,trajs,isim0=1):
+
+    for isim,traj in enumerate(trajs,isim0):
+        agg.BEGIN(isim)
+        for tout,rna in traj:
+            agg.WRITE(tout,rna)
+            # a checkpoint is counted once per trajectory
+            agg.WRITE(tout,rna)
+
+    agg.CLOSE()
+
+    return agg
+
+
+def COUNTS(trajs):
+
+    cnt = collections.Counter()
+    ntraj = collections.Counter()
+
+    for traj in trajs:
+        for tout,rna in traj:
+            ntraj[tout] += 1
+            for i in range(1,n+1):
+                if ( rna.ibsp[i] > i ):
+                    cnt[(tout,i,int(rna.ibsp[i]))] += 1
+
+    return cnt,ntraj
+
+
+def TABLE(agg):
+
+    tout,ntraj,c,i,j,w = agg.ARRAYS()
+
+    cnt = dict( ((tout[cc],ii,jj),ww) for cc,ii,jj,ww in zip(c,i,j,w) )
+
+    return cnt,dict(zip(tout,ntraj))
+
+
+@pytest.mark.parametrize('nbuf',[1,64,1 << 18])
+def test_counts(nbuf):
+
+    trajs = TRAJECTORIES(50)
+
+    agg = FILL(BP_AGGREGATOR(n,nbuf),trajs)
+
+    cnt,ntraj = COUNTS(trajs)
+
+    assert TABLE(agg) == (dict(cnt),dict(ntraj))
+
+    # checkpoints in time order, probabilities of the first one
+    tout = agg.ARRAYS()[0]
+    assert np.all(np.diff(tout) > 0.0)
+
+    i,j,p = agg.PROB(agg.ORDER()[0])
+    assert np.all(i < j)
+    for ii,jj,pp in zip(i,j,p):
+        assert pp == pytest.approx(cnt[(tout[0],ii,jj)] / 50.0)
+
+
+def test_merge():
+
+    # workers filling their own aggregator give the counts of one
+
+    trajs = TRAJECTORIES(60)
+
+    whole = FILL(BP_AGGREGATOR(n),trajs)
+
+    agg = BP_AGGREGATOR(n,nbuf=16)
+    for k in range(0,60,25):
+        agg.MERGE(FILL(BP_AGGREGATOR(n),trajs[k:k+25],k+1))
+
+    assert TABLE(agg) == TABLE(whole)
+
+    with pytest.raises(ValueError):
+        agg.MERGE(BP_AGGREGATOR(n+1))
+
+
+def test_empty():
+
+    tout,ntraj,c,i,j,w = BP_AGGREGATOR(n).ARRAYS()
+
+    assert len(tout) == 0 and len(w) == 0
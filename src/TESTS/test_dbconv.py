@@ -0,0 +1,158 @@
+"""
+Module: TEST_DBCONV
+
+Description: Dot-bracket <-> pair table conversion (DBCONV, V2CT) of
+             single structures and batches, and its errors.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy, pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+import pytest
+
+from dbconv import DB2PT, PT2DB, DB2IBSP, IBSP2DB
+from v2ct import V2CT, CT2V
+from test_energy import tfld
+
+
+def PAIRS(fld,brackets='()[]{}<>'):
+
+    # Pair table of FLD by a stack per bracket type
+
+    pt = [-1]*len(fld)
+    stacks = {}
+
+    for i,c in enumerate(fld):
+        k = brackets.find(c)
+        if ( k < 0 ):
+            continue
+        if ( k % 2 == 0 ):
+            stacks.setdefault(k,[]).append(i)
+        else:
+            j = stacks[k-1].pop()
+            pt[i] = j
+            pt[j] = i
+
+    return pt
+
+
+def test_single():
+
+    pt = DB2PT(tfld)
+
+    assert pt.tolist() == PAIRS(tfld)
+    assert pt.dtype == np.int32
+    assert PT2DB(pt) == tfld
+
+    assert V2CT(tfld).tolist() == PAIRS(tfld)
+    assert CT2V(pt,len(tfld)) == tfld
+
+    ibsp = DB2IBSP(tfld)
+    assert ibsp[0] == 0
+    assert ( ibsp[1:] == pt + 1 ).all()
+    assert IBSP2DB(ibsp,len(tfld)) == tfld
+
+
+def test_batch():
+
+    gen = np.random.default_rng(3)
+
+    flds = []
+
+    # TFLD with hairpins put in some of its unpaired stretches
+    for k in range(200):
+
+        fld = tfld
+
+        for m in range(int(gen.integers(0,4))):
+            i = int(gen.integers(0,len(tfld)-7))
+            if ( fld[i:i+7] == '.'*7 ):
+                fld = fld[:i] + '(.....)' + fld[i+7:]
+
+        flds.append(fld)
+
+    # repeated structures and a tail of another length
+    flds = flds + flds[:50] + [ '((...))', '.', '', '(...)' ]
+
+    pt = DB2PT(flds)
+
+    assert len(pt) == len(flds)
+
+    for fld,p in zip(flds,pt):
+        assert p.tolist() == PAIRS(fld)
+
+    # one length, one array, rows of a repeated structure are copies
+    pt = DB2PT(flds[:250])
+
+    assert pt.shape == (250,len(tfld))
+    assert PT2DB(pt) == flds[:250]
+
+    pt[0,0] = -7
+    assert pt[200,0] != -7
+
+
+def test_pseudoknot():
+
+    fld = '((..[[..))..]]..{.<..}.>'
+
+    pt = DB2PT(fld)
+
+    assert pt.tolist() == PAIRS(fld)
+    assert PT2DB(pt,pk=True) == '((..[[..))..]]..(.[..).]'
+
+    # nested brackets only are read with '()'
+    with pytest.raises(ValueError,match='invalid character'):
+        DB2PT([fld],'()')
+
+    with pytest.raises(ValueError,match='crosses'):
+        PT2DB(pt)
+
+    with pytest.raises(ValueError,match='Structure 1: pair 0-9 crosses'):
+        PT2DB(np.array([DB2PT('(....)'+'.'*18),pt]))
+
+
+@pytest.mark.parametrize('flds,msg',[
+    (['((..))','(..))'],"Structure 1: unmatched ')' at position 5"),
+    (['((..))','(((..))'],"Structure 1: 1 unmatched '('"),
+    (['((',"))"],"Structure 0: 2 unmatched '('"),
+    (['(..)',')..('],"Structure 1: unmatched ')' at position 1"),
+    (['(..)','(.x)'],"Structure 1: invalid character 'x' at position 3"),
+    (['(..)','(..)','(.])'],"Structure 2: unmatched ']' at position 3"),
+    (['(.])','(..)','(.])'],"Structure 0: unmatched ']' at position 3"),
+    (['(..)','(..)','(..)(.])'],"Structure 2: unmatched ']' at position 7"),
+])
+def test_errors(flds,msg):
+
+    with pytest.raises(ValueError,match=msg.replace('(','\\(').replace(')','\\)').replace('[','\\[').replace(']','\\]')):
+        DB2PT(flds)
+
+
+def test_check():
+
+    pt = DB2PT(tfld)
+
+    bad = pt.copy()
+    bad[3] = -1
+    with pytest.raises(ValueError,match='does not pair back'):
+        PT2DB(bad)
+
+    bad = pt.copy()
+    bad[7] = 7
+    with pytest.raises(ValueError,match='position 7 pairs with 7'):
+        PT2DB(bad)
+
+    bad = pt.copy()
+    bad[7] = len(tfld)
+    with pytest.raises(ValueError,match='out of range'):
+        PT2DB(bad)
+
+    # unchecked, a trusted table is written as it is
+    assert PT2DB(pt,check=False) == tfld
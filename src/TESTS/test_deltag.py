@@ -0,0 +1,96 @@
+"""
+Module: TEST_DELTAG
+
+Description: Energy differences of the moves (DELTAG_*) against the
+             difference of the full energy (ESTRUC) of the folds before
+             and after each move in the reaction tables of the loops.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy, pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import pytest
+
+from rnavar import inuc,iext,iret,imor,idif,iopn
+from ENERGY.estruc import ESTRUC
+from ENERGY.deltag_he import DELTAG_HE
+from ENERGY.deltag_hr import DELTAG_HR
+from ENERGY.deltag_hm import DELTAG_HM
+from ENERGY.deltag_hd import DELTAG_HD
+from ENERGY.deltag_hi import DELTAG_HI
+from test_energy import SSA, trna, tfld
+
+
+def MOVE(ibsp,desc):
+
+    # Pair table after move DESC (TYPE,IP,JP,KP) of a loop table
+
+    ityp,ip,jp,kp = desc
+
+    ibsp = ibsp.copy()
+
+    if ( ityp == iext ):
+        ibsp[ip-1] = jp + 1
+        ibsp[jp+1] = ip - 1
+    elif ( ityp == iret ) or ( ityp == iopn ):
+        ibsp[ip] = 0
+        ibsp[jp] = 0
+    elif ( ityp == imor ):
+        for k in (ip-1,jp+1):
+            if ( ibsp[k] != 0 ): ibsp[ibsp[k]] = 0
+        ibsp[ip-1] = jp + 1
+        ibsp[jp+1] = ip - 1
+    elif ( ityp == idif ):
+        ibsp[ip] = 0
+        ibsp[jp] = 0
+        if ( abs(kp-ip) == 1 ):
+            ibsp[kp] = jp
+            ibsp[jp] = kp
+        else:
+            ibsp[kp] = ip
+            ibsp[ip] = kp
+
+    return ibsp
+
+
+def DELTAG(rna,desc):
+
+    ityp,ip,jp,kp = desc
+
+    if ( ityp == iext ): return DELTAG_HE(rna,ip,jp)
+    if ( ityp == iret ): return DELTAG_HR(rna,ip,jp)
+    if ( ityp == imor ): return DELTAG_HM(rna,ip,jp)
+    if ( ityp == idif ): return DELTAG_HD(rna,ip,jp,kp)
+
+    return DELTAG_HI(rna,ip,jp)
+
+
+def test_deltag_moves():
+
+    nmove = set()
+
+    for fld in (None,tfld):
+        for rna in SSA(trna,fld,150,7):
+
+            e = ESTRUC(rna.ekern,rna.ibsp,rna.n)
+
+            for indx in range(1,rna.nl+1):
+                for desc in rna.lrx[rna.loop[indx]].desc:
+
+                    if ( desc[0] == inuc ): continue
+
+                    dg = ESTRUC(rna.ekern,MOVE(rna.ibsp,desc),rna.n) - e
+
+                    assert DELTAG(rna,desc) == pytest.approx(dg,abs=1.0e-6), desc
+
+                    nmove.add(desc[0])
+
+    # every kind of helix move was checked
+    assert nmove == {iext,iret,imor,idif,iopn}
@@ -0,0 +1,87 @@
+"""
+Module: TEST_ENERGY
+
+Description: Energy of a fold (ESTRUC) and the running energy RNA%ETOT
+             kept by the loop elements as the fold changes by SSA moves.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy, pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+import pytest
+
+from rnavar import iwc
+from readdata import READDATA
+from pyfold import PYFOLD_SETUP, parfile
+from PARAMS.readpar import readpar
+from ENERGY.estruc import ESTRUC
+from ENERGY.eloop import ELOOP
+
+if not iwc: READDATA()
+
+params = readpar(parfile)
+
+trna = 'GCGGAUUUAGCUCAGUUGGGAGAGCGCCAGACUGAAGAUCUGGAGGUCCUGUGUUCGAUCCACAGAAUUCGCACCA'
+tfld = '(((((((..((((........)))).(((((.......))))).....(((((.......))))))))))))....'
+
+
+def SSA(seq,fld,nstep,iseed):
+
+    # RNA folded as FLD, after each of NSTEP SSA moves
+
+    rna,ibpi,ibpf,istop = PYFOLD_SETUP(seq,fld,params=params,dgmemo=0)
+
+    rna.ibsp[:] = ibpi
+    rna.LOOP_INIT()
+
+    gen = np.random.default_rng(iseed)
+
+    for istep in range(nstep):
+
+        amax = gen.random() * rna.ptree.TOTAL()
+
+        indx,amax = rna.ptree.SEARCH(amax)
+        rna.LOOP_FIRE(indx,amax)
+
+        yield rna
+
+
+def test_estruc_open_chain():
+
+    rna,ibpi,ibpf,istop = PYFOLD_SETUP(trna,None,params=params,dgmemo=0)
+
+    assert ESTRUC(rna.ekern,rna.ibsp,rna.n) == 0.0
+
+
+def test_estruc_loops():
+
+    # 1-based pair table, the cloverleaf is the external loop, the
+    # multiloop, three hairpins and the stacks of four helices
+
+    rna,ibpi,ibpf,istop = PYFOLD_SETUP(trna,tfld,params=params,dgmemo=0)
+
+    rna.ibsp[:] = ibpi
+    rna.LOOP_INIT()
+
+    e = ESTRUC(rna.ekern,rna.ibsp,rna.n)
+
+    assert rna.ibsp[1] == 72 and rna.ibsp[72] == 1
+    assert rna.etot == pytest.approx(e,abs=1.0e-9)
+    assert ELOOP(rna.ekern,rna.ibsp,7,66,rna.n) > 0.0
+    assert e < 0.0
+
+
+@pytest.mark.parametrize('fld',[None,tfld])
+def test_etot_after_moves(fld):
+
+    for rna in SSA(trna,fld,300,61928712):
+        e = ESTRUC(rna.ekern,rna.ibsp,rna.n)
+        assert rna.etot == pytest.approx(e,abs=1.0e-6)
@@ -0,0 +1,124 @@
+"""
+Module: TEST_FPTSTATS
+
+Description: Streaming FPT statistics (FPT_STATS, P2_QUANTILE) against
+             NumPy, and the convergence checks of PYFOLD_ENSEMBLE at fixed
+             trajectory counts.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy, pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+import pytest
+
+from fptstats import FPT_STATS, P2_QUANTILE
+from ensemble import CHUNKS, ENSEMBLE_PUSH
+
+
+def RESULTS(nsim,pcens=0.0,iseed=7):
+
+    # Trajectory summaries with exponential FPTs, a fraction PCENS censored
+
+    gen = np.random.default_rng(iseed)
+
+    tfpt = gen.exponential(2.0,nsim)
+    cens = gen.random(nsim) < pcens
+
+    return [ {'isim': k+1, 'tfpt': None if cens[k] else float(tfpt[k])}
+             for k in range(nsim) ]
+
+
+def test_welford():
+
+    results = RESULTS(1000)
+    t = np.array([ res['tfpt'] for res in results ])
+
+    stats = FPT_STATS()
+    for res in results:
+        stats.PUSH(res)
+
+    assert stats.n == 1000
+    assert stats.mean == pytest.approx(np.mean(t),rel=1.0e-12)
+    assert stats.VAR() == pytest.approx(np.var(t,ddof=1),rel=1.0e-10)
+    assert stats.HALFWIDTH() == pytest.approx(1.96*np.std(t,ddof=1)/np.sqrt(1000))
+
+
+def test_p2_quantile():
+
+    t = np.random.default_rng(3).exponential(1.0,20000)
+
+    for p in (0.1,0.5,0.9):
+
+        p2 = P2_QUANTILE(p)
+        for x in t:
+            p2.PUSH(float(x))
+
+        assert p2.VALUE() == pytest.approx(np.quantile(t,p),rel=0.05)
+
+    # exact order statistic below 5 samples
+    p2 = P2_QUANTILE(0.5)
+    for x in (3.0,1.0,2.0):
+        p2.PUSH(x)
+    assert p2.VALUE() == 2.0
+
+    with pytest.raises(ValueError):
+        P2_QUANTILE(1.0)
+
+
+def test_censored():
+
+    # the folded trajectories alone have converged, the censored ones
+    # hold the ensemble back
+
+    stats = FPT_STATS()
+    for res in RESULTS(2000,pcens=0.05):
+        stats.PUSH(res)
+
+    assert stats.NTOT() == 2000
+    assert stats.FCENS() == pytest.approx(stats.ncens/2000.0)
+    assert stats.FCENS() > 0.01
+
+    assert not stats.CONVERGED(0.1)
+    assert stats.CONVERGED(0.1,fcens=0.1)
+
+    assert FPT_STATS().FCENS() == 0.0
+
+
+def test_chunks():
+
+    assert CHUNKS(7,3) == [(0,3),(3,6),(6,7)]
+    assert CHUNKS(25,4,10) == [(0,4),(4,8),(8,10),(10,14),(14,18),(18,20),(20,24),(24,25)]
+    assert CHUNKS(25,100,10) == [(0,10),(10,20),(20,25)]
+
+
+@pytest.mark.parametrize('pcens',[0.0,0.002])
+def test_stop_count(pcens):
+
+    # the ensemble stops after the same trajectories for any chunk size
+
+    nsim = 2000
+    results = RESULTS(nsim,pcens)
+
+    nstop = set()
+
+    for nchunk in (1,3,7,64,nsim):
+
+        stats = FPT_STATS()
+
+        for k,m in CHUNKS(nsim,nchunk,10):
+            if ENSEMBLE_PUSH(stats,results[k:m],0.1,30,10):
+                break
+
+        assert stats.NTOT() % 10 == 0
+        nstop.add(stats.NTOT())
+
+    assert len(nstop) == 1
+    assert nstop.pop() < nsim
@@ -0,0 +1,66 @@
+"""
+Module: TEST_HYBRID
+
+Description: Loop elements of the accelerated SSA (SSA_HYBRID) after every
+             step, flicker blocks included, against the loop elements built
+             from scratch (LOOP_INIT) for the same fold.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy, pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import pytest
+
+from pyfold import PYFOLD_SETUP
+from ssa_hybrid import SSA_HYBRID
+from tclock import TOUT_CLOCK
+from rng import RNG_STREAM
+from test_energy import params, trna, tfld
+from test_kinetics import LOOPS
+
+
+class BACK_COUNT(SSA_HYBRID):
+
+    # SSA_HYBRID counting the returns to S
+
+    nback = 0
+
+    def BACK(self,rna,end,time,mlog):
+        self.nback += 1
+        SSA_HYBRID.BACK(self,rna,end,time,mlog)
+
+
+def test_hybrid_loops():
+
+    # the helix ends of the folded tRNA flicker
+    rna,ibpi,ibpf,istop = PYFOLD_SETUP(trna,tfld,params=params,dgmemo=0)
+    ref,ibp0,ibpf,istop = PYFOLD_SETUP(trna,None,params=params,dgmemo=0)
+
+    rna.ibsp[:] = ibpi
+    rna.LOOP_INIT()
+
+    # nearly every flicker pair is aggregated
+    ssa = BACK_COUNT(tol=0.99)
+    rng = RNG_STREAM(5)
+    clock = TOUT_CLOCK(0.0)
+    time = 0.0
+
+    for istep in range(400):
+
+        rna,time = ssa.STEP(rna,rng,time,clock)
+
+        ref.ibsp[:] = rna.ibsp
+        ref.LOOP_INIT()
+
+        assert LOOPS(rna) == LOOPS(ref)
+        assert rna.etot == pytest.approx(ref.etot,abs=1.0e-6)
+
+    assert ssa.nblock > 0
+    assert ssa.nback > 0
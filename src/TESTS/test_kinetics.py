@@ -0,0 +1,279 @@
+"""
+Module: TEST_KINETICS
+
+Description: Loop elements updated move by move (LOOP_FIRE, LOOP_MOVE)
+             against the loop elements built from scratch (LOOP_INIT) for
+             the same fold, and full PYFOLD trajectories.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Loop signatures (LSIG), LOOP_GROW
+            10/17/2026      NUC_INDEX reuse and PICK
+            10/17/2026      Ribosome footprints (LOOP_MASK)
+            10/17/2026      Trajectories with no reaction left
+            10/17/2026      Batch runs of a FoldingSession
+
+Dependencies: numpy, pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+import pytest
+
+from pyfold import PYFOLD, PYFOLD_SETUP
+from ensemble import PYFOLD_ENSEMBLE
+import session
+from rnavar import inuc
+from loop_fire import NUC_PAIR
+import loop_mask
+from tclock import TOUT, NCHECK
+from test_energy import SSA, params, trna, tfld
+from test_tclock import LIST_SINK
+
+
+def LOOPS(rna):
+
+    # Loop elements by the key of the loop (index free) with their
+    # signature, and the key of the loop of every linked nt
+
+    loops = {}
+
+    for indx in range(1,rna.nl+1):
+
+        k = int(rna.loop[indx])
+        rx = rna.lrx[k]
+
+        loops[k] = (int(rna.nhlx[indx]),int(rna.nsgl[indx]),rna.lsig[indx],
+                    round(float(rna.eloop[indx]),9),
+                    round(float(rna.ptot[indx]),6),
+                    [ (tuple(map(int,d)),round(float(x),6))
+                      for d,x in zip(rx.desc,rx.rate) ])
+
+    links = [ int(rna.loop[rna.link[i]]) if rna.link[i] else 0
+              for i in range(1,rna.n+1) ]
+
+    return loops,links
+
+
+@pytest.mark.parametrize('fld',[None,tfld])
+def test_loop_move(fld):
+
+    ref,ibpi,ibpf,istop = PYFOLD_SETUP(trna,None,params=params,dgmemo=0)
+
+    for rna in SSA(trna,fld,300,3):
+
+        ref.ibsp[:] = rna.ibsp
+        ref.LOOP_INIT()
+
+        assert LOOPS(rna) == LOOPS(ref)
+        assert rna.etot == pytest.approx(ref.etot,abs=1.0e-6)
+
+
+def test_loop_grow():
+
+    # nt added to the 3' end one by one, with SSA moves in between
+
+    rna,ibpi,ibpf,istop = PYFOLD_SETUP(trna,None,params=params,dgmemo=0)
+    ref,ibpi,ibpf,istop = PYFOLD_SETUP(trna,None,params=params,dgmemo=0)
+
+    rna.n = 40
+    rna.LOOP_INIT()
+
+    gen = np.random.default_rng(7)
+
+    while ( rna.n < len(trna) ):
+
+        rna.LOOP_GROW()
+
+        ref.n = rna.n
+        ref.ibsp[:] = rna.ibsp
+        ref.LOOP_INIT()
+
+        assert LOOPS(rna) == LOOPS(ref)
+
+        for istep in range(5):
+            amax = gen.random() * rna.ptree.TOTAL()
+            indx,amax = rna.ptree.SEARCH(amax)
+            rna.LOOP_FIRE(indx,amax)
+
+
+def test_nuc_index():
+
+    # PICK of the indexed loops against the scan of NUC_PAIR, and the
+    # index kept by loops that the moves leave unchanged
+
+    nkeep = 0
+    npick = 0
+
+    for rna in SSA(trna,None,200,5):
+
+        for indx in range(1,rna.nl+1):
+
+            i = int(rna.loop[indx])
+            nidx = rna.nidx.get(i)
+
+            if ( nidx is None ) or not nidx.SAME(rna,indx):
+                continue
+
+            nkeep += 1
+
+            rx = rna.lrx[i]
+
+            for m,(d,x) in enumerate(zip(rx.desc,rx.rate)):
+
+                if ( d[0] != inuc ) or ( x <= 0.0 ):
+                    continue
+
+                b = int(np.searchsorted(rx.mblk,m,side='right')) - 1
+
+                for f in (1.0e-9,0.5,1.0-1.0e-9):
+                    assert nidx.PICK(rna,d[1],f*x) == \
+                           NUC_PAIR(rna,indx,d[1],rx.iblk[b],f*x)
+                    npick += 1
+
+        # the external loop is unchanged, LOOP_REAC keeps its index
+        nidx = rna.nidx.get(int(rna.loop[1]))
+        rna.LOOP_REAC(1)
+
+        assert ( nidx is None ) or ( rna.nidx[int(rna.loop[1])] is nidx )
+
+    assert nkeep > 0
+    assert npick > 0
+
+
+@pytest.mark.parametrize('nbmax',[loop_mask.nbmax,0])
+def test_loop_mask(nbmax,monkeypatch):
+
+    # Footprints moved over the folded tRNA unwind its helices by
+    # LOOP_MOVE (NBMAX = 0, by LOOP_INIT)
+
+    monkeypatch.setattr(loop_mask,'nbmax',nbmax)
+
+    rna,ibpi,ibpf,istop = PYFOLD_SETUP(trna,tfld,params=params,dgmemo=0)
+    ref,ibpi,ibpf,istop = PYFOLD_SETUP(trna,tfld,params=params,dgmemo=0)
+
+    rna.ibsp[:] = ibpi
+    rna.LOOP_INIT()
+
+    gen = np.random.default_rng(11)
+
+    nbrk = 0
+
+    for ia in (1,5,20,23,44,60):
+
+        nbrk += rna.LOOP_MASK(ia,ia+9,1)
+
+        ref.ibsp[:] = rna.ibsp
+        ref.imask[:] = rna.imask
+        ref.LOOP_INIT()
+
+        assert LOOPS(rna) == LOOPS(ref)
+        assert rna.etot == pytest.approx(ref.etot,abs=1.0e-6)
+        assert not rna.ibsp[ia:ia+10].any()
+
+        for istep in range(10):
+            amax = gen.random() * rna.ptree.TOTAL()
+            indx,amax = rna.ptree.SEARCH(amax)
+            rna.LOOP_FIRE(indx,amax)
+
+        rna.LOOP_MASK(ia,ia+9,-1)
+
+    assert nbrk > 0
+
+
+def test_pyfold_trajectory():
+
+    out = PYFOLD(trna,nsim=2,tmax=1.0e-3,echeck=True)
+
+    assert len(out) == 2
+
+    for traj in out:
+        assert traj['nevent'] > 0
+        assert traj['time'] >= 1.0e-3
+
+
+@pytest.mark.parametrize('hybrid',[None,0.05])
+def test_pyfold_no_reaction(hybrid):
+
+    # a sequence that cannot pair holds the open chain up to TMAX
+
+    sink = LIST_SINK()
+
+    out = PYFOLD('AAAAAAAAAAAA',nsim=1,tmax=1.0,sink=sink,hybrid=hybrid)
+
+    assert out[0]['nevent'] == 0
+    assert out[0]['time'] == 1.0
+    assert not out[0]['ibsp'].any()
+
+    assert sink.touts == [ TOUT(ic) for ic in range(NCHECK(1.0)) ]
+
+
+def test_pyfold_transcription():
+
+    # 1 nt/uS from a 66 nt prefix, the transcript is complete after 10 uS
+    out = PYFOLD(trna,nsim=1,tmax=12.0,elong=1.0e6,nstart=66,echeck=True)
+
+    assert len(out[0]['ibsp']) == len(trna) + 1
+
+
+@pytest.mark.parametrize('nproc',[1,2])
+def test_session(nproc):
+
+    # every sequence of a batch gets the trajectories of PYFOLD_ENSEMBLE
+    # with the same seed, whatever the worker or completion order
+
+    seqs = [trna,trna[:40],(trna,tfld),trna[10:60]]
+
+    fs = session.FoldingSession()
+
+    out = dict( (indx,(seq,res)) for indx,seq,res in
+                fs.simulate_many(seqs,nsim=2,tmax=1.0e-2,iseed=17,nproc=nproc) )
+
+    assert sorted(out) == list(range(len(seqs)))
+
+    for indx,item in enumerate(seqs):
+
+        seq,fld_start,fld_stop = session.SESSION_ITEM(item)
+
+        ref = PYFOLD_ENSEMBLE(seq,fld_start,nsim=2,tmax=1.0e-2,iseed=17,nproc=1)
+
+        assert out[indx][0] == seq
+
+        for res,r in zip(out[indx][1],ref):
+            assert res['isim'] == r['isim']
+            assert res['nevent'] == r['nevent']
+            assert res['time'] == r['time']
+            assert np.array_equal(res['ibsp'],r['ibsp'])
+
+
+def test_session_pnuc(monkeypatch):
+
+    # the nucleation table of the longest sequence serves the shorter ones
+
+    calls = []
+    setupnuc = session.SETUPNUC
+
+    def SETUPNUC(n,beta):
+        calls.append(n)
+        return setupnuc(n,beta)
+
+    monkeypatch.setattr(session,'SETUPNUC',SETUPNUC)
+
+    fs = session.FoldingSession()
+
+    fs.simulate(trna,tmax=1.0e-3)
+    pnuc = fs.pnuc
+
+    fs.simulate(trna[:30],tmax=1.0e-3)
+
+    assert fs.pnuc is pnuc
+    assert calls == [len(trna)]
+
+    fs.simulate(trna+trna[:12],tmax=1.0e-3)
+
+    assert calls == [len(trna),len(trna)+12]
+    assert len(fs.pnuc) >= len(trna) + 12
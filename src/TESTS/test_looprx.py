@@ -0,0 +1,128 @@
+"""
+Module: TEST_LOOPRX
+
+Description: Reaction table of a loop element (LOOP_RX) and the move
+             LOOP_FIRE applies from it.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy, pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+import pytest
+
+import loop_fire
+from loop_rx import LOOP_RX
+from rnavar import inuc,iext,iret,imor,idif,iopn
+from pyfold import PYFOLD_SETUP
+from test_energy import params, trna, tfld
+
+
+def TABLE():
+
+    # Two blocks and the open reactions of the closing helix
+
+    rx = LOOP_RX()
+
+    rx.BLOCK(3,0)
+    rx.ADD(inuc,3,0,0,1.0)
+    rx.BLOCK(4,1)
+    rx.ADD(iext,4,9,0,2.0)
+    rx.ADD(iret,4,9,0,0.0)
+    rx.ADD(imor,4,9,0,0.5)
+    rx.OPEN()
+    rx.ADD(iopn,2,11,0,0.25)
+
+    return rx
+
+
+def test_search():
+
+    rx = TABLE()
+
+    assert rx.CLOSE() == pytest.approx(3.75)
+
+    # reaction, walk position of its block and partial sum before it
+    assert rx.SEARCH(0.5) == (0,0,0.0)
+    assert rx.SEARCH(2.5) == (1,1,1.0)
+    assert rx.SEARCH(3.2) == (3,1,3.0)
+    assert rx.SEARCH(3.75) == (4,1,3.5)
+
+    # a zero rate is never fired, round-off past the end is the last
+    assert rx.SEARCH(3.0)[0] == 1
+    assert rx.SEARCH(3.75 + 1.0e-12)[0] == 4
+
+
+def test_truncate_exclude():
+
+    rx = TABLE()
+    rx.CLOSE()
+
+    # HELX_REAC replaces the open reactions only
+    rx.TRUNCATE()
+    rx.ADD(iopn,2,11,0,1.0)
+    assert rx.CLOSE() == pytest.approx(4.5)
+    assert rx.desc[:4] == TABLE().desc[:4]
+
+    assert rx.EXCLUDE(iext,4,9) == pytest.approx(2.5)
+    assert rx.SEARCH(1.2)[0] == 3
+
+    with pytest.raises(Exception):
+        LOOP_RX().TRUNCATE()
+
+
+@pytest.mark.parametrize('fld',[None,tfld])
+def test_loop_fire(fld,monkeypatch):
+
+    # Every reaction of every loop is fired from its table: LOOP_FIRE
+    # hands the stored descriptor to LOOP_MOVE, no energy is computed
+
+    rna,ibpi,ibpf,istop = PYFOLD_SETUP(trna,fld,params=params,dgmemo=0)
+
+    rna.ibsp[:] = ibpi
+    rna.LOOP_INIT()
+
+    moves = []
+    monkeypatch.setattr(loop_fire,'LOOP_MOVE',
+                        lambda rna,indx,irem,iadd: moves.append((irem,iadd)))
+
+    nfire = 0
+
+    for indx in range(1,rna.nl+1):
+
+        rx = rna.lrx[rna.loop[indx]]
+
+        assert float(np.sum(rx.rate)) == pytest.approx(rna.ptot[indx])
+
+        for m,(desc,x) in enumerate(zip(rx.desc,rx.rate)):
+
+            if ( x <= 0.0 ):
+                continue
+
+            ityp,ip,jp,kp = desc
+
+            del moves[:]
+            rna.LOOP_FIRE(indx,float(rx.cum[m]) - 0.5*x)
+
+            assert len(moves) == 1
+            assert rna.move[0] == ityp
+
+            if ( ityp == inuc ):
+                assert rna.move[1] == ip
+            elif ( ityp == iext ) or ( ityp == imor ):
+                assert rna.move[1:3] == (ip-1,jp+1)
+            elif ( ityp == idif ):
+                assert rna.move[1:4] == (ip,jp,kp)
+            else:
+                assert rna.move[1:3] == (ip,jp)
+
+            nfire += 1
+
+    assert nfire > 0
@@ -0,0 +1,129 @@
+"""
+Module: TEST_MOVELOG
+
+Description: Binary move log (MOVE_LOG) of PYFOLD trajectories, replayed
+             by MOVE_LOG_READER against the structures recorded while the
+             log was written.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy, pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+import pytest
+
+from movelog import MOVE_LOG, MOVE_LOG_READER, APPLY_MOVE
+from pyfold import PYFOLD
+from test_energy import trna
+
+
+class RECORD_LOG(MOVE_LOG):
+
+    # Move log that also keeps the structure after every event
+
+    def __init__(self,*args,**kwargs):
+
+        MOVE_LOG.__init__(self,*args,**kwargs)
+        self.states = {}
+
+    def WRITE(self,time,rna):
+
+        MOVE_LOG.WRITE(self,time,rna)
+        self.states.setdefault(self.isim,[]).append((time,np.array(rna.ibsp[1:self.n+1])))
+
+
+@pytest.fixture(scope='module')
+def movelog(tmp_path_factory):
+
+    # Two trajectories, small keyframe interval and buffer so the log has
+    # many segments and is flushed while written
+
+    file = str(tmp_path_factory.mktemp('movelog') / 'trna.pfm')
+
+    log = RECORD_LOG(file,len(trna),nkey=5,nbuf=512)
+    out = PYFOLD(trna,nsim=2,tmax=1.0e-2,mlog=log)
+    log.CLOSE()
+
+    reader = MOVE_LOG_READER(file)
+    yield reader,log.states,out
+    reader.CLOSE()
+
+
+def test_index(movelog):
+
+    reader,states,out = movelog
+
+    assert reader.n == len(trna)
+    assert reader.nkey == 5
+
+    # a segment per trajectory start and per NKEY events
+    for isim in (1,2):
+        s0,s1 = reader.SEGMENTS(isim)
+        assert s1 - s0 == 1 + len(states[isim]) // 5
+        assert np.all(np.diff(reader.times[s0:s1]) >= 0.0)
+
+    with pytest.raises(KeyError):
+        reader.SEGMENTS(3)
+
+
+def test_replay(movelog):
+
+    reader,states,out = movelog
+
+    for isim in (1,2):
+
+        assert len(states[isim]) == out[isim-1]['nevent']
+
+        # IBSP is updated in place, compared as the events come
+        nev = 0
+        for (time,ityp,i,j,k,ibsp),(t,ref) in zip(reader.REPLAY(isim),states[isim]):
+            assert time == pytest.approx(t,rel=1.0e-12)
+            assert np.array_equal(ibsp[1:],ref)
+            nev += 1
+
+        assert nev == len(states[isim])
+
+        assert np.array_equal(reader.STRUCTURE_AT(float('inf'),isim)[1:],
+                              out[isim-1]['ibsp'][1:])
+
+
+def test_sample(movelog):
+
+    reader,states,out = movelog
+
+    for isim in (1,2):
+
+        t = np.array([ s[0] for s in states[isim] ])
+
+        # half way between events, skipping through the segments
+        ts = 0.5 * (t[:-1] + t[1:])
+        ts = ts[::7]
+
+        for (tk,ibsp),m in zip(reader.SAMPLE(ts,isim),range(0,len(t)-1,7)):
+            ref = states[isim][m][1]
+            assert np.array_equal(ibsp[1:],ref)
+            assert np.array_equal(reader.STRUCTURE_AT(tk,isim)[1:],ref)
+
+
+def test_errors(tmp_path):
+
+    file = str(tmp_path / 'open.pfm')
+
+    log = MOVE_LOG(file,10)
+    log.FLUSH()
+
+    # not closed, no index
+    with pytest.raises(ValueError):
+        MOVE_LOG_READER(file)
+
+    log.CLOSE()
+
+    with pytest.raises(ValueError):
+        APPLY_MOVE(np.zeros(11,dtype=np.int32),99,1,5,0)
@@ -0,0 +1,100 @@
+"""
+Module: TEST_PROFILER
+
+Description: Hot path profiler (SSA_PROFILER) of a PYFOLD run: the event
+             counts against the LOOP_FIRE calls, and the originals put
+             back by DISABLE.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import json
+import sys
+
+import loop_fire
+import loop_reac
+import loop_grow
+import helx_reac
+from psum_tree import PSUM_TREE
+from profiler import SSA_PROFILER, efuncs, pmethods
+from pyfold import PYFOLD
+from test_energy import trna
+
+
+def BINDINGS():
+
+    # Every module binding of the profiled functions and the PSUM_TREE
+    # methods
+
+    out = {}
+
+    for fn in efuncs:
+        for name,mod in list(sys.modules.items()):
+            if getattr(mod,fn.__name__,None) is fn:
+                out[(name,fn.__name__)] = fn
+
+    for mod,name in ((loop_fire,'LOOP_FIRE'),(loop_reac,'LOOP_REAC'),
+                     (loop_grow,'LOOP_GROW'),(helx_reac,'HELX_REAC')):
+        out[(mod.__name__,name)] = getattr(mod,name)
+
+    for name in pmethods:
+        out[('PSUM_TREE',name)] = PSUM_TREE.__dict__[name]
+
+    return out
+
+
+def test_profiler_counts(tmp_path):
+
+    before = BINDINGS()
+
+    assert any( name[1].startswith('DELTAG_') for name in before )
+
+    prof = SSA_PROFILER()
+
+    out = PYFOLD(trna,nsim=2,tmax=1.0e-2,profile=prof)
+
+    rep = prof.REPORT()
+    fns = rep['functions']
+
+    # one reaction counted per LOOP_FIRE, one LOOP_FIRE per SSA event
+    nevent = sum( res['nevent'] for res in out )
+
+    assert nevent > 0
+    assert sum(rep['events'].values()) == fns['LOOP_FIRE']['calls'] == nevent
+    assert rep['events']['addition'] == 0
+
+    assert sum(rep['loop_nt'].values()) == fns['LOOP_REAC']['calls']
+    assert fns['PSUM_TREE.SEARCH']['calls'] >= nevent
+    assert sum( f['calls'] for name,f in fns.items() if name.startswith('DELTAG_') ) > 0
+
+    assert rep['meta']['nevent'] == nevent
+
+    #=== Originals back ===#
+
+    after = BINDINGS()
+
+    assert after.keys() == before.keys()
+    for key,fn in before.items():
+        assert after[key] is fn, key
+
+    assert loop_fire.LOOP_FIRE is before[('loop_fire','LOOP_FIRE')]
+    assert PSUM_TREE.SEARCH is before[('PSUM_TREE','SEARCH')]
+    assert not prof.patched
+
+    # the JSON export of a run given a file name
+    fname = str(tmp_path / 'profile.json')
+    PYFOLD(trna,nsim=1,tmax=1.0e-3,profile=fname)
+
+    with open(fname) as f:
+        rep = json.load(f)
+
+    assert sum(rep['events'].values()) == rep['functions']['LOOP_FIRE']['calls']
+    assert BINDINGS() == before
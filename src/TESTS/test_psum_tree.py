@@ -0,0 +1,105 @@
+"""
+Module: TEST_PSUM_TREE
+
+Description: Partial sum table of the loop rates (PSUM_TREE) against
+             NumPy prefix sums through updates, GROW and SHRINK.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy, pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+import pytest
+
+from psum_tree import PSUM_TREE
+
+
+def CHECK(tree,rates):
+
+    # TOTAL and SEARCH against the prefix sums of RATES(1..NL)
+
+    cum = np.cumsum(rates)
+
+    assert tree.TOTAL() == pytest.approx(cum[-1])
+
+    for u in np.linspace(0.0,1.0,37)[1:]:
+
+        amax = u * cum[-1]
+
+        indx,r = tree.SEARCH(amax)
+
+        k = int(np.searchsorted(cum,amax*(1.0-1.0e-12)))
+
+        assert indx == k + 1
+        assert 0.0 < r <= rates[k] * (1.0 + 1.0e-9)
+
+
+def test_update_search():
+
+    gen = np.random.default_rng(11)
+
+    nl = 13
+    rates = gen.random(nl)
+
+    tree = PSUM_TREE()
+    tree.RESET(nl)
+
+    assert tree.nsum == 16
+
+    for indx in range(1,nl+1):
+        tree.UPDATE(indx,rates[indx-1])
+
+    CHECK(tree,rates)
+
+    for it in range(200):
+        indx = int(gen.integers(1,nl+1))
+        rates[indx-1] = gen.random()
+        tree.UPDATE(indx,rates[indx-1])
+
+    CHECK(tree,rates)
+
+    # zero rates are never drawn
+    rates[4:9] = 0.0
+    for indx in range(5,10):
+        tree.UPDATE(indx,0.0)
+
+    CHECK(tree,rates)
+
+    # round-off past the total is the last non-empty leaf
+    assert tree.SEARCH(tree.TOTAL() * (1.0 + 1.0e-12))[0] == nl
+
+
+def test_grow_shrink():
+
+    gen = np.random.default_rng(5)
+
+    tree = PSUM_TREE(lmax=2)
+    tree.RESET(1)
+
+    rates = []
+
+    # loops added one at a time, the storage doubles as it fills
+    for nl in range(1,70):
+        tree.GROW(nl)
+        rates.append(gen.random())
+        tree.UPDATE(nl,rates[-1])
+        CHECK(tree,np.array(rates))
+
+    assert tree.nsum == 128
+    assert len(tree.ptot) > 128
+
+    # and removed from the end
+    for nl in range(68,1,-1):
+        tree.UPDATE(nl+1,0.0)
+        rates.pop()
+        tree.SHRINK(nl)
+        CHECK(tree,np.array(rates))
+
+    assert tree.nsum == 2
@@ -0,0 +1,145 @@
+"""
+Module: TEST_READPAR
+
+Description: Parameter file parsing, the compiled bundle cache and the
+             temperature rescaling of PARAMS.READPAR.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Temperature rescaling (at_temperature)
+
+Dependencies: numpy, pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from PARAMS.readpar import readpar, parsepar, loadpar, bundlepaths
+
+pardir = os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','PARAMS')
+
+
+def PARCOPY(tmp_path,name='rna_turner2004.par'):
+
+    # Copy of a parameter file, so the bundle is written to TMP_PATH
+    paramfile = str(tmp_path / name)
+    shutil.copy(os.path.join(pardir,name),paramfile)
+
+    return paramfile
+
+
+def test_parse_turner2004(tmp_path):
+
+    params = parsepar(PARCOPY(tmp_path))
+
+    # CG followed by CG (5' CC 3' / 3' GG 5')
+    assert params.dG_stack[1,2,1,2] == -3.3
+
+    # hairpin, bulge and interior tables are indexed by loop size
+    assert params.dG_hloop.shape == (31,)
+    assert params.dG_hloop[3] == 5.4
+    assert params.dG_bulge[1] == 3.8
+    assert params.dG_iloop[30] == 3.7
+
+    assert params.dG_AUP.shape == (4,4)
+    assert params.dG_AUP[0][3] == params.dG_AU
+
+    assert params.dG_asym[0] == 0.6
+    assert params.dG_maxasym == 3.0
+    assert params.MBLmodel == 2
+
+    assert len(params.tetraloop_index) == 16
+
+    # special hairpins in kcal/mol, as the other tables
+    irow = params.tetraloops.index('CUUCGG')
+    assert params.dG_tetraloops[irow] == 3.7
+    irow = params.triloops.index('CAACG')
+    assert params.dG_triloops[irow] == 6.8
+
+
+def test_bundle_roundtrip(tmp_path):
+
+    paramfile = PARCOPY(tmp_path)
+
+    params = readpar(paramfile)
+
+    for path in bundlepaths(paramfile):
+        assert os.path.exists(path)
+
+    bundle = loadpar(paramfile)
+
+    assert bundle is not None
+
+    for name,value in vars(params).items():
+
+        if ( name == 'sha256' ):
+            continue
+
+        loaded = getattr(bundle,name)
+
+        if isinstance(value,np.ndarray):
+            assert loaded.shape == value.shape, name
+            assert np.array_equal(loaded,value), name
+        else:
+            assert loaded == value, name
+
+    # the second read comes from the bundle
+    again = readpar(paramfile)
+    assert isinstance(again.dG_stack,np.memmap)
+    assert again.sha256 == params.sha256
+
+
+def test_bundle_stale(tmp_path):
+
+    paramfile = PARCOPY(tmp_path)
+
+    readpar(paramfile)
+
+    with open(paramfile,'a') as f:
+        f.write('\n')
+
+    assert loadpar(paramfile) is None
+
+
+def test_at_temperature(tmp_path):
+
+    params = readpar(PARCOPY(tmp_path))
+
+    hot = params.at_temperature(330.15)
+    cold = params.at_temperature(290.15)
+
+    # dG(T) = dH - T (dH - dG37) / 310.15
+    dg = params.dH_stack - 330.15 * (params.dH_stack - params.dG_stack) / 310.15
+    assert np.allclose(hot.dG_stack,dg)
+
+    # INF entries stay INF
+    inf = np.isinf(params.dG_hloop)
+    assert inf.any()
+    assert np.isinf(hot.dG_hloop[inf]).all()
+    assert not np.isnan(hot.dG_hloop).any()
+
+    # memoized on the parameter file, whichever set it is asked from
+    assert params.at_temperature(330.15) is hot
+    assert cold.at_temperature(330.15) is hot
+
+    # back to 37 C from a rescaled set, not a rescale of a rescale
+    assert np.allclose(hot.at_temperature(310.15).dG_stack,params.dG_stack)
+
+    # a set at another temperature without its 37 C tables
+    orphan = parsepar(PARCOPY(tmp_path))
+    orphan.temp = 330.15
+
+    with pytest.raises(ValueError):
+        orphan.at_temperature(310.15)
+
+    # no sha256, no memo
+    orphan = parsepar(PARCOPY(tmp_path))
+    assert orphan.at_temperature(330.15) is not orphan.at_temperature(330.15)
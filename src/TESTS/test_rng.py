@@ -0,0 +1,98 @@
+"""
+Module: TEST_RNG
+
+Description: Buffered random number streams (RNG_STREAM) and the seeds of
+             the parallel trajectory streams (SPAWN_SEEDS).
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy, pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+import pytest
+
+from rng import RANDOM, RNG_STREAM, SPAWN_SEEDS, a, m
+
+
+def DRAWS(rng,ndraw):
+
+    return [ rng.UNIFORM() for k in range(ndraw) ]
+
+
+def test_legacy_regression():
+
+    # the block computed at once is RANDOM called in turn, across the
+    # buffer refills
+
+    iseed = 61928712
+
+    rng = RNG_STREAM(iseed,'legacy',nbuf=16)
+
+    x = []
+    for k in range(50):
+        r,iseed = RANDOM(iseed)
+        x.append(r)
+
+    assert DRAWS(rng,50) == x
+
+
+def test_legacy_spawn():
+
+    iseed = 12345
+    n = 4
+
+    seeds = SPAWN_SEEDS(iseed,n,'legacy')
+    stride = (m - 1) // n
+
+    assert seeds == [ iseed * pow(a,k*stride,m) % m for k in range(n) ]
+
+    streams = RNG_STREAM(iseed,'legacy').SPAWN(n)
+    assert [ rng.seed for rng in streams ] == seeds
+
+    with pytest.raises(ValueError):
+        RNG_STREAM(0,'legacy')
+
+
+@pytest.mark.parametrize('mode',['pcg64','philox'])
+def test_numpy_streams(mode):
+
+    rng = RNG_STREAM(7,mode,nbuf=64)
+    x = np.array(DRAWS(rng,1000))
+
+    assert np.all(x > 0.0) and np.all(x <= 1.0)
+    assert abs(np.mean(x) - 0.5) < 0.05
+
+    # same seed, same stream whatever the buffer size
+    assert DRAWS(RNG_STREAM(7,mode,nbuf=100),1000) == x.tolist()
+
+
+@pytest.mark.parametrize('mode',['pcg64','philox','legacy'])
+def test_spawn_seeds(mode):
+
+    # the stream of trajectory k is given by the master seed, whatever
+    # the stream it is spawned with for the NumPy modes
+
+    seeds = SPAWN_SEEDS(61928712,8,mode)
+    draws = [ DRAWS(RNG_STREAM(s,mode),20) for s in seeds ]
+
+    assert len(set(map(tuple,draws))) == 8
+
+    streams = RNG_STREAM(61928712,mode).SPAWN(8)
+    assert [ DRAWS(rng,20) for rng in streams ] == draws
+
+    if ( mode != 'legacy' ):
+        more = SPAWN_SEEDS(61928712,16,mode)
+        assert [ DRAWS(RNG_STREAM(s,mode),20) for s in more[:8] ] == draws
+
+
+def test_unknown_mode():
+
+    with pytest.raises(ValueError):
+        RNG_STREAM(1,'mt19937')
@@ -0,0 +1,125 @@
+"""
+Module: TEST_SHMSTORE
+
+Description: Shared memory result store (SHM_STORE) written through an
+             attached store and by the worker processes of
+             PYFOLD_ENSEMBLE.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy, pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+import pytest
+
+from shmstore import SHM_STORE, SHM_ATTACH, SHM_SINK
+from tclock import TOUT, NCHECK
+from ensemble import PYFOLD_ENSEMBLE
+from test_energy import trna
+
+
+class STATE(object):
+
+    # Structure of N nt as RNA%IBSP with its energy
+
+    def __init__(self,n,pairs,etot):
+
+        self.n = n
+        self.etot = etot
+        self.ibsp = np.zeros(n+1,dtype=np.int64)
+
+        for i,j in pairs:
+            self.ibsp[i] = j
+            self.ibsp[j] = i
+
+
+def test_attach():
+
+    # rows written through an attached store are read by the owner
+
+    store = SHM_STORE(3,12,4)
+
+    try:
+
+        other = SHM_ATTACH(store.SPEC())
+        sink = SHM_SINK(other)
+
+        sink.BEGIN(2)
+        for k in range(6):
+            sink.WRITE(TOUT(k),STATE(12,[(1,12-k)],-float(k)))
+
+        other.PUT(2,{'ibsp': STATE(12,[(2,11)],0.0).ibsp,'time': 1.5,
+                     'energy': -3.0,'fpt': True,'tfpt': 0.7,'nevent': 9})
+        other.CLOSE()
+
+        # records past NCHECK are counted but dropped
+        time,energy,ibsp = store.RECORDS(2)
+
+        assert store.nrec[1] == 6
+        assert np.array_equal(time,[ TOUT(k) for k in range(4) ])
+        assert np.array_equal(energy,[0.0,-1.0,-2.0,-3.0])
+        assert [ ibsp[k,0] for k in range(4) ] == [12,11,10,9]
+
+        assert store.done.tolist() == [0,1,0]
+        assert store.final[1,1] == 11 and store.tfpt[1] == 0.7
+        assert np.isnan(store.tfpt[0])
+
+        assert len(store.RECORDS(1)[0]) == 0
+
+    finally:
+        store.UNLINK()
+
+
+def test_errors():
+
+    with pytest.raises(ValueError):
+        SHM_STORE(1,40000,1)
+
+    with pytest.raises(ValueError):
+        SHM_STORE(0,10,1)
+
+    store = SHM_STORE(1,10,1)
+    try:
+        with pytest.raises(ValueError):
+            SHM_ATTACH((store.shm.name,100,100,100))
+    finally:
+        store.UNLINK()
+
+
+def test_ensemble():
+
+    # worker processes fill the store with the trajectories of a serial
+    # run
+
+    nsim = 4
+    tmax = 1.0e-2
+
+    ref = PYFOLD_ENSEMBLE(trna,nsim=nsim,tmax=tmax,nproc=1)
+
+    store = SHM_STORE(nsim,len(trna),NCHECK(tmax))
+
+    try:
+
+        out = PYFOLD_ENSEMBLE(trna,nsim=nsim,tmax=tmax,nproc=2,store=store)
+
+        assert store.done.tolist() == [1] * nsim
+
+        for isim,(res,r) in enumerate(zip(out,ref),1):
+
+            assert 'ibsp' not in res
+            assert res['nevent'] == r['nevent'] == store.nevent[isim-1]
+            assert store.tfin[isim-1] == r['time']
+            assert np.array_equal(store.final[isim-1],r['ibsp'][1:])
+
+            time,energy,ibsp = store.RECORDS(isim)
+            assert np.array_equal(time,[ TOUT(k) for k in range(NCHECK(tmax)) ])
+
+    finally:
+        store.UNLINK()
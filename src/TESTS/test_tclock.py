@@ -0,0 +1,78 @@
+"""
+Module: TEST_TCLOCK
+
+Description: Output checkpoints of a trajectory (TCLOCK) and the records
+             PYFOLD writes at them.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: pytest
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+from tclock import TOUT, ICHECK, NCHECK, TOUT_CLOCK
+from pyfold import PYFOLD
+from test_energy import trna
+
+
+class LIST_SINK(object):
+
+    # Trajectory sink keeping the checkpoint times written
+
+    def __init__(self):
+        self.touts = []
+
+    def BEGIN(self,isim):
+        self.touts = []
+
+    def WRITE(self,time,rna):
+        self.touts.append(time)
+
+    def CLOSE(self):
+        pass
+
+
+def test_tout():
+
+    touts = [ TOUT(ic) for ic in range(20) ]
+
+    assert touts[:3] == [0.01,0.02,0.03]
+    assert touts[8:12] == [0.09,0.1,0.2,0.3]
+    assert touts[18] == 1.0
+
+    assert [ ICHECK(t) for t in touts ] == list(range(20))
+
+    assert NCHECK(1.0) == 19
+    assert NCHECK(0.3) == 12
+    assert NCHECK(0.005) == 0
+
+
+def test_cross():
+
+    sink = LIST_SINK()
+    clock = TOUT_CLOCK(0.5)
+
+    # one event over four checkpoints writes all of them
+    clock.CROSS(0.045,None,sink)
+
+    assert sink.touts == [ TOUT(ic) for ic in range(4) ]
+    assert clock.tout == 0.05
+
+    # no checkpoint past TMAX, even for an event at infinity
+    clock.CROSS(float('inf'),None,sink)
+
+    assert sink.touts == [ TOUT(ic) for ic in range(NCHECK(0.5)) ]
+
+
+def test_pyfold_checkpoints():
+
+    sink = LIST_SINK()
+
+    PYFOLD(trna,nsim=1,tmax=0.3,sink=sink)
+
+    assert sink.touts == [ TOUT(ic) for ic in range(NCHECK(0.3)) ]
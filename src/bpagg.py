@@ -0,0 +1,226 @@
+"""
+Class: BP_AGGREGATOR (N,NBUF)
+
+Description: Base pair probability time course of an ensemble. A
+             trajectory sink (see TRAJECTORY) that counts, at each of the
+             log-spaced TOUT checkpoints of PYFOLD, how many trajectories
+             hold each pair i-j, so that
+
+                 P_ij(TOUT) = COUNT_ij(TOUT) / NTRAJ(TOUT)
+
+             is available without storing any trajectory.
+
+Method: A pair i<j is the key i*(N+1)+j. Checkpoint c keeps the sorted
+        keys of the pairs seen there and their counts, so the memory
+        scales with the distinct pairs observed and not with N**2.
+
+          WRITE   - the keys of the pairs of RNA%IBSP are appended to the
+                    buffer of the checkpoint, which is merged into the
+                    counts (COMPACT, one NP.UNIQUE) once it holds NBUF
+                    keys. A checkpoint is counted at most once per
+                    trajectory.
+          MERGE   - adds the counts of another aggregator, checkpoint by
+                    checkpoint, so each worker of PYFOLD_ENSEMBLE can fill
+                    its own and the parent merges them.
+
+        The checkpoints are keyed on their index ICHECK(TOUT) (see
+        TCLOCK), the same in every trajectory and worker.
+
+          COO(c)  - (I,J,COUNT) arrays of checkpoint c
+          PROB(c) - (I,J,P) arrays of checkpoint c
+          ARRAYS  - every checkpoint in one flat COO table
+          SPARSE  - N x N scipy.sparse matrix of P at checkpoint c
+
+Arguments:
+
+            N - Length of the RNA.
+         NBUF - Keys buffered per checkpoint before they are counted.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Checkpoints keyed on the TCLOCK index
+
+Dependencies: numpy, scipy (SPARSE only)
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+
+from tclock import ICHECK
+
+nbuf_default = 1 << 18
+
+
+class BP_AGGREGATOR(object):
+
+    def __init__(self,n,nbuf=nbuf_default):
+
+        self.n = n
+        self.nbuf = nbuf
+
+        # Checkpoint times and the index of each
+        self.touts = []
+        self.ic = {}
+
+        # Counted keys and counts, buffered keys, trajectories per checkpoint
+        self.keys = []
+        self.cnts = []
+        self.buf = []
+        self.nb = []
+        self.ntraj = []
+
+        # Last checkpoint of the current trajectory
+        self.tlast = None
+
+    def CHECKPOINT(self,tout):
+
+        # Index of checkpoint TOUT, added if new
+
+        ic = ICHECK(tout)
+
+        c = self.ic.get(ic)
+
+        if c is None:
+            c = len(self.touts)
+            self.ic[ic] = c
+            self.touts.append(tout)
+            self.keys.append(np.zeros(0,dtype=np.int64))
+            self.cnts.append(np.zeros(0,dtype=np.int64))
+            self.buf.append([])
+            self.nb.append(0)
+            self.ntraj.append(0)
+
+        return c
+
+    #=== Sink ===#
+
+    def BEGIN(self,isim):
+
+        self.tlast = None
+
+    def WRITE(self,time,rna):
+
+        if ( time == self.tlast ):
+            return
+
+        self.tlast = time
+
+        c = self.CHECKPOINT(time)
+
+        n = rna.n
+
+        ip = np.arange(1,n+1)
+        jp = rna.ibsp[1:n+1]
+
+        ix = ( jp > ip )
+
+        self.buf[c].append(ip[ix] * (self.n + 1) + jp[ix])
+        self.nb[c] += int(ix.sum())
+        self.ntraj[c] += 1
+
+        if ( self.nb[c] >= self.nbuf ):
+            self.COMPACT(c)
+
+    def CLOSE(self):
+
+        for c in range(len(self.touts)):
+            self.COMPACT(c)
+
+    #=== Counts ===#
+
+    def COMPACT(self,c,keys=None,cnts=None):
+
+        # Merges the buffer of checkpoint c, and the counts KEYS/CNTS if
+        # given, into its counts
+
+        allk = [self.keys[c]] + self.buf[c]
+        allw = [self.cnts[c]] + [ np.ones(len(k),dtype=np.int64) for k in self.buf[c] ]
+
+        if keys is not None:
+            allk.append(keys)
+            allw.append(cnts)
+
+        allk = np.concatenate(allk)
+        allw = np.concatenate(allw)
+
+        u,inv = np.unique(allk,return_inverse=True)
+
+        self.keys[c] = u
+        self.cnts[c] = np.bincount(inv,weights=allw,minlength=len(u)).astype(np.int64)
+
+        self.buf[c] = []
+        self.nb[c] = 0
+
+    def MERGE(self,other):
+
+        if ( other.n != self.n ):
+            raise ValueError("Cannot merge pair counts of {} nt into {} nt.".format(other.n,self.n))
+
+        other.CLOSE()
+
+        for k,tout in enumerate(other.touts):
+            c = self.CHECKPOINT(tout)
+            self.COMPACT(c,other.keys[k],other.cnts[k])
+            self.ntraj[c] += other.ntraj[k]
+
+        return self
+
+    #=== Export ===#
+
+    def ORDER(self):
+
+        # Checkpoint indices in time order
+        return sorted(range(len(self.touts)),key=lambda c: self.touts[c])
+
+    def COO(self,c):
+
+        self.COMPACT(c)
+
+        keys = self.keys[c]
+
+        return keys // (self.n + 1),keys % (self.n + 1),self.cnts[c].copy()
+
+    def PROB(self,c):
+
+        i,j,cnt = self.COO(c)
+
+        return i,j,cnt / float(max(self.ntraj[c],1))
+
+    def ARRAYS(self):
+
+        # TOUT(NC), NTRAJ(NC) and the COO table (C,I,J,COUNT) of all
+        # checkpoints, C indexing TOUT in time order
+
+        order = self.ORDER()
+
+        tout = np.array([ self.touts[c] for c in order ],dtype=np.float64)
+        ntraj = np.array([ self.ntraj[c] for c in order ],dtype=np.int64)
+
+        cc,ii,jj,ww = [],[],[],[]
+
+        for m,c in enumerate(order):
+            i,j,cnt = self.COO(c)
+            cc.append(np.full(len(i),m,dtype=np.int64))
+            ii.append(i)
+            jj.append(j)
+            ww.append(cnt)
+
+        if not cc:
+            e = np.zeros(0,dtype=np.int64)
+            return tout,ntraj,e,e,e,e
+
+        return tout,ntraj,np.concatenate(cc),np.concatenate(ii),np.concatenate(jj),np.concatenate(ww)
+
+    def SPARSE(self,c):
+
+        # N x N upper triangular P at checkpoint c, 0-based
+
+        from scipy.sparse import coo_matrix
+
+        i,j,p = self.PROB(c)
+
+        return coo_matrix((p,(i-1,j-1)),shape=(self.n,self.n))
@@ -1,79 +1,230 @@
-"""
-============================================================================
-Module: CLASS_RNAFOLD
-
-Description: A class structure containing subroutines and data elements
-             required for computing transition probabilities between
-             different RNA secondary structures.
-
-History:
-Version     Date            Comment
---------    -------         --------------------
-            09/28/2017      Original Code
-
-Dependencies:
-
-Author(s): Alex Reis
-           Copyright (c) 2017 (Please refer to LICENCE)
-============================================================================           
-"""
-
-
-from rnavar import *
-
-import loop_init
-import loop_resum
-import helx_reac
-import loop_reac
-import loop_fire
-
-class RNA_STRUC(object):
-
-    seq = "N"*mxnt
-
-    iseq = [0]*mxnt
-    ibsp = [0]*mxnt
-    link = [0]*mxnt
-
-    loop = [0]*mxnt
-    nhlx = [0]*mxnt
-    nsgl = [0]*mxnt
-
-    n = 0
-    nl = 0
-    nsum = 0
-
-    psum = [0.0]*mxnt
-    ptot = [0.0]*mxnt
-
-    wrk1 = [0.0]*mxnt
-    wrk2 = [0.0]*mxnt
-
-    def CLEAR_LOOPS(self):
-
-        self.link = [0]*mxnt
-        self.loop = [0]*mxnt
-        self.nhlx = [0]*mxnt
-        self.nsgl = [0]*mxnt
-
-        self.wrk1 = [0.0]*mxnt
-        self.wrk2 = [0.0]*mxnt
-
-        self.psum = [0.0]*mxnt
-        self.ptot = [0.0]*mxnt
-
-
-    def LOOP_INIT(self):
-        loop_init.LOOP_INIT(self)
-
-    def LOOP_RESUM(self):
-        loop_resum.LOOP_RESUM(self)
-
-    def HELX_REAC(self):
-        helx_reac.HELX_REAC(self)
-
-    def LOOP_REAC(self,indx):
-        loop_reac.LOOP_REAC(self,indx)
-
-    def LOOP_FIRE(self,indx,amax):
-        loop_fire.LOOP_FIRE(self,indx,amax)
\ No newline at end of file
+"""
+============================================================================
+Module: CLASS_RNAFOLD
+
+Description: A class structure containing subroutines and data elements
+             required for computing transition probabilities between
+             different RNA secondary structures.
+
+Method: The work arrays are NumPy arrays owned by each instance and sized
+        to the sequence (n + npad). They are allocated once in __init__
+        and reset in place by CLEAR_LOOPS.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            09/28/2017      Original Code
+            10/17/2026      Per-instance NumPy storage sized to the sequence
+            10/17/2026      Partial sum table in PSUM_TREE
+            10/17/2026      Incremental stop structure check (MATCH_*)
+            10/17/2026      Deferred LOOP_REAC/LOOP_RESUM (FLUSH)
+            10/17/2026      Ribosome footprint mask (IMASK, LOOP_MASK)
+            10/17/2026      Nucleation candidate index (NIDX, WNUC)
+            10/17/2026      Eager partial sum resums (LOOP_RESUM)
+            10/17/2026      Zobrist signature of each loop (LSIG)
+            10/17/2026      Eager LOOP_REAC again, deferred updates removed
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+============================================================================
+"""
+
+import numpy as np
+
+from rnavar import *
+
+import loop_init
+import loop_resum
+import helx_reac
+import loop_reac
+import loop_fire
+import loop_grow
+import loop_mask
+
+from psum_tree import PSUM_TREE
+
+# Padding for the 1-based indexing and the i-1,j+1 neighbours
+npad = 4
+
+class RNA_STRUC(object):
+
+    __slots__ = ('seq','iseq','ibsp','link',
+                 'loop','nhlx','nsgl','lsig',
+                 'n','nl','nmax',
+                 'ptree','wrk1','wrk2','move',
+                 'eloop','etot','echeck','ekern','pnuc','dgmemo',
+                 'ibpf','imatch','nmatch',
+                 'imask','nidx','wnuc','lrx')
+
+    def __init__(self,n=mxnt):
+
+        # INTEGERS
+        # n,nmax,lmax
+
+        nmax = n + npad
+
+        # The partial sum table needs the next power of 2 above nl
+        lmax = 2
+        while ( lmax < nmax ):
+            lmax *= 2
+        lmax += npad
+
+        self.seq = "N"*n
+
+        self.iseq = np.zeros(nmax, dtype=np.int32)
+        self.ibsp = np.zeros(nmax, dtype=np.int32)
+        self.link = np.zeros(nmax, dtype=np.int32)
+
+        self.loop = np.zeros(nmax, dtype=np.int32)
+        self.nhlx = np.zeros(nmax, dtype=np.int32)
+        self.nsgl = np.zeros(nmax, dtype=np.int32)
+
+        # Zobrist signature of each loop (see LOOP_LINK), 0 for no loop
+        self.lsig = [0] * nmax
+
+        self.n = n
+        self.nl = 0
+        self.nmax = nmax
+
+        # Partial sum table of the loop rates (PTOT) and its nodes (PSUM)
+        self.ptree = PSUM_TREE(lmax)
+
+        self.wrk1 = np.zeros(nmax, dtype=np.float64)
+        self.wrk2 = np.zeros(nmax, dtype=np.float64)
+
+        # Free energy of each loop (see LOOP_ENER) and of the structure
+        self.eloop = np.zeros(lmax, dtype=np.float64)
+        self.etot = 0.0
+        self.echeck = False
+
+        # Sequence energy tables (ENERGY_KERNEL) and nucleation
+        # probabilities (SETUPNUC), set by PYFOLD_SETUP
+        self.ekern = None
+        self.pnuc = None
+
+        # PNUC as an array padded to NMAX, and the nucleation candidate
+        # index of the large loops keyed on their closing nt (NUC_INDEX)
+        self.wnuc = np.zeros(nmax, dtype=np.float64)
+        self.nidx = {}
+
+        # Reaction table of each loop keyed on its closing nt (LOOP_RX)
+        self.lrx = {}
+
+        # Memo table of the DELTAG_* energies (DG_MEMO) or None
+        self.dgmemo = None
+
+        # Last move fired by LOOP_FIRE (type,i,j,k,l)
+        self.move = (0,0,0,0,0)
+
+        # Stop structure and the nt that agree with it (see MATCH_INIT)
+        self.ibpf = None
+        self.imatch = np.zeros(nmax, dtype=np.int8)
+        self.nmatch = 0
+
+        # Ribosome footprints over each nt (see LOOP_MASK), kept by
+        # CLEAR_LOOPS
+        self.imask = np.zeros(nmax, dtype=np.int8)
+
+    def CLEAR_LOOPS(self):
+
+        n = self.n + npad
+
+        self.link[:n] = 0
+        self.loop[:n] = 0
+        self.nhlx[:n] = 0
+        self.nsgl[:n] = 0
+        self.lsig[:n] = [0] * n
+
+        self.nidx.clear()
+        self.lrx.clear()
+
+        self.wrk1[:n] = 0.0
+        self.wrk2[:n] = 0.0
+
+        self.ptree.CLEAR()
+
+        self.eloop[:] = 0.0
+
+
+    @property
+    def psum(self):
+        return self.ptree.psum
+
+    @property
+    def ptot(self):
+        return self.ptree.ptot
+
+    @property
+    def nsum(self):
+        return self.ptree.nsum
+
+    def LOOP_INIT(self):
+        loop_init.LOOP_INIT(self)
+
+    def LOOP_RESUM(self,indx):
+        loop_resum.LOOP_RESUM(self,indx)
+
+    def HELX_REAC(self,indx):
+        helx_reac.HELX_REAC(self,indx)
+
+    def LOOP_REAC(self,indx):
+        loop_reac.LOOP_REAC(self,indx)
+
+    def LOOP_FIRE(self,indx,amax):
+        loop_fire.LOOP_FIRE(self,indx,amax)
+        self.MATCH_MOVE()
+
+    def LOOP_GROW(self):
+        loop_grow.LOOP_GROW(self)
+        self.MATCH_MOVE()
+
+    def LOOP_MASK(self,ia,ib,ival):
+        nbrk = loop_mask.LOOP_MASK(self,ia,ib,ival)
+        # unwound pairs are not a single move, recount
+        if ( nbrk > 0 ):
+            self.MATCH_INIT(self.ibpf)
+        return nbrk
+
+    def COUNTERS(self):
+
+        # Partial sum resums
+
+        return {'resum': self.ptree.nupdate}
+
+    def MATCH_INIT(self,ibpf):
+
+        # Counts the nt 1..N(seq) whose partner agrees with IBPF, None
+        # switches the counter off
+
+        self.ibpf = ibpf
+
+        if ibpf is None:
+            return
+
+        nn = len(self.seq)
+
+        self.imatch[:] = 0
+        self.imatch[1:nn+1] = ( self.ibsp[1:nn+1] == ibpf[1:nn+1] )
+        self.nmatch = int(self.imatch.sum())
+
+    def MATCH_MOVE(self):
+
+        # Updates the counter for the nt touched by RNA%MOVE
+
+        # INTEGER
+        # k,m
+
+        if self.ibpf is None:
+            return
+
+        for k in self.move[1:]:
+            if ( k > 0 ):
+                m = int(self.ibsp[k] == self.ibpf[k])
+                self.nmatch += m - int(self.imatch[k])
+                self.imatch[k] = m
+
+    def AT_TARGET(self):
+
+        return self.nmatch == len(self.seq)
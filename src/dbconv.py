@@ -0,0 +1,478 @@
+"""
+Module: DBCONV
+
+Description: Dot-bracket <-> pair table conversion of single structures and
+             of batches, for the start and stop structures of PYFOLD and
+             the export of trajectories.
+
+Method: Pair tables are 0-based with -1 for unpaired positions,
+        PT(i) = j if i pairs with j. The kinetics core uses the 1-based
+        RNA%IBSP with 0 for unpaired, see DB2IBSP and IBSP2DB.
+
+          DB2PT - Each distinct string of a batch is converted once, as
+                  the checkpoints of a trajectory repeat their structures.
+                  The strings are grouped by length, joined and coded in
+                  chunks of NCHUNK nt (so the work arrays stay in cache)
+                  by one BYTES.TRANSLATE with a precompiled table:
+                  '.' = 0, opening bracket of type t = t, closing = -t,
+                  any other character = BAD. For each bracket type the
+                  depth D = CUMSUM(open - close) over the brackets of the
+                  rows one after the other is checked (never negative,
+                  zero after the last bracket of each row), so the chunk
+                  is one balanced string and no pair crosses a row end.
+                  The level of an opening bracket is D after it and of a
+                  closing bracket D before it. A stable (radix) argsort of
+                  the levels, one byte wide for depths below 256, lists
+                  the brackets of each level in order, which alternate
+                  open, close, so consecutive brackets are the pairs. Each
+                  type is matched on its own, so pseudoknots written with
+                  several bracket types are converted exactly.
+
+          PT2DB - A nested table is written with '(' and ')' from the
+                  sign of PT(i) - i, coded and translated for the whole
+                  batch at once and split at the row ends. The table is
+                  checked first unless CHECK is False: symmetric, in
+                  range (CHECK_PT), and without crossing pairs, which the
+                  brackets could not write (CHECK_NESTED). With PK every
+                  structure is given the first bracket type in which its
+                  pairs do not cross (a slow per-pair loop).
+
+        Malformed input raises ValueError naming the structure and the
+        position.
+
+Arguments:
+
+         FLDS - A dot-bracket string or a list of them.
+           PT - A pair table (N) or a batch of equal length tables (B,N).
+     BRACKETS - Bracket types accepted, as opening/closing pairs.
+           PK - Write crossing pairs with several bracket types.
+        CHECK - Check the pair table before it is written (default).
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Distinct strings once, cached chunks, PT2DB checks
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+
+# Bracket types in the order PT2DB uses them for pseudoknots
+brackets_all = '()[]{}<>'
+
+# Code of a character outside the alphabet
+bad = 127
+
+# Elements converted at once, the work arrays of a chunk stay in cache
+nchunk = 1 << 18
+
+# Translate tables of the bracket sets, built on first use
+tables = {}
+
+# Translate table of PT2DB codes
+ptable = bytes.maketrans(b'\x00\x01\x02\x03',b'.)(\n')
+
+
+def TABLE(brackets):
+
+    # Translate table of a bracket set, character -> int8 code
+
+    table = tables.get(brackets)
+
+    if table is None:
+
+        if ( len(brackets) % 2 != 0 ) or ( '.' in brackets ):
+            raise ValueError("Brackets must be opening/closing pairs, got {!r}.".format(brackets))
+
+        lut = bytearray([bad]*256)
+        lut[ord('.')] = 0
+
+        for t in range(len(brackets)//2):
+            lut[ord(brackets[2*t])]   = t + 1
+            lut[ord(brackets[2*t+1])] = 256 - (t + 1)
+
+        table = bytes(lut)
+        tables[brackets] = table
+
+    return table
+
+
+def DB2PT(flds,brackets=brackets_all):
+
+    # Pair table(s) of dot-bracket string(s), a 1-D array for a string,
+    # a 2-D array (B,N) for a list of strings of one length and a list of
+    # arrays for a list of several lengths
+
+    # INTEGER
+    # k,u
+
+    if isinstance(flds,str):
+        return DB2PT([flds],brackets)[0]
+
+    table = TABLE(brackets)
+
+    #=== Distinct structures ===#
+
+    iuniq = {}
+    inv = [ iuniq.setdefault(fld,len(iuniq)) for fld in flds ]
+
+    if ( len(iuniq) == len(flds) ):
+        return CONVERT(flds,table,brackets,range(len(flds)))
+
+    # structure named in the errors, the first one of each
+    inv = np.array(inv,dtype=np.int64)
+
+    kfirst = np.empty(len(iuniq),dtype=np.int64)
+    kfirst[inv[::-1]] = np.arange(len(inv)-1,-1,-1)
+
+    pt = CONVERT(list(iuniq),table,brackets,kfirst)
+
+    if isinstance(pt,np.ndarray):
+        return pt[inv]
+
+    return [ pt[u].copy() for u in inv ]
+
+
+def CONVERT(flds,table,brackets,knum):
+
+    # Pair tables of the strings FLDS, KNUM(K) the structure number of
+    # string K in the errors
+
+    #=== Batches of equal length ===#
+
+    lens = list(map(len,flds))
+
+    if lens and ( min(lens) == max(lens) ):
+        groups = {lens[0]: range(len(flds))}
+    else:
+        groups = {}
+        for k,n in enumerate(lens):
+            groups.setdefault(n,[]).append(k)
+
+    out = [None]*len(flds)
+
+    for n,ks in groups.items():
+
+        pt = np.empty((len(ks),n),dtype=np.int32)
+
+        nrow = max(1,nchunk // max(n,1))
+
+        for m in range(0,len(ks)*(n>0),nrow):
+
+            kk = ks[m:m+nrow]
+
+            if isinstance(kk,range):
+                batch = flds[kk.start:kk.stop]
+                kn = knum[kk.start:kk.stop]
+            else:
+                batch = [ flds[k] for k in kk ]
+                kn = [ knum[k] for k in kk ]
+
+            try:
+                raw = ''.join(batch).encode('ascii')
+            except UnicodeEncodeError:
+                raw = b''
+
+            code = np.frombuffer(raw.translate(table),dtype=np.int8)
+
+            if ( len(code) != len(kk)*n ) or ( code.max() == bad ):
+                for fld,k in zip(batch,kn):
+                    CHECK_CHARS(fld,k,brackets)
+
+            MATCH(code.reshape(len(kk),n),len(brackets)//2,kn,brackets,
+                  pt[m:m+nrow])
+
+        if ( len(groups) == 1 ):
+            return pt
+
+        for r,k in enumerate(ks):
+            out[k] = pt[r]
+
+    return out
+
+
+def CHECK_CHARS(fld,k,brackets):
+
+    # Raises on the first character of FLD outside '.' and BRACKETS
+
+    for i,c in enumerate(fld):
+        if ( c != '.' ) and ( c not in brackets ):
+            raise ValueError("Structure {}: invalid character {!r} at position {}, expected '.' or one of {!r}.".format(
+                             k,c,i+1,brackets))
+
+
+def MATCH(code,ntype,kk,brackets,pt):
+
+    # Pair tables PT (B,N) of the coded rows, KK the structure of each row
+
+    # INTEGER
+    # nb,n,t
+
+    nb,n = code.shape
+
+    # PT(i) - i of the pairs, -1 - i for unpaired, so that the table is
+    # the offset plus i
+    pt[:] = -1 - np.arange(n,dtype=np.int32)
+
+    off = pt.reshape(-1)
+
+    # Depths of valid rows are at most N
+    idtype = np.int16 if ( n < np.iinfo(np.int16).max ) else np.int32
+
+    # '(' and ')' only, the codes are the steps of the depth
+    ione = ( code.max() <= 1 ) and ( code.min() >= -1 )
+
+    # Last position of each row
+    iend = np.arange(n,nb*n+1,n)
+
+    for t in range(1,ntype+1):
+
+        #=== Brackets of type t and their steps ===#
+
+        if ione:
+            if ( t > 1 ):
+                break
+            step = code.ravel()
+        else:
+            step = ( code == t ).view(np.int8) - ( code == -t ).view(np.int8)
+            step = step.ravel()
+
+        idx = np.flatnonzero(step != 0).astype(np.int32)
+
+        if ( len(idx) == 0 ):
+            continue
+
+        s = np.take(step,idx)
+
+        #=== Depth of the rows one after the other ===#
+
+        depth = np.cumsum(s,dtype=idtype)
+
+        # every row is balanced if the depth is never negative and is 0
+        # after the last bracket of each row, then the rows join into one
+        # balanced string
+        iel = np.searchsorted(idx,iend) - 1
+
+        if ( depth.min() < 0 ) or np.any(depth[iel[iel >= 0]]):
+            BALANCE(step.reshape(nb,n),t,kk,brackets)
+
+        #=== Pairs of each level ===#
+
+        # level of a closing bracket is the depth before it
+        depth -= ( s >> 1 )
+
+        # stable radix sort of the levels, one byte if they fit
+        if ( depth.max() < 256 ):
+            depth = depth.astype(np.uint8)
+
+        order = np.argsort(depth,kind='stable')
+
+        ia = idx[order[0::2]]
+        ib = idx[order[1::2]]
+
+        ib -= ia
+
+        off[ia] = ib
+        ia += ib
+        off[ia] = -ib
+
+    pt += np.arange(n,dtype=np.int32)
+
+    return pt
+
+
+def BALANCE(step,t,kk,brackets):
+
+    # Raises on the first unbalanced row
+
+    depth = np.cumsum(step,axis=1,dtype=np.int32)
+
+    for r in range(len(depth)):
+
+        ineg = ( depth[r] < 0 )
+
+        if ineg.any():
+            raise ValueError("Structure {}: unmatched {!r} at position {}.".format(
+                             kk[r],brackets[2*t-1],int(np.argmax(ineg))+1))
+
+        if ( depth[r,-1] != 0 ):
+            raise ValueError("Structure {}: {} unmatched {!r}.".format(
+                             kk[r],int(depth[r,-1]),brackets[2*t-2]))
+
+
+def PT2DB(pt,pk=False,check=True):
+
+    # Dot-bracket string(s) of a pair table (N) or batch (B,N), checked
+    # unless CHECK is False
+
+    pt = np.asarray(pt)
+
+    if ( pt.ndim == 1 ):
+        return PT2DB(pt[np.newaxis,:],pk,check)[0]
+
+    nb,n = pt.shape
+
+    nrow = max(1,nchunk // max(n,1))
+
+    if pk:
+        if check:
+            for m in range(0,nb,nrow):
+                CHECK_PT(pt[m:m+nrow],m)
+        return [ PT2DB_PK(pt[r]) for r in range(nb) ]
+
+    ip = np.arange(n,dtype=pt.dtype)
+
+    # 0 unpaired, 1 closing, 2 opening, 3 end of row
+    fld = np.empty((nb,n+1),dtype=np.uint8)
+    fld[:,n] = 3
+
+    c = fld[:,:n]
+    np.greater_equal(pt,0,out=c.view(np.bool_))
+    c += ( pt > ip ).view(np.uint8)
+
+    # a crossing table would be written as a different structure
+    if check:
+        for m in range(0,nb,nrow):
+            io,jo = CHECK_PT(pt[m:m+nrow],m)
+            CHECK_NESTED(c[m:m+nrow],io,jo,m)
+
+    text = fld.tobytes().translate(ptable).decode('ascii')
+
+    return text.split('\n')[:-1]
+
+
+def CHECK_PT(pt,r0=0):
+
+    # Symmetric, in range, no pair of a position with itself. R0 is the
+    # number of the first table in the errors
+
+    # INTEGER
+    # nb,n,k
+
+    nb,n = pt.shape
+
+    if ( pt.min() < -1 ) or ( pt.max() >= n ):
+        r,i = np.argwhere(( pt < -1 ) | ( pt >= n ))[0]
+        raise ValueError("Pair table {}: position {} pairs with {}, out of range.".format(
+                         r0+r,i,pt[r,i]))
+
+    pf = pt.reshape(-1)
+
+    io = np.flatnonzero(pf >= 0)
+    col = io % n
+    jo = io - col + pf[io]
+
+    ibad = ( pf[jo] != col ) | ( pf[io] == col )
+
+    if ibad.any():
+        k = int(np.argmax(ibad))
+        raise ValueError("Pair table {}: position {} pairs with {}, which does not pair back.".format(
+                         r0+io[k]//n,col[k],pf[io[k]]))
+
+    # paired positions and their partners, flat
+    return io,jo
+
+
+def CHECK_NESTED(c,io,jo,r0=0):
+
+    # Raises on the first pair that crosses another. C holds the codes of
+    # PT2DB (1 closing, 2 opening) and IO,JO the paired positions and
+    # their partners (see CHECK_PT), R0 is the number of the first table.
+    # Pair i-j nests if the brackets between i and j are balanced, that
+    # is the depth after i is the depth before j. The pair of a crossing
+    # that closes first has an unmatched opening bracket between its
+    # ends, so every crossing fails the test.
+
+    # INTEGER
+    # nb,n,k
+
+    nb,n = c.shape
+
+    c8 = c.view(np.int8)
+
+    step = ( c8 >> 1 ) - ( c8 & 1 )
+
+    idtype = np.int16 if ( n < np.iinfo(np.int16).max ) else np.int32
+
+    depth = np.cumsum(step,axis=1,dtype=idtype).reshape(-1)
+
+    # depth after i less depth after j, 1 for an opening bracket i and
+    # -1 for a closing one if the pair nests
+    d = depth[io] - depth[jo]
+    d[jo < io] *= -1
+
+    ibad = ( d != 1 )
+
+    if ibad.any():
+        k = int(np.argmax(ibad))
+        raise ValueError("Structure {}: pair {}-{} crosses another pair, use pk=True.".format(
+                         r0+io[k]//n,min(io[k],jo[k])%n,max(io[k],jo[k])%n))
+
+
+def PT2DB_PK(pt):
+
+    # Bracket types for a pseudoknotted table, pairs in 5' order put in
+    # the first type where they nest with the pairs still open
+
+    # INTEGER
+    # i,j,t,n
+
+    n = len(pt)
+
+    fld = ['.']*n
+    stacks = [ [] for t in range(len(brackets_all)//2) ]
+
+    for i in range(n):
+
+        j = int(pt[i])
+
+        if ( j <= i ):
+            continue
+
+        for t,stack in enumerate(stacks):
+
+            while stack and ( stack[-1] < i ):
+                stack.pop()
+
+            if ( not stack ) or ( stack[-1] > j ):
+                stack.append(j)
+                fld[i] = brackets_all[2*t]
+                fld[j] = brackets_all[2*t+1]
+                break
+
+        else:
+            raise ValueError("Pair table needs more than {} bracket types.".format(len(stacks)))
+
+    return ''.join(fld)
+
+
+#=== Kinetics core tables ===#
+
+def DB2IBSP(fld,nmax=None):
+
+    # 1-based RNA%IBSP of a nested dot-bracket string, of length NMAX
+    # (default N+1)
+
+    n = len(fld)
+
+    pt = DB2PT(fld,'()')
+
+    if nmax is None:
+        nmax = n + 1
+
+    ibsp = np.zeros(nmax,dtype=np.int32)
+    ibsp[1:n+1] = pt + 1
+
+    return ibsp
+
+
+def IBSP2DB(ibsp,n):
+
+    # Dot-bracket string of the 1-based RNA%IBSP(1..N)
+
+    return PT2DB(np.asarray(ibsp[1:n+1]) - 1)
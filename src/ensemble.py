@@ -0,0 +1,279 @@
+"""
+Subroutine: PYFOLD_ENSEMBLE (SEQ,FLD_START,FLD_STOP,NSIM,TMAX,ISEED,NPROC,TEMP,
+                             RTOL,STATS,NCHECK,FCENS,STORE,BPAGG)
+
+Description: Runs an ensemble of NSIM folding trajectories for an RNA
+             sequence, sharding the trajectories across a pool of worker
+             processes.
+
+Method: Each trajectory ISIM is given its own random number stream,
+        spawned from the master seed ISEED (see RNG%SPAWN_SEEDS): a child
+        SeedSequence for the NumPy generators, or the Park-Miller sequence
+        jumped ahead (ISIM-1)*STRIDE steps in the legacy mode. Seeds
+        depend only on ISIM and never on which worker ran the trajectory,
+        so the merged results are identical for any number of workers.
+
+        With RTOL the first passage times are fed to FPT_STATS in
+        trajectory order as the chunks finish, and the ensemble stops
+        (cancelling the chunks not yet started) once the confidence
+        interval of the mean FPT is within RTOL of the mean and at most
+        a fraction FCENS of the trajectories is censored. NSIM is then
+        an upper bound. Convergence is checked after every NCHECK
+        trajectories, and the chunks are cut at these counts (CHUNKS),
+        so the ensemble stops after the same trajectories whatever the
+        number of workers or NCHUNK, and only these are returned and
+        merged into BPAGG.
+
+        With STORE the workers attach to the shared memory result store
+        (SHM_STORE) and write the structures at the TOUT checkpoints and
+        the final structure of trajectory ISIM into its rows. The results
+        returned then hold the scalars of each trajectory only, the final
+        structures are in STORE%FINAL.
+
+        With BPAGG every chunk counts the pairs at the TOUT checkpoints in
+        a BP_AGGREGATOR of its own, which is returned with the results and
+        merged into BPAGG, so the base pair probabilities of the ensemble
+        need no stored trajectories.
+
+Arguments:
+
+          SEQ - RNA sequence.
+    FLD_START - Initial structure in Vienna format (optional).
+     FLD_STOP - Stop structure in Vienna format (optional).
+         NSIM - Number of trajectories.
+         TMAX - Maximum simulation time (uS).
+        ISEED - Master seed for the random number generator.
+        NPROC - Number of worker processes (None = all cores).
+         TEMP - Temperature (K), None for the 37 C parameters.
+         RTOL - Relative half width of the FPT confidence interval to stop
+                at (optional, needs FLD_STOP).
+        STATS - FPT_STATS filled with the first passage times (optional).
+       NCHECK - Trajectories between the convergence checks (default 10).
+        FCENS - Largest censored fraction to stop at (default 0.01).
+      RNGMODE - Random number generator, see RNG (default 'pcg64').
+        STORE - SHM_STORE of at least NSIM trajectories of LEN(SEQ) nt
+                (optional).
+        BPAGG - BP_AGGREGATOR of LEN(SEQ) nt the pair counts are merged
+                into (optional).
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Simulation temperature (TEMP)
+            10/17/2026      FPT statistics and early termination (RTOL)
+            10/17/2026      Per-trajectory RNG streams (RNGMODE)
+            10/17/2026      Shared memory result store (STORE)
+            10/17/2026      Base pair probability time course (BPAGG)
+            10/17/2026      Convergence checked every NCHECK trajectories
+
+Dependencies: concurrent.futures, multiprocessing.shared_memory
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from pyfold import PYFOLD_SETUP, PYFOLD_TRAJECTORY
+from fptstats import FPT_STATS
+from rng import RNG_STREAM, SPAWN_SEEDS
+from shmstore import SHM_ATTACH, SHM_SINK
+from bpagg import BP_AGGREGATOR
+from trajectory import SINK_GROUP
+
+def ENSEMBLE_SEEDS(iseed,nsim,rngmode=None):
+
+    # Seeds of the NSIM trajectory streams
+    return SPAWN_SEEDS(iseed,nsim,rngmode)
+
+
+def CHUNKS(nsim,nchunk,ncheck=None):
+
+    # Trajectory ranges (k,m) of the chunks, at most NCHUNK long and cut
+    # at every multiple of NCHECK
+
+    # INTEGERS
+    # k,m
+
+    chunks = []
+
+    k = 0
+
+    while ( k < nsim ):
+
+        m = min(k+nchunk,nsim)
+
+        if ncheck:
+            m = min(m,(k//ncheck+1)*ncheck)
+
+        chunks.append((k,m))
+
+        k = m
+
+    return chunks
+
+
+def ENSEMBLE_CHUNK(seq,fld_start,fld_stop,tmax,isims,seeds,temp=None,rngmode=None,
+                   spec=None,ibpagg=False):
+
+    # Every worker sets up its own RNA_STRUC and parameters, attaches to
+    # the result store of SPEC and counts pairs in its own aggregator.
+    # Returns the results and the aggregator (or None).
+
+    rna,ibpi,ibpf,istop = PYFOLD_SETUP(seq,fld_start,fld_stop,temp=temp)
+
+    store = None
+    bpagg = None
+
+    sinks = []
+
+    if spec is not None:
+        store = SHM_ATTACH(spec)
+        sinks.append(SHM_SINK(store))
+
+    if ibpagg:
+        bpagg = BP_AGGREGATOR(rna.n)
+        sinks.append(bpagg)
+
+    sink = None
+    if ( len(sinks) == 1 ): sink = sinks[0]
+    if ( len(sinks) > 1 ):  sink = SINK_GROUP(sinks)
+
+    results = []
+
+    for isim,iseed in zip(isims,seeds):
+
+        if sink is not None:
+            sink.BEGIN(isim)
+
+        res = PYFOLD_TRAJECTORY(rna,ibpi,ibpf,istop,RNG_STREAM(iseed,rngmode),0.0,tmax,sink)
+        res['isim'] = isim
+
+        # the final structure goes back through the store
+        if store is not None:
+            store.PUT(isim,res)
+            del res['ibsp']
+
+        results.append(res)
+
+    if store is not None:
+        store.CLOSE()
+
+    if bpagg is not None:
+        bpagg.CLOSE()
+
+    return results,bpagg
+
+
+def PYFOLD_ENSEMBLE(seq,fld_start=None,fld_stop=None,nsim=1,tmax=1.0,
+                    iseed=61928712,nproc=None,nchunk=None,temp=None,
+                    rtol=None,stats=None,nmin=30,ncheck=10,fcens=0.01,
+                    rngmode=None,store=None,bpagg=None):
+
+    # INTEGERS
+    # nsim,nproc,nchunk,iseed,nmin,ncheck
+
+    # FLOAT
+    # rtol,fcens
+
+    if ( rtol is not None ) and ( fld_stop is None ):
+        raise ValueError("Early termination (rtol) needs a stop structure.")
+
+    if ( stats is None ) and ( rtol is not None ):
+        stats = FPT_STATS()
+
+    spec = None
+
+    if store is not None:
+        if ( store.nsim < nsim ) or ( store.n != len(seq) ):
+            raise ValueError("Result store of {} x {} nt cannot hold {} trajectories of {} nt.".format(
+                             store.nsim,store.n,nsim,len(seq)))
+        spec = store.SPEC()
+
+    ibpagg = bpagg is not None
+
+    if ibpagg and ( bpagg.n != len(seq) ):
+        raise ValueError("Pair aggregator of {} nt cannot count {} nt.".format(bpagg.n,len(seq)))
+
+    seeds = ENSEMBLE_SEEDS(iseed,nsim,rngmode)
+    isims = list(range(1,nsim+1))
+
+    # convergence checks at fixed trajectory counts
+    if rtol is None:
+        ncheck = None
+
+    #=== Serial run ===#
+
+    if nproc == 1:
+
+        if stats is None:
+            results,agg = ENSEMBLE_CHUNK(seq,fld_start,fld_stop,tmax,isims,seeds,temp,rngmode,
+                                         spec,ibpagg)
+            if ibpagg:
+                bpagg.MERGE(agg)
+            return results
+
+        if nchunk is None:
+            nchunk = 1
+
+        results = []
+        for k,m in CHUNKS(nsim,nchunk,ncheck):
+            chunk,agg = ENSEMBLE_CHUNK(seq,fld_start,fld_stop,tmax,
+                                       isims[k:m],seeds[k:m],temp,rngmode,
+                                       spec,ibpagg)
+            results.extend(chunk)
+            if ibpagg:
+                bpagg.MERGE(agg)
+            if ENSEMBLE_PUSH(stats,chunk,rtol,nmin,ncheck,fcens):
+                break
+
+        return results
+
+    #=== Shard trajectories ===#
+
+    if nproc is None:
+        nproc = os.cpu_count() or 1
+
+    if nchunk is None:
+        nchunk = max(1,nsim // (4 * nproc))
+
+    with ProcessPoolExecutor(max_workers=nproc) as pool:
+
+        futures = []
+        for k,m in CHUNKS(nsim,nchunk,ncheck):
+            futures.append(pool.submit(ENSEMBLE_CHUNK,seq,fld_start,fld_stop,
+                                       tmax,isims[k:m],seeds[k:m],temp,rngmode,
+                                       spec,ibpagg))
+
+        results = []
+        for k,f in enumerate(futures):
+            chunk,agg = f.result()
+            results.extend(chunk)
+            if ibpagg:
+                bpagg.MERGE(agg)
+            if ( stats is not None ) and ENSEMBLE_PUSH(stats,chunk,rtol,nmin,ncheck,fcens):
+                for g in futures[k+1:]:
+                    g.cancel()
+                break
+
+    #=== Merge in trajectory order ===#
+
+    results.sort(key=lambda res: res['isim'])
+
+    return results
+
+
+def ENSEMBLE_PUSH(stats,chunk,rtol,nmin,ncheck=None,fcens=0.01):
+
+    # Adds a chunk to the FPT statistics, True once converged. The chunks
+    # end at the multiples of NCHECK, where convergence is checked.
+
+    for res in chunk:
+        stats.PUSH(res)
+
+    if ( rtol is None ) or ( ncheck and stats.NTOT() % ncheck != 0 ):
+        return False
+
+    return stats.CONVERGED(rtol,nmin,fcens=fcens)
@@ -0,0 +1,238 @@
+"""
+Module: FPTSTATS
+
+Description: Streaming statistics of the first passage times (FPT) of an
+             ensemble of folding trajectories, used by PYFOLD_ENSEMBLE to
+             stop once the mean FPT is known well enough.
+
+Method: The mean and variance are updated with Welford's algorithm,
+
+            M(k) = M(k-1) + (T - M(k-1))/k
+            S(k) = S(k-1) + (T - M(k-1))*(T - M(k))
+
+        and quantiles with the P**2 algorithm, which keeps 5 markers per
+        quantile and adjusts them with a piecewise parabolic fit, in O(1)
+        memory and time per sample.
+
+        See Jain, R. and Chlamtac, I. (1985). "The P2 Algorithm for
+        Dynamic Calculation of Quantiles and Histograms Without Storing
+        Observations". Comm. ACM 28, 1076.
+
+        Trajectories that do not reach the stop structure by TMAX are
+        counted as censored (NCENS) and do not enter the statistics, so
+        the estimates are conditional on folding before TMAX. They are
+        biased low when many trajectories are censored, since each of
+        these would have added an FPT above TMAX.
+
+        The ensemble has converged when at least NMIN trajectories have
+        folded, the half width of the normal confidence interval
+        Z*SQRT(VAR/N) is below RTOL*MEAN and the censored fraction
+        NCENS/(N+NCENS) is at most FCENS. With too many censored
+        trajectories the ensemble runs to the end and TMAX should be
+        raised.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      No convergence above the censored fraction FCENS
+
+Dependencies:
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import math
+
+
+class P2_QUANTILE(object):
+
+    __slots__ = ('p','q','npos','ndes','dn','count')
+
+    def __init__(self,p):
+
+        if ( p <= 0.0 ) or ( p >= 1.0 ):
+            raise ValueError("Quantile must be in (0,1), got {}.".format(p))
+
+        self.p = p
+
+        # marker heights, actual and desired positions
+        self.q    = []
+        self.npos = [0,1,2,3,4]
+        self.ndes = [0.0,2.0*p,4.0*p,2.0+2.0*p,4.0]
+        self.dn   = [0.0,0.5*p,p,0.5*(1.0+p),1.0]
+
+        self.count = 0
+
+    def PUSH(self,x):
+
+        # INTEGER
+        # i,k,d
+
+        # FLOAT
+        # qp
+
+        q = self.q
+        npos = self.npos
+
+        self.count += 1
+
+        #=== First 5 samples ===#
+
+        if ( self.count <= 5 ):
+            q.append(x)
+            q.sort()
+            return
+
+        #=== Cell of x ===#
+
+        if ( x < q[0] ):
+            q[0] = x
+            k = 0
+        elif ( x >= q[4] ):
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while ( x >= q[k+1] ):
+                k += 1
+
+        for i in range(k+1,5):
+            npos[i] += 1
+
+        for i in range(5):
+            self.ndes[i] += self.dn[i]
+
+        #=== Adjust the middle markers ===#
+
+        for i in range(1,4):
+
+            d = self.ndes[i] - npos[i]
+
+            if ( d >= 1.0 and npos[i+1] - npos[i] > 1 ) or \
+               ( d <= -1.0 and npos[i-1] - npos[i] < -1 ):
+
+                d = 1 if d > 0.0 else -1
+
+                qp = self.PARABOLIC(i,d)
+
+                if ( q[i-1] < qp < q[i+1] ):
+                    q[i] = qp
+                else:
+                    q[i] = q[i] + d * (q[i+d] - q[i]) / (npos[i+d] - npos[i])
+
+                npos[i] += d
+
+    def PARABOLIC(self,i,d):
+
+        q = self.q
+        n = self.npos
+
+        return q[i] + d / float(n[i+1] - n[i-1]) * \
+               ( (n[i] - n[i-1] + d) * (q[i+1] - q[i]) / float(n[i+1] - n[i]) +
+                 (n[i+1] - n[i] - d) * (q[i] - q[i-1]) / float(n[i] - n[i-1]) )
+
+    def VALUE(self):
+
+        if ( self.count == 0 ):
+            return float('nan')
+
+        # exact order statistic until the markers are set up
+        if ( self.count <= 5 ):
+            k = int(round(self.p * (self.count - 1)))
+            return self.q[k]
+
+        return self.q[2]
+
+
+class FPT_STATS(object):
+
+    def __init__(self,quantiles=(0.1,0.5,0.9)):
+
+        self.n = 0
+        self.ncens = 0
+
+        self.mean = 0.0
+        self.m2 = 0.0
+
+        self.p2 = [ P2_QUANTILE(p) for p in quantiles ]
+
+    def PUSH(self,res):
+
+        # Adds one trajectory summary (see PYFOLD_TRAJECTORY)
+
+        if res['tfpt'] is None:
+            self.ncens += 1
+            return
+
+        self.ADD(res['tfpt'])
+
+    def ADD(self,t):
+
+        # FLOAT
+        # delta
+
+        self.n += 1
+
+        delta = t - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (t - self.mean)
+
+        for p2 in self.p2:
+            p2.PUSH(t)
+
+    def VAR(self):
+
+        if ( self.n < 2 ):
+            return float('nan')
+
+        return self.m2 / (self.n - 1)
+
+    def HALFWIDTH(self,z=1.96):
+
+        # Half width of the confidence interval of the mean
+
+        if ( self.n < 2 ):
+            return float('inf')
+
+        return z * math.sqrt(self.VAR() / self.n)
+
+    def QUANTILES(self):
+
+        return dict( (p2.p,p2.VALUE()) for p2 in self.p2 )
+
+    def NTOT(self):
+
+        # Trajectories pushed, folded or censored
+        return self.n + self.ncens
+
+    def FCENS(self):
+
+        if ( self.NTOT() == 0 ):
+            return 0.0
+
+        return self.ncens / float(self.NTOT())
+
+    def CONVERGED(self,rtol,nmin=30,z=1.96,fcens=0.01):
+
+        if ( self.n < nmin ):
+            return False
+
+        if ( self.FCENS() > fcens ):
+            return False
+
+        return self.HALFWIDTH(z) <= rtol * abs(self.mean)
+
+    def SUMMARY(self):
+
+        out = {}
+        out['n']         = self.n
+        out['ncens']     = self.ncens
+        out['fcens']     = self.FCENS()
+        out['mean']      = self.mean
+        out['var']       = self.VAR()
+        out['halfwidth'] = self.HALFWIDTH()
+        out['quantiles'] = self.QUANTILES()
+
+        return out
@@ -20,6 +20,11 @@ History:
 Version     Date            Comment
 --------    -------         --------------------
             09/28/2017      Original Code
+            10/17/2026      Update the cached loop energy (LOOP_ENER)
+            10/17/2026      Beta of the parameter set (RNA%EKERN%BETA)
+            10/17/2026      Skip loops waiting for a deferred LOOP_REAC
+            10/17/2026      Replace the open reactions of the loop table (LOOP_RX)
+            10/17/2026      Deferred LOOP_REAC removed, no loop is skipped
 
 Dependencies:
 
@@ -29,6 +34,11 @@ Author(s): Alex Reis
 
 import math
 
+from ENERGY.deltag_hi import DELTAG_HI
+from rnavar import iopn,rateh
+
+from loop_ener import LOOP_ENER
+
 def HELX_REAC(rna,indx):
 
   # Variables
@@ -37,7 +47,10 @@ def HELX_REAC(rna,indx):
   # ke,ip,jp,indx
 
   # FLOAT
-  # x,dg,atot
+  # x,dg,beta
+
+  # 1/RT of the parameter set
+  beta = rna.ekern.beta
 
   jp = indx
 
@@ -55,7 +68,9 @@ def HELX_REAC(rna,indx):
   ke = rna.ibsp[jp]
   ip = rna.ibsp[jp]
 
-  atot = rna.wrk1[jp]
+  # The open reactions are the last of the loop table
+  rx = rna.lrx[rna.loop[indx]]
+  rx.TRUNCATE()
 
   if ( rna.link[ke] == 0 ):
 
@@ -77,17 +92,19 @@ def HELX_REAC(rna,indx):
       rna.wrk2[ip] = 0.0e0
       rna.wrk2[jp] = 0.0e0
 
-      atot += x
+      rx.ADD(iopn,ip,jp,0,x)
       
       ip += 1
-      ip -= 1
+      jp -= 1
 
     #endwhile
   #endif
 
-  rna.ptot[indx] = atot
+  rna.ptot[indx] = rx.CLOSE()
 
   rna.LOOP_RESUM(indx)
 
+  LOOP_ENER(rna,indx)
+
   return
 
@@ -0,0 +1,91 @@
+"""
+Subroutine: LOOP_ENER (RNA,INDX)
+
+Description: Updates the cached free energy of a single loop element and
+             the running total of the structure free energy.
+
+Method: The energy of loop INDX is the term ESTRUC adds for it,
+
+              E(INDX) = E_loop + E_stack
+
+        where E_stack sums the stacks of the helix closing the loop. The
+        structure energy RNA%ETOT is kept as the sum of RNA%ELOOP over all
+        loops, so only the loops passed to LOOP_REAC/HELX_REAC have to be
+        recomputed after each move and the current energy is available
+        in O(1).
+
+Arguments:
+
+       RNA - Class structure containing information on the
+             RNA secondary structure and possible reactions.
+      INDX - The indx number of the loop element.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies:
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+from ENERGY.eloop import ELOOP
+from ENERGY.estack import ESTACK
+from ENERGY.estruc import ESTRUC
+
+def LOOP_ENER(rna,indx):
+
+    # INTEGER
+    # i,j,n,ip,jp,indx
+
+    # REAL
+    # e
+
+    n = rna.n
+
+    i = rna.loop[indx]
+    j = rna.ibsp[i]
+
+    if ( i == n ): j = 1
+
+    #=== Loop Energy ===#
+
+    e = ELOOP(rna.ekern,rna.ibsp,i,j,n)
+
+    #=== Stacking Energy ===#
+
+    if ( i < j ):
+
+        ip = i - 1
+        jp = j + 1
+
+        while ( ip >= 1 and jp <= n ) and ( rna.ibsp[ip] == jp ):
+
+            e += ESTACK(rna.ekern,ip,jp,i,j,n)
+
+            i = ip
+            j = jp
+
+            ip -= 1
+            jp += 1
+
+    #=== Update Running Total ===#
+
+    rna.etot += e - rna.eloop[indx]
+    rna.eloop[indx] = e
+
+    return rna
+
+
+def CHECK_ENERGY(rna,tol=1.0e-6):
+
+    # Consistency check of the running total against a full ESTRUC
+
+    e = ESTRUC(rna.ekern,rna.ibsp,rna.n)
+
+    if ( abs(e - rna.etot) > tol ):
+        raise Exception('ERROR: running energy {} differs from ESTRUC {}'.format(rna.etot,e))
+
+    return e
@@ -0,0 +1,82 @@
+"""
+Subroutine: LOOP_GROW (RNA)
+
+Description: Appends the next nucleotide of the sequence to the 3' end of
+             the RNA during co-transcriptional folding.
+
+Method: The new nucleotide N+1 is single stranded and can only belong to
+        the external loop, so only the external loop element (INDX = 1)
+        has to be updated:
+
+            LOOP(1) = N+1, LINK(N+1) = 1, NSGL(1) = NSGL(1) + 1
+
+        and the closing pair (N,1) in the signature LSIG(1) becomes (N+1,1).
+
+        The number of loops is
+        unchanged, so the partial sum table keeps its size and only the
+        reactions of the external loop are recomputed by LOOP_REAC
+        (which also resums the table and the loop energy). LOOP_INIT is
+        never called again.
+
+        RNA%MOVE is set to (IADD,N+1,0,0,0).
+
+Arguments:
+
+        RNA - Class structure containing information on the
+              RNA secondary structure and possible reactions.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      External loop signature (LSIG)
+
+Dependencies:
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+from rnavar import iadd
+from loop_init import ZPAIR
+
+def LOOP_GROW(rna):
+
+  # INTEGER
+  # n
+
+  n = rna.n
+
+  if ( n >= len(rna.seq) ):
+    raise Exception('ERROR: RNA is already full length ({} nt)'.format(n))
+
+  #=== Old 3' end ===#
+
+  # n keeps its link only if it closes a helix of the external loop
+  if ( rna.ibsp[n] == 0 ): rna.link[n] = 0
+
+  # reaction table and nt index of the external loop move to key n+1
+
+  rna.lrx.pop(n,None)
+  rna.nidx.pop(n,None)
+
+  #=== New 3' end ===#
+
+  n += 1
+
+  rna.n = n
+  rna.ibsp[n] = 0
+
+  rna.loop[1] = n
+  rna.link[n] = 1
+
+  rna.nsgl[1] += 1
+  rna.lsig[1] ^= ZPAIR(n-1,1) ^ ZPAIR(n,1)
+
+  rna.move = (iadd,n,0,0,0)
+
+  #=== External loop reactions ===#
+
+  rna.LOOP_REAC(1)
+
+  return rna
@@ -4,6 +4,12 @@ Subroutine: LOOP_INIT (RNA)
 Description: Initializes the data structures (loop elements) required
              for RNA kinetics.
 
+Method: LOOP_LINK also keeps the signature RNA%LSIG(INDX) of the loop,
+        the XOR of the Zobrist keys ZPAIR of its closing pair (N,1 for
+        the external loop) and of the pair of every helix in it. LOOP_MOVE
+        relinks the loops a move changes, so the signatures follow the
+        moves and DG_MEMO reads them without walking the loop.
+
 Arguments:
         
         RNA - Class structure containing information on the
@@ -13,6 +19,9 @@ History:
 Version     Date            Comment
 --------    -------         --------------------
             09/28/2017      Original Code
+            10/17/2026      1-based IBSP (0 unpaired), no LNS/HTRACK
+            10/17/2026      Links of one loop in LOOP_LINK (see LOOP_MOVE)
+            10/17/2026      Zobrist signature of each loop (RNA%LSIG)
 
 Dependencies:
 
@@ -20,6 +29,22 @@ Author(s): Alex Reis
              Copyright (c) 2017 (Please refer to LICENCE)
 """
 
+# 64 bit mask of the Zobrist keys
+m64 = (1 << 64) - 1
+
+def ZPAIR(i,j):
+
+    # Zobrist key of base pair i-j, the splitmix64 hash of (i,j)
+
+    # INTEGERS
+    # i,j,z
+
+    z = ( ( int(i) << 32 ) | int(j) ) * 0x9E3779B97F4A7C15 & m64
+    z = ( z ^ ( z >> 30 ) ) * 0xBF58476D1CE4E5B9 & m64
+    z = ( z ^ ( z >> 27 ) ) * 0x94D049BB133111EB & m64
+
+    return z ^ ( z >> 31 )
+
 def LOOP_INIT(rna):
 
     # VARIABLES
@@ -27,13 +52,14 @@ def LOOP_INIT(rna):
     # INTEGERS
     # i,j,n,nl,ns,nh
     # ip,jp,kp,ks,ke
-    # nsum
 
     #=== Initialize RNA Data ===#
 
     n = rna.n
     rna.CLEAR_LOOPS()
 
+    rna.etot = 0.0e0
+
     #=== Find loops ===#
 
     nl = 1
@@ -56,68 +82,72 @@ def LOOP_INIT(rna):
 
     #=== Make links ===#
 
-    for i in range(1,nl):
-
-        ip = rna.loop[i]
-        jp = rna.ibsp[ip]
-
-        if ( ip == n ): jp = 1
-        
-        rna.link[ip] = i
-
-        if ( ip < jp ):
-            ks = ip + 1
-            ke = jp
-            nh = 1
-            ns = 0
-        else:
-            ks = jp
-            ke = ip
-            nh = 0
-            ns = 0
-
-        ins = 0
-        kp = ks
-
-        # modified to collect loop asymmetry
-        while ( kp <= ke ):
-
-            # unpaired nt
-            if ( rna.ibsp[kp] == -1 ):
-                ins += 1
-                kp += 1
-
-            # new helix in loop
-            elif ( ibsp[kp] > kp ):
-                rna.lns[i][nh] = ins
-                ns += ins
-                ins = 0
-                nh += 1
-
-                # track helix ip-jp in MBLs
-                rna.htrack[i][kp] = nh
-
-                # skip to closing bp of current nt
-                kp = rna.ibsp[kp]
-                rna.link[kp] = i
-
-        rna.lns[i][0]  = ins # for-loop simplicity
-        rna.lns[i][nh] = ins
-        ns += ins
-
-        rna.nhlx[i] = nh
-        rna.nsgl[i] = ns
+    for i in range(1,nl+1):
+        LOOP_LINK(rna,i)
 
     # Compute size of partial sum table
 
-    nsum = 2
-    while ( nsum < nl ):
-        nsum *= 2
-    rna.nsum = nsum
+    rna.ptree.RESET(nl)
 
     # Compute reactions for loops
     
-    for i in range(1,nl):
+    for i in range(1,nl+1):
         rna.LOOP_REAC(i)
 
-    return rna
\ No newline at end of file
+    return rna
+
+def LOOP_LINK(rna,indx):
+
+    # Links, sizes and signature of loop INDX from its closing nt
+    # RNA%LOOP(INDX)
+
+    # INTEGERS
+    # n,nh,ns,ip,jp,kp,ks,ke,sig
+
+    n = rna.n
+
+    ip = rna.loop[indx]
+    jp = rna.ibsp[ip]
+
+    if ( ip == n ): jp = 1
+
+    rna.link[ip] = indx
+
+    if ( ip < jp ):
+        ks = ip + 1
+        ke = jp
+        nh = 1
+        ns = 0
+    else:
+        ks = jp
+        ke = ip
+        nh = 0
+        ns = 0
+
+    sig = ZPAIR(ip,jp)
+
+    kp = ks
+
+    while ( kp <= ke ):
+
+        # unpaired nt
+        if ( rna.ibsp[kp] == 0 ):
+            ns += 1
+
+        # new helix in loop
+        elif ( rna.ibsp[kp] > kp ):
+            nh += 1
+
+            sig ^= ZPAIR(kp,rna.ibsp[kp])
+
+            # skip to closing bp of current nt
+            kp = rna.ibsp[kp]
+            rna.link[kp] = indx
+
+        kp += 1
+
+    rna.nhlx[indx] = nh
+    rna.nsgl[indx] = ns
+    rna.lsig[indx] = sig
+
+    return rna
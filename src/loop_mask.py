@@ -0,0 +1,144 @@
+"""
+Subroutine: LOOP_MASK (RNA,IA,IB,IVAL)
+
+Description: Covers (IVAL = 1) or uncovers (IVAL = -1) the nucleotides
+             IA..IB with a ribosome footprint during co-translational
+             folding. Covered nucleotides are single stranded and take
+             no part in any move that forms a pair (nucleation, helix
+             extension, morphing and defect diffusion, see LOOP_REAC).
+
+Method: RNA%IMASK(k) counts the footprints over nucleotide k.
+
+        A ribosome unwinds the pairs it runs into, so pairs with a
+        nucleotide in IA..IB are broken when it is covered. They are
+        removed by LOOP_MOVE as one move, which relinks and recomputes
+        only the loops the open helices close or sit in. LOOP_INIT
+        rebuilds the loops instead when a window breaks more than NBMAX
+        pairs, more than a footprint can cover, where one walk of every
+        loop is the cheaper update.
+
+        The rates that can depend on IA..IB are then recomputed, which
+        are those of
+
+          - the loop each nucleotide k of IA..IB belongs to (LOOP_OF),
+            for nucleation, extension and push moves onto k,
+          - both loops of the pairs at k-1 and k+1, for pull moves of
+            these helix ends onto k.
+
+        As the ribosome advances a codon at a time, these are the loops
+        at the two edges of its footprint.
+
+Arguments:
+
+        RNA - Class structure containing information on the
+              RNA secondary structure and possible reactions.
+         IA - First nucleotide of the window.
+         IB - Last nucleotide of the window.
+       IVAL - 1 to cover, -1 to uncover.
+
+        Returns the number of pairs broken.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Pairs unwound by LOOP_MOVE, LOOP_INIT fallback
+            10/17/2026      Edge loops recomputed by LOOP_MOVE are not rerun
+
+Dependencies:
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+from loop_move import LOOP_MOVE, HELIX_OUTER
+
+# Windows breaking more pairs rebuild the loops (LOOP_INIT)
+nbmax = 64
+
+def LOOP_OF(rna,k):
+
+  # Loop element of the single stranded nt k: the first paired nt kp to
+  # the 3' side either closes the loop (partner < k) or starts a helix
+  # of it (partner > kp), and in both cases the loop is LINK(IBSP(kp))
+
+  # INTEGER
+  # k,kp,n
+
+  n = rna.n
+
+  kp = k + 1
+
+  while ( kp <= n ):
+    if ( rna.ibsp[kp] != 0 ):
+      return rna.link[rna.ibsp[kp]]
+    kp += 1
+
+  # 3' tail of the external loop
+  return 1
+
+
+def LOOP_MASK(rna,ia,ib,ival):
+
+  # INTEGER
+  # ia,ib,ival,k,kp,p,n,nbrk
+
+  n = rna.n
+
+  ia = max(ia,1)
+  ib = min(ib,n)
+
+  if ( ia > ib ):
+    return 0
+
+  rna.imask[ia:ib+1] += ival
+
+  #=== Unwind pairs under the footprint ===#
+
+  irem = set()
+
+  if ( ival > 0 ):
+    for k in range(ia,ib+1):
+      kp = rna.ibsp[k]
+      if ( kp != 0 ):
+        irem.add((min(k,kp),max(k,kp)))
+
+  nbrk = len(irem)
+
+  if ( nbrk > nbmax ):
+
+    for k,kp in irem:
+      rna.ibsp[k]  = 0
+      rna.ibsp[kp] = 0
+
+    rna.LOOP_INIT()
+
+    return nbrk
+
+  ireac = set()
+
+  if ( nbrk > 0 ):
+    irem = sorted(irem)
+    ireac = LOOP_MOVE(rna,HELIX_OUTER(rna,irem[0][0]),irem,())
+
+  #=== Loops at the edges ===#
+
+  loops = set()
+
+  for k in range(ia,ib+1):
+
+    loops.add(LOOP_OF(rna,k))
+
+    for p in (k-1,k+1):
+      if ( p >= 1 and p <= n ) and ( rna.ibsp[p] != 0 ):
+        loops.add(rna.link[p])
+        loops.add(rna.link[rna.ibsp[p]])
+
+  # loops LOOP_MOVE has just recomputed are not run again
+  loops.discard(0)
+  loops -= ireac
+
+  for indx in sorted(loops):
+    rna.LOOP_REAC(indx)
+
+  return nbrk
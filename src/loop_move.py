@@ -0,0 +1,289 @@
+"""
+Subroutine: LOOP_MOVE (RNA,INDX,IREM,IADD)
+
+Description: Applies a move to the RNA secondary structure, removing the
+       base pairs IREM and adding the base pairs IADD, and updates
+       the loop elements it changes. Used by LOOP_FIRE for every
+       reaction of loop INDX and by LOOP_MASK to open the helices
+       under a ribosome.
+
+Method: A loop element is keyed by the 5' nt of its closing pair (N for
+       the external loop, which is always loop 1). A pair i-j closes a
+       loop if i+1 does not pair with j-1, else it stacks on i+1,j-1.
+
+         (1) The loops that hold a nt of the move are the loops before
+             the move: INDX and, for a removed pair, the loop it closes
+             and the loop outside it.
+
+         (2) The pairs are changed in RNA%IBSP. The loops after the move
+             are the old loops that still close a loop, and the new
+             loops closed by a nt of the move or its neighbours (a pair
+             added inside a helix, a stack opened by a removed pair).
+
+         (3) Loops that no longer exist free their index, which a new
+             loop takes, else the last loop NL is copied into it and the
+             partial sum table shrinks. New loops without a free index
+             grow the table.
+
+         (4) The links and sizes of the loops after the move are set
+             again by a walk of each loop (LOOP_LINK).
+
+         (5) LOOP_REAC is run once for each of the loops after the
+             move, the loops at both ends of the helices the move
+             changed (their stacks and helix open reactions) and the
+             loops across a lone pair from a changed loop, whose
+             retraction and diffusion energies read it.
+
+       The loop energies are kept by LOOP_REAC (LOOP_ENER), a deleted
+       loop takes its energy out of RNA%ETOT. The indices of the loops
+       recomputed are returned, so a caller does not run LOOP_REAC on
+       them again.
+
+Arguments:
+
+       RNA - Class structure containing information on the
+             RNA secondary structure and possible reactions.
+      INDX - The indx number of the loop element of the move.
+      IREM - Base pairs (i,j), i < j, removed by the move.
+      IADD - Base pairs (i,j), i < j, added by the move.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Returns the loops recomputed
+
+Dependencies:
+
+Author(s): Alex Reis
+       Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+from loop_init import LOOP_LINK
+
+def ISLOOP(rna,k):
+
+  # True if nt K is the key of a loop
+
+  # INTEGER
+  # k,kp
+
+  if ( k == rna.n ): return True
+
+  kp = rna.ibsp[k]
+
+  return ( kp > k ) and ( rna.ibsp[k+1] != kp-1 )
+
+
+def HELIX_LOOP(rna,k):
+
+  # Key of the loop closed by the helix of pair K-IBSP(K)
+
+  # INTEGER
+  # k,kp
+
+  kp = rna.ibsp[k]
+
+  if ( kp < k ): k = kp
+
+  while ( rna.ibsp[k+1] == rna.ibsp[k]-1 ):
+    k += 1
+
+  return k
+
+
+def HELIX_OUTER(rna,k):
+
+  # Index of the loop outside the helix of pair K-IBSP(K)
+
+  # INTEGER
+  # k,kp
+
+  kp = rna.ibsp[k]
+
+  if ( kp < k ): k = kp
+
+  while ( k > 1 ) and ( rna.ibsp[k-1] == rna.ibsp[k]+1 ):
+    k -= 1
+
+  return rna.link[rna.ibsp[k]]
+
+
+def LOOP_MOVE(rna,indx,irem,iadd):
+
+  # INTEGER
+  # n,nl,a,b,k,kp,l,idx,jdx
+
+  n = rna.n
+
+  ibsp = rna.ibsp
+  link = rna.link
+  loop = rna.loop
+
+  #=== Loops before the move ===#
+
+  kold = {loop[indx]: indx}
+
+  for a,b in irem:
+
+    # loop closed by a-b
+    if ( link[a] != 0 ) and ( loop[link[a]] == a ):
+      kold[a] = link[a]
+
+    # loop outside a-b, unless it stacks on a-1,b+1
+    if not ( a > 1 and ibsp[a-1] == b+1 ):
+      kold[loop[link[b]]] = link[b]
+
+  #=== Links of the moved nt ===#
+
+  for k in kold:
+    if ( k != n ): link[k] = 0
+
+  for a,b in irem:
+    link[a] = 0
+    link[b] = 0
+
+  for a,b in iadd:
+    link[a] = 0
+    link[b] = 0
+    # b-1 stops being the outer end of the helix a+1,b-1
+    if ( ibsp[a+1] == b-1 ): link[b-1] = 0
+
+  link[n] = 1
+
+  #=== Apply move ===#
+
+  for a,b in irem:
+    ibsp[a] = 0
+    ibsp[b] = 0
+
+  for a,b in iadd:
+    ibsp[a] = b
+    ibsp[b] = a
+
+  #=== Loops after the move ===#
+
+  knew = set( k for k in kold if ISLOOP(rna,k) )
+
+  for a,b in tuple(irem) + tuple(iadd):
+    for k in (a-1,a,a+1):
+      if ( k >= 1 ) and ISLOOP(rna,k):
+        knew.add(k)
+
+  #=== Loop indices ===#
+
+  kidx = {}
+  ifree = []
+
+  for k,idx in kold.items():
+    if k in knew:
+      kidx[k] = idx
+    else:
+      ifree.append(idx)
+      rna.lrx.pop(k,None)
+      rna.nidx.pop(k,None)
+
+  ifree.sort()
+
+  for k in sorted(knew):
+
+    if k in kidx: continue
+
+    # an unchanged loop next to the move keeps its index
+    if ( link[k] != 0 ) and ( loop[link[k]] == k ):
+      kidx[k] = link[k]
+      continue
+
+    if ifree:
+      idx = ifree.pop(0)
+    else:
+      rna.nl += 1
+      idx = rna.nl
+      rna.ptree.GROW(idx)
+
+    loop[idx] = k
+    kidx[k] = idx
+
+  # Delete the loops left over, last index first
+
+  for idx in sorted(ifree,reverse=True):
+
+    nl = rna.nl
+
+    rna.etot -= rna.eloop[idx]
+
+    if ( idx != nl ):
+
+      # Copy loop nl to idx
+
+      loop[idx] = loop[nl]
+      rna.nhlx[idx] = rna.nhlx[nl]
+      rna.nsgl[idx] = rna.nsgl[nl]
+      rna.ptot[idx] = rna.ptot[nl]
+      rna.eloop[idx] = rna.eloop[nl]
+
+      rna.LOOP_RESUM(idx)
+
+      kp = loop[idx]
+
+      if ( kidx.get(kp) == nl ):
+        kidx[kp] = idx
+
+      LOOP_LINK(rna,idx)
+
+    loop[nl] = 0
+    rna.nhlx[nl] = 0
+    rna.nsgl[nl] = 0
+    rna.ptot[nl] = 0.0e0
+    rna.eloop[nl] = 0.0e0
+    rna.lsig[nl] = 0
+
+    rna.LOOP_RESUM(nl)
+
+    rna.nl = nl - 1
+
+    rna.ptree.SHRINK(rna.nl)
+
+  #=== Links and sizes ===#
+
+  for k,idx in kidx.items():
+    LOOP_LINK(rna,idx)
+
+  #=== Reactions ===#
+
+  ireac = set(kidx.values())
+
+  # loops at both ends of the changed helices
+  khlx = [ a for a,b in iadd ]
+
+  for a,b in irem:
+    if ( ibsp[a+1] == b-1 ) and ( b-1 > a+1 ): khlx.append(a+1)
+    if ( a > 1 ) and ( ibsp[a-1] == b+1 ): khlx.append(a-1)
+
+  for k in khlx:
+    ireac.add(link[HELIX_LOOP(rna,k)])
+    ireac.add(HELIX_OUTER(rna,k))
+
+  # loops across a lone pair
+  for k,idx in kidx.items():
+
+    kp = ibsp[k]
+
+    if ( k == n ):
+      l = 1
+      kp = n
+    else:
+      if ( link[kp] != 0 ): ireac.add(link[kp])
+      l = k + 1
+      kp = kp - 1
+
+    while ( l <= kp ):
+      if ( ibsp[l] > l ):
+        if ( link[l] != 0 ): ireac.add(link[l])
+        l = ibsp[l]
+      l += 1
+
+  for idx in sorted(ireac):
+    rna.LOOP_REAC(idx)
+
+  return ireac
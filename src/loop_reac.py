@@ -42,6 +42,15 @@ History:
 Version     Date            Comment
 --------    -------         --------------------
       09/28/2017      Original Code
+      10/17/2026      Update the cached loop energy (LOOP_ENER)
+      10/17/2026      Beta of the parameter set (RNA%EKERN%BETA)
+      10/17/2026      Nucleation table of the sequence (RNA%PNUC)
+      10/17/2026      DELTAG_* through the memo table (DG_MEMO)
+      10/17/2026      No pairs with nt under a ribosome (RNA%IMASK)
+      10/17/2026      Nucleation rates of large loops from NUC_INDEX
+      10/17/2026      Reaction table of the loop for LOOP_FIRE (LOOP_RX)
+      10/17/2026      Open reactions of the closing helix marked once
+      10/17/2026      NUC_INDEX kept while the loop is unchanged
 
 Dependencies:
 
@@ -51,6 +60,13 @@ Author(s): Alex Reis
 
 import math
 
+from loop_ener import LOOP_ENER
+from ENERGY.dgmemo import MEMO_HE, MEMO_HR, MEMO_HM, MEMO_HD
+from nuc_index import NUC_INDEX, ntidx
+from loop_rx import LOOP_RX
+from ENERGY.deltag_hi import DELTAG_HI
+from rnavar import inuc,iext,iret,imor,idif,iopn,iwc,rateh,ratem,rated
+
 def LOOP_REAC(rna,indx):
 
   # VARIABLES
@@ -61,12 +77,19 @@ def LOOP_REAC(rna,indx):
   # nt,nh,ns,mt,mh,ms,icase
 
   # FLOAT
-  # x,dg,atot,rate
+  # x,dg,atot,rate,beta
 
   i = rna.loop[indx]
   j = rna.ibsp[i]
   n = rna.n
 
+  # 1/RT of the parameter set and nucleation table
+  beta = rna.ekern.beta
+  pnuc = rna.pnuc
+
+  # nt under a ribosome footprint (see LOOP_MASK) cannot pair
+  imask = rna.imask
+
   if ( i == n ): j = 1
 
   nh = rna.nhlx[indx]
@@ -92,6 +115,24 @@ def LOOP_REAC(rna,indx):
 
   atot = 0.0e0
 
+  # Rates and moves in walk order, searched by LOOP_FIRE
+  rx = LOOP_RX()
+  rna.lrx[i] = rx
+
+  # Large loops: nucleation rates of all unpaired nt from the candidate
+  # index, the scan below is skipped
+
+  iscan = ( nt < ntidx )
+
+  if not iscan:
+    nidx = rna.nidx.get(i)
+    if ( nidx is None ) or not nidx.SAME(rna,indx):
+      nidx = NUC_INDEX(rna,indx,ks,ke,nt,iloop)
+      rna.nidx[i] = nidx
+    #endif
+    atot += nidx.RATES(rna)
+  #endif
+
   k = ks
   icnt = 0
 
@@ -99,7 +140,7 @@ def LOOP_REAC(rna,indx):
 
     #=== Nucleation Events ===#
 
-    if ( rna.ibsp[k] == 0 ):
+    if ( rna.ibsp[k] == 0 ) and iscan:
 
       rna.wrk1[k] = 0.0e0
       rna.wrk2[k] = 0.0e0
@@ -107,7 +148,7 @@ def LOOP_REAC(rna,indx):
       x = 0.0e0
 
       l = 2
-      lmx = nt / 2 + 1
+      lmx = nt // 2 + 1
 
       if ( nt % 2 == 0 ) and ( icnt+1 > lmx-1 ):
         lmx -= 1
@@ -115,6 +156,8 @@ def LOOP_REAC(rna,indx):
 
       if ( iloop == 0 ): lmx = nt - icnt
 
+      if ( imask[k] != 0 ): lmx = 0
+
       kp = k + 1
       hs = rna.iseq[k]
 
@@ -124,7 +167,7 @@ def LOOP_REAC(rna,indx):
 
           js = rna.iseq[kp]
 
-          if ( l > 4 and iwc[hs][js] == 1 ):
+          if ( l > 4 and iwc[hs][js] == 1 and imask[kp] == 0 ):
             x += pnuc[l]
           #endif
 
@@ -145,6 +188,11 @@ def LOOP_REAC(rna,indx):
 
     #endif
 
+    if ( rna.ibsp[k] == 0 ):
+      rx.BLOCK(k,icnt)
+      rx.ADD(inuc,k,0,0,rna.wrk1[k])
+    #endif
+
     #=== Helix Events ===#
 
     if ( rna.ibsp[k] > 0 ):
@@ -152,6 +200,8 @@ def LOOP_REAC(rna,indx):
       ip = k
       jp = rna.ibsp[k]
 
+      rx.BLOCK(k,icnt)
+
       rna.wrk1[jp] = 0.0e0
       rna.wrk2[ip] = 0.0e0
 
@@ -166,7 +216,8 @@ def LOOP_REAC(rna,indx):
 
       if ( ip > 1 and jp < n ) and \
          ( nh > 1 or ns > 4 )  and \
-         ( rna.ibsp[ip-1] == 0 and rna.ibsp[jp+1] == 0 ):
+         ( rna.ibsp[ip-1] == 0 and rna.ibsp[jp+1] == 0 ) and \
+         ( imask[ip-1] == 0 and imask[jp+1] == 0 ):
 
         hs = rna.iseq[ip-1]
         js = rna.iseq[jp+1]
@@ -188,7 +239,7 @@ def LOOP_REAC(rna,indx):
 
       if ( icase > 0 ):
 
-        dg = DELTAG_HE(rna,ip,jp)
+        dg = MEMO_HE(rna,ip,jp)
 
         dg = dg / 2.0e0
 
@@ -198,6 +249,8 @@ def LOOP_REAC(rna,indx):
         rna.wrk2[ip] = x
         atot += x
 
+        rx.ADD(iext,ip,jp,0,x)
+
       #endif
 
       icase = 0
@@ -239,14 +292,14 @@ def LOOP_REAC(rna,indx):
 
       if ( icase > 0 ):
 
-        dg = DELTAG_HR(rna,ip,jp)
+        dg = MEMO_HR(rna,ip,jp)
 
         if ( icase != 3 ):
           dg = dg / 2.0e0
         #endif
 
         x = beta * dg
-        x = mat.exp(-x) * rate
+        x = math.exp(-x) * rate
 
         if ( icase == 2 ):
           rna.wrk1[ip] = x
@@ -256,6 +309,8 @@ def LOOP_REAC(rna,indx):
 
         atot += x
 
+        rx.ADD(iret,ip,jp,0,x)
+
       #endif
 
       icase = 0
@@ -285,11 +340,15 @@ def LOOP_REAC(rna,indx):
           icase = 0
         #endif
 
+        if ( imask[ip-1] != 0 or imask[jp+1] != 0 ):
+          icase = 0
+        #endif
+
       #endif
 
       if ( icase > 0 ):
 
-        dg = DELTAG_HM(rna,ip,jp)
+        dg = MEMO_HM(rna,ip,jp)
 
         dg = dg / 2.0e0
 
@@ -298,6 +357,8 @@ def LOOP_REAC(rna,indx):
 
         atot += x
 
+        rx.ADD(imor,ip,jp,0,x)
+
       #endif
 
       #=== Defect Diffusion ===#
@@ -331,14 +392,14 @@ def LOOP_REAC(rna,indx):
 
         kp = ip - 1
 
-        if ( kp >= 1 ) and ( rna.ibsp[kp] == 0 ):
+        if ( kp >= 1 ) and ( rna.ibsp[kp] == 0 and imask[kp] == 0 ):
 
           hs = rna.iseq[kp]
           js = rna.iseq[jp]
 
           if ( iwc[hs][js] == 1 ):
 
-            dg = DELTAG_HD(rna,ip,jp,kp)
+            dg = MEMO_HD(rna,ip,jp,kp)
 
             dg = dg / 2.0e0
 
@@ -347,6 +408,8 @@ def LOOP_REAC(rna,indx):
 
             atot += x
 
+            rx.ADD(idif,ip,jp,kp,x)
+
           #endif
         #endif
 
@@ -354,14 +417,14 @@ def LOOP_REAC(rna,indx):
 
         kp = jp + 1
 
-        if ( kp <= n ) and ( rna.ibsp[kp] == 0 ):
+        if ( kp <= n ) and ( rna.ibsp[kp] == 0 and imask[kp] == 0 ):
 
           hs = rna.iseq[ip]
           js = rna.iseq[kp]
 
           if ( iwc[hs][js] == 1 ):
 
-            dg = DELTAG_HD(rna,ip,jp,kp)
+            dg = MEMO_HD(rna,ip,jp,kp)
 
             dg = dg / 2.0e0
 
@@ -370,6 +433,8 @@ def LOOP_REAC(rna,indx):
 
             atot += x
 
+            rx.ADD(idif,ip,jp,kp,x)
+
           #endif
         #endif
       #endif
@@ -398,14 +463,14 @@ def LOOP_REAC(rna,indx):
 
         kp = ip + 1
 
-        if ( rna.ibsp[kp] == 0 ):
+        if ( rna.ibsp[kp] == 0 and imask[kp] == 0 ):
 
           hs = rna.iseq[kp]
           js = rna.iseq[jp]
 
           if ( iwc[hs][js] == 1 ):
 
-            dg = DELTAG_HD(rna,ip,jp,kp)
+            dg = MEMO_HD(rna,ip,jp,kp)
 
             dg = dg / 2.0e0
 
@@ -414,6 +479,8 @@ def LOOP_REAC(rna,indx):
 
             atot += x
 
+            rx.ADD(idif,ip,jp,kp,x)
+
           #endif
         #endif
 
@@ -421,14 +488,14 @@ def LOOP_REAC(rna,indx):
 
         kp = jp - 1
 
-        if ( rna.ibsp[kp] == 0 ):
+        if ( rna.ibsp[kp] == 0 and imask[kp] == 0 ):
 
           hs = rna.iseq[ip]
           js = rna.iseq[kp]
 
           if ( iwc[hs][js] == 1 ):
 
-            dg = DELTAG_HD(rna,ip,jp,kp)
+            dg = MEMO_HD(rna,ip,jp,kp)
 
             dg = dg / 2.0e0
 
@@ -437,6 +504,8 @@ def LOOP_REAC(rna,indx):
 
             atot += x
 
+            rx.ADD(idif,ip,jp,kp,x)
+
           #endif
         #endif
       #endif
@@ -447,6 +516,9 @@ def LOOP_REAC(rna,indx):
 
       #=== Open Internal Helix BP ===#
 
+      # the last reactions of the table, replaced by HELX_REAC
+      if ( iloop == 1 and k == ke ): rx.OPEN()
+
       if ( rna.link[ip] == 0 ) and \
          ( iloop == 1 and k == ke ):
 
@@ -470,6 +542,8 @@ def LOOP_REAC(rna,indx):
 
           atot += x
 
+          rx.ADD(iopn,hs,js,0,x)
+
           hs += 1
           js -= 1
 
@@ -488,9 +562,12 @@ def LOOP_REAC(rna,indx):
 
   #endwhile
 
-  rna.ptot[indx] = atot
+  # the sum LOOP_FIRE searches
+  rna.ptot[indx] = rx.CLOSE()
 
   rna.LOOP_RESUM(indx)
 
+  LOOP_ENER(rna,indx)
+
   return rna
   
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Class: LOOP_RX
+
+Description: Reaction table of a loop element. Holds the rate and the move
+             descriptor (TYPE,IP,JP,KP) of every reaction of the loop, in
+             the order LOOP_REAC adds them to the loop rate, so that
+             LOOP_FIRE finds the fired reaction by a binary search and
+             applies it without recomputing any energies.
+
+Method: LOOP_REAC walks the loop once and, at every walk position k,
+        starts a block (BLOCK) and adds the reactions of k (ADD):
+
+          unpaired k - nucleation,            (INUC,k,0,0)
+          helix k    - extension,             (IEXT,ip,jp,0)
+                       retraction,            (IRET,ip,jp,0)
+                       morphing,              (IMOR,ip,jp,0)
+                       push and pull moves,   (IDIF,ip,jp,kp)
+                       opening of the pairs   (IOPN,hs,js,0)
+                       inside the closing
+                       helix (from MOPEN)
+
+        CLOSE takes the cumulative sum CUM of the rates. SEARCH finds
+        the first reaction M with CUM(M) >= AMAX by a binary search and
+        returns it with the walk position of its block and the partial
+        sum before it, and LOOP_FIRE applies the move DESC(M).
+
+        The open reactions depend on the closing helix only. LOOP_REAC
+        adds them last, after OPEN marks where they start (MOPEN, -1 for
+        a loop without them), so HELX_REAC replaces exactly that range
+        (TRUNCATE, ADD, CLOSE). EXCLUDE drops a reaction from the table
+        (see SSA_HYBRID%EXIT).
+
+        The table is kept in RNA%LRX under the closing nt of the loop,
+        as NUC_INDEX.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      SEARCH returns the reaction, explicit open range
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+from bisect import bisect_right
+
+import numpy as np
+
+
+class LOOP_RX(object):
+
+    __slots__ = ('rate','desc','mblk','kblk','iblk','mopen','cum')
+
+    def __init__(self):
+
+        self.rate = []
+        self.desc = []
+
+        # First reaction, nt and walk position ICNT of each block
+        self.mblk = []
+        self.kblk = []
+        self.iblk = []
+
+        self.mopen = -1
+        self.cum = None
+
+    def BLOCK(self,k,icnt):
+
+        self.mblk.append(len(self.rate))
+        self.kblk.append(k)
+        self.iblk.append(icnt)
+
+    def ADD(self,ityp,ip,jp,kp,x):
+
+        self.rate.append(x)
+        self.desc.append((ityp,ip,jp,kp))
+
+    def OPEN(self):
+
+        # The reactions added from here on are the open reactions of the
+        # closing helix, the last of the table
+        self.mopen = len(self.rate)
+
+    def TRUNCATE(self):
+
+        # Drops the open reactions, the table ends with the last block
+
+        if ( self.mopen < 0 ):
+            raise Exception('ERROR: Loop table without open reactions.')
+
+        del self.rate[self.mopen:]
+        del self.desc[self.mopen:]
+
+    def CLOSE(self):
+
+        # Returns the loop rate
+
+        if not self.rate:
+            self.cum = np.zeros(0, dtype=np.float64)
+            return 0.0
+
+        self.cum = np.cumsum(self.rate)
+
+        return float(self.cum[-1])
+
+    def SEARCH(self,amax):
+
+        # Fired reaction M, the walk position ICNT of its block and the
+        # partial sum before it
+
+        # INTEGER
+        # m,b
+
+        if ( len(self.rate) == 0 ):
+            raise Exception('ERROR: No reactions in the loop table.')
+
+        # round-off can leave AMAX above the last reaction
+        m = min(int(np.searchsorted(self.cum,amax)),len(self.rate)-1)
+
+        # a zero rate is never fired
+        while ( self.rate[m] <= 0.0 ) and ( m > 0 ):
+            m -= 1
+
+        b = bisect_right(self.mblk,m) - 1
+
+        atot = float(self.cum[m-1]) if ( m > 0 ) else 0.0e0
+
+        return m,self.iblk[b],atot
+
+    def EXCLUDE(self,ityp,ip,jp):
+
+        # Zeroes the rate of move (ITYP,IP,JP), returns the loop rate
+
+        for m,desc in enumerate(self.desc):
+            if ( desc[0] == ityp and desc[1] == ip and desc[2] == jp ):
+                self.rate[m] = 0.0e0
+                break
+
+        return self.CLOSE()
@@ -0,0 +1,345 @@
+"""
+Module: MOVELOG
+
+Description: Binary "move log" of a folding trajectory. Instead of full
+             structures, every SSA event is stored as the move that
+             LOOP_FIRE applied, (DT,TYPE,I,J,K), with a full-structure
+             keyframe every NKEY events so that the structure at any time
+             can be rebuilt by replaying at most NKEY events.
+
+Method: File layout (little endian):
+
+            header   : b'PYFMOVE1' n(int32) nkey(int32)
+            segment  : keyframe time(f8) ibsp(1:n)(int32)
+                       events   nev*(dt(f8) type(u1) i,j,k(int32))
+            index    : isim(int64)  [nseg]
+                       time(f8)     [nseg]
+                       offset(int64)[nseg]
+                       ievent(int64)[nseg]
+            footer   : index offset(int64) nseg(int64) b'PYFMIDX1'
+
+        A segment starts at every BEGIN (new trajectory) and after every
+        NKEY events. MOVE_LOG_READER maps the file with mmap and views the
+        index and event blocks as NumPy arrays without copying, so seeking
+        to a time is a binary search over the keyframe times (O(log n))
+        followed by a replay of at most NKEY events.
+
+        Moves are replayed on the 1-based pair table (IBSP(i) = 0 for a
+        single stranded nt) following the conventions of RNA%MOVE set in
+        LOOP_FIRE. In transcription mode the nucleotide additions of
+        LOOP_GROW are logged as IADD events.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Nucleotide additions (IADD) of transcription
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import mmap
+import struct
+import numpy as np
+
+from rnavar import inuc,iext,iret,imor,idif,iopn,iadd
+
+magic = b'PYFMOVE1'
+imagic = b'PYFMIDX1'
+
+nbuf_default = 1 << 22
+
+hdr = struct.Struct('<8sii')
+ftr = struct.Struct('<qq8s')
+evt = struct.Struct('<dBiii')
+key = struct.Struct('<d')
+
+event_dtype = np.dtype([('dt','<f8'),('type','u1'),
+                        ('i','<i4'),('j','<i4'),('k','<i4')])
+
+assert event_dtype.itemsize == evt.size
+
+
+class MOVE_LOG(object):
+
+    def __init__(self,file,n,nkey=4096,nbuf=nbuf_default):
+
+        self.f = open(file,'wb')
+        self.n = n
+        self.nkey = nkey
+        self.nbuf = nbuf
+        self.buf = bytearray()
+
+        self.isim = 0
+        self.tlast = 0.0
+        self.nev = 0      # events since last keyframe
+        self.ievent = 0   # events in trajectory
+        self.pos = 0      # file position of self.buf[0]
+
+        # Segment index
+        self.sims = []
+        self.times = []
+        self.offsets = []
+        self.ievents = []
+
+        self.PUT(hdr.pack(magic,n,nkey))
+
+    def PUT(self,b):
+
+        self.buf += b
+
+        if ( len(self.buf) >= self.nbuf ):
+            self.FLUSH()
+
+    def BEGIN(self,isim):
+
+        self.isim = isim
+        self.ievent = 0
+
+    def KEYFRAME(self,time,rna):
+
+        n = self.n
+
+        self.sims.append(self.isim)
+        self.times.append(time)
+        self.offsets.append(self.pos + len(self.buf))
+        self.ievents.append(self.ievent)
+
+        self.PUT(key.pack(time))
+        self.PUT(np.asarray(rna.ibsp[1:n+1],dtype='<i4').tobytes())
+
+        self.tlast = time
+        self.nev = 0
+
+    def WRITE(self,time,rna):
+
+        ityp,i,j,k,l = rna.move
+
+        self.PUT(evt.pack(time-self.tlast,ityp,i,j,k))
+
+        self.tlast = time
+        self.nev += 1
+        self.ievent += 1
+
+        if ( self.nev >= self.nkey ):
+            self.KEYFRAME(time,rna)
+
+    def FLUSH(self):
+
+        self.f.write(self.buf)
+        self.pos += len(self.buf)
+        del self.buf[:]
+
+    def CLOSE(self):
+
+        self.FLUSH()
+
+        iindx = self.pos
+
+        self.f.write(np.asarray(self.sims,dtype='<i8').tobytes())
+        self.f.write(np.asarray(self.times,dtype='<f8').tobytes())
+        self.f.write(np.asarray(self.offsets,dtype='<i8').tobytes())
+        self.f.write(np.asarray(self.ievents,dtype='<i8').tobytes())
+        self.f.write(ftr.pack(iindx,len(self.times),imagic))
+
+        self.f.close()
+
+
+def APPLY_MOVE(ibsp,ityp,i,j,k):
+
+    # Apply one logged move to the 1-based pair table IBSP
+
+    if ( ityp == inuc or ityp == iext ):
+
+        ibsp[i] = j
+        ibsp[j] = i
+
+    elif ( ityp == iret or ityp == iopn ):
+
+        ibsp[i] = 0
+        ibsp[j] = 0
+
+    elif ( ityp == imor ):
+
+        # old partners of i and j become single stranded
+        if ( ibsp[i] != 0 ): ibsp[ibsp[i]] = 0
+        if ( ibsp[j] != 0 ): ibsp[ibsp[j]] = 0
+
+        ibsp[i] = j
+        ibsp[j] = i
+
+    elif ( ityp == idif ):
+
+        if ( k == i+1 or k == i-1 ):
+            ibsp[i] = 0
+            ibsp[j] = k
+            ibsp[k] = j
+        else:
+            ibsp[i] = k
+            ibsp[j] = 0
+            ibsp[k] = i
+
+    elif ityp == iadd:
+
+        # nt i added by transcription, single stranded
+        ibsp[i] = 0
+
+    else:
+
+        raise ValueError("Unknown move type {}.".format(ityp))
+
+
+class MOVE_LOG_READER(object):
+
+    def __init__(self,file):
+
+        self.f = open(file,'rb')
+        self.mm = mmap.mmap(self.f.fileno(),0,access=mmap.ACCESS_READ)
+
+        tag,n,nkey = hdr.unpack_from(self.mm,0)
+        if ( tag != magic ):
+            raise ValueError("{} is not a PYFOLD move log.".format(file))
+
+        iindx,nseg,tag = ftr.unpack_from(self.mm,len(self.mm)-ftr.size)
+        if ( tag != imagic ):
+            raise ValueError("{} has no index (log was not closed).".format(file))
+
+        self.n = n
+        self.nkey = nkey
+        self.nseg = nseg
+        self.iindx = iindx
+
+        o = iindx
+        self.sims    = np.frombuffer(self.mm,dtype='<i8',count=nseg,offset=o); o += 8*nseg
+        self.times   = np.frombuffer(self.mm,dtype='<f8',count=nseg,offset=o); o += 8*nseg
+        self.offsets = np.frombuffer(self.mm,dtype='<i8',count=nseg,offset=o); o += 8*nseg
+        self.ievents = np.frombuffer(self.mm,dtype='<i8',count=nseg,offset=o)
+
+        self.nkbytes = key.size + 4*n
+
+    def SEGMENTS(self,isim):
+
+        # Range [s0,s1) of the segments that belong to trajectory isim
+        s0 = int(np.searchsorted(self.sims,isim,'left'))
+        s1 = int(np.searchsorted(self.sims,isim,'right'))
+
+        if ( s0 == s1 ):
+            raise KeyError("Trajectory {} is not in the log.".format(isim))
+
+        return s0,s1
+
+    def KEYFRAME(self,iseg):
+
+        # (time,ibsp) of the keyframe opening segment iseg
+        o = int(self.offsets[iseg])
+
+        ibsp = np.zeros(self.n+1,dtype=np.int32)
+        ibsp[1:] = np.frombuffer(self.mm,dtype='<i4',count=self.n,offset=o+key.size)
+
+        return float(self.times[iseg]),ibsp
+
+    def EVENTS(self,iseg):
+
+        # Zero-copy view of the events of segment iseg
+        o = int(self.offsets[iseg]) + self.nkbytes
+
+        if ( iseg+1 < self.nseg ):
+            oe = int(self.offsets[iseg+1])
+        else:
+            oe = self.iindx
+
+        return np.frombuffer(self.mm,dtype=event_dtype,count=(oe-o)//event_dtype.itemsize,offset=o)
+
+    def STRUCTURE_AT(self,time,isim=1):
+
+        # Structure of trajectory isim at the given time
+
+        s0,s1 = self.SEGMENTS(isim)
+
+        iseg = s0 + int(np.searchsorted(self.times[s0:s1],time,'right')) - 1
+        iseg = max(iseg,s0)
+
+        tk,ibsp = self.KEYFRAME(iseg)
+
+        ev = self.EVENTS(iseg)
+        tev = tk + np.cumsum(ev['dt'])
+        m = int(np.searchsorted(tev,time,'right'))
+
+        for e in ev[:m].tolist():
+            APPLY_MOVE(ibsp,e[1],e[2],e[3],e[4])
+
+        return ibsp
+
+    def REPLAY(self,isim=1,t0=0.0,t1=float('inf')):
+
+        # Generator over the events of trajectory isim with t0 <= time < t1,
+        # yielding (time,type,i,j,k,ibsp) after each move is applied.
+        # The ibsp array is updated in place.
+
+        s0,s1 = self.SEGMENTS(isim)
+
+        iseg = s0 + int(np.searchsorted(self.times[s0:s1],t0,'right')) - 1
+        iseg = max(iseg,s0)
+
+        time,ibsp = self.KEYFRAME(iseg)
+
+        while ( iseg < s1 ):
+
+            for dt,ityp,i,j,k in self.EVENTS(iseg).tolist():
+
+                time += dt
+                APPLY_MOVE(ibsp,ityp,i,j,k)
+
+                if ( time >= t1 ):
+                    return
+                if ( time >= t0 ):
+                    yield time,ityp,i,j,k,ibsp
+
+            iseg += 1
+
+            if ( iseg < s1 ):
+                time = float(self.times[iseg])
+
+    def SAMPLE(self,times,isim=1):
+
+        # Generator over the structures of trajectory isim at the sorted
+        # sample times. Events are only replayed inside the segments that
+        # contain a sample time, the rest of the log is skipped.
+
+        s0,s1 = self.SEGMENTS(isim)
+        tkeys = self.times[s0:s1]
+
+        iseg = -1
+        ibsp = None
+
+        for t in times:
+
+            jseg = s0 + int(np.searchsorted(tkeys,t,'right')) - 1
+            jseg = max(jseg,s0)
+
+            if ( jseg != iseg ):
+                iseg = jseg
+                tk,ibsp = self.KEYFRAME(iseg)
+                ev = self.EVENTS(iseg)
+                tev = tk + np.cumsum(ev['dt'])
+                m0 = 0
+
+            m = int(np.searchsorted(tev,t,'right'))
+
+            for e in ev[m0:m].tolist():
+                APPLY_MOVE(ibsp,e[1],e[2],e[3],e[4])
+
+            m0 = max(m0,m)
+
+            yield t,ibsp
+
+    def CLOSE(self):
+
+        # views into the map must be released before it is closed
+        self.sims = self.times = self.offsets = self.ievents = None
+
+        self.mm.close()
+        self.f.close()
@@ -0,0 +1,327 @@
+"""
+Class: NUC_INDEX (RNA,INDX,KS,KE,NT,ILOOP)
+
+Description: Nucleation candidate index of a loop element. Replaces the
+             pair scans of LOOP_REAC and LOOP_FIRE, which are O(NT**2)
+             per loop, for loops of at least NTIDX positions.
+
+Method: The loop is walked once from KS to KE as in LOOP_REAC. Unpaired
+        nt take one position and helices two, so nt k has the position
+        q(k) = ICNT and the loop distance of a pair k-kp is
+
+            L = q(kp) - q(k) + 1        (mod NT for internal loops)
+
+        The unpaired nt (not under a ribosome) are bucketed by identity,
+        and bucket B holds their positions QB(B) in walk order. A pair
+        k-kp can nucleate when the bases pair (IPAIR), 5 <= L and
+
+            internal loop - L <= NT/2 + 1, less 1 for even NT and
+                            q(k) >= NT/2, so each pair is counted once
+            external loop - kp after k (no wrap)
+
+        and its rate is PNUC(L).
+
+          RATES - The rate of nt k of base A is a sum over the buckets C
+                  that pair with A,
+
+                      WRK1(k) = SUM PNUC(q - q(k) + 1),  q in QB(C)
+
+                  which is a correlation of the indicator of QB(C) with
+                  PNUC. All of them are computed at once by FFT in
+                  O(NT LOG NT), circular of length NT for internal loops
+                  and zero padded to 2 NT for the external loop.
+
+          PICK  - The partners of k of base A are the unpaired nt of
+                  the buckets C that pair with A. Their positions are
+                  merged once per index into one sorted array QA(A), so
+                  the candidates in the window of k are one slice of QA
+                  (two for an internal loop, after the wrap at NT) and
+                  already in walk order. The fired pair is found by a
+                  binary search of the cumulative PNUC weights of the
+                  slice, as the scan of LOOP_FIRE would find it.
+
+        LOOP_REAC is called for every loop that a move splits, merges or
+        resizes, and also for loops next to a changed helix whose own nt
+        did not change. The index is kept in RNA%NIDX under the closing
+        nt of the loop with the loop signature (RNA%LSIG) and the mask of
+        its nt it was built for. SAME tells LOOP_REAC whether the loop
+        still matches, in which case the walk, the FFTs and the merges
+        are skipped and RATES restores the stored rates.
+
+Arguments:
+
+        RNA - Class structure containing information on the
+              RNA secondary structure and possible reactions.
+       INDX - The indx number of the loop element.
+         KS - First nt of the loop walk.
+         KE - Last nt of the loop walk.
+         NT - Positions of the loop, NSGL + 2*NHLX.
+      ILOOP - 1 for an internal loop, 0 for the external loop.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Kept while the loop is unchanged, sorted PICK
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+
+# Loops of at least NTIDX positions are indexed, smaller ones scanned
+ntidx = 40
+
+# Base pairs that can nucleate (A=1,C=2,G=3,U=4), the pairs of IWC
+ipair = ((1,4),(4,1),(2,3),(3,2),(3,4),(4,3))
+
+# Correlations below TOL*MAX(PNUC) are FFT round-off of empty windows
+tol = 1.0e-10
+
+
+class NUC_INDEX(object):
+
+    __slots__ = ('nt','iloop','qb','kb','qof','kss','sig','msk',
+                 'qa','ka','rate','atot')
+
+    def __init__(self,rna,indx,ks,ke,nt,iloop):
+
+        # INTEGER
+        # k,q,b,ks,ke,nt,iloop
+
+        self.nt = nt
+        self.iloop = iloop
+
+        self.sig = rna.lsig[indx]
+
+        # Merged candidates by base and stored rates, set when needed
+        self.qa = {}
+        self.ka = {}
+        self.rate = None
+        self.atot = 0.0
+
+        ibsp = rna.ibsp
+        iseq = rna.iseq
+        imask = rna.imask
+
+        qb = {1: [], 2: [], 3: [], 4: []}
+        kb = {1: [], 2: [], 3: [], 4: []}
+
+        qof = {}
+        kss = []
+
+        #=== Walk the loop ===#
+
+        k = ks
+        q = 0
+
+        while ( k <= ke ):
+
+            if ( ibsp[k] == 0 ):
+
+                kss.append(k)
+
+                if ( imask[k] == 0 ):
+                    b = iseq[k]
+                    qb[b].append(q)
+                    kb[b].append(k)
+                    qof[k] = q
+
+            elif ( k != ke ):
+
+                k = ibsp[k]
+                q += 1
+
+            k += 1
+            q += 1
+
+        self.qb = dict( (b,np.array(qb[b],dtype=np.int64)) for b in qb )
+        self.kb = dict( (b,np.array(kb[b],dtype=np.int64)) for b in kb )
+
+        self.qof = qof
+        self.kss = np.array(kss,dtype=np.int64)
+
+        self.msk = rna.imask[self.kss].copy()
+
+    def SAME(self,rna,indx):
+
+        # True if loop INDX is still the loop the index was built for
+
+        if ( self.sig != rna.lsig[indx] ):
+            return False
+
+        return np.array_equal(rna.imask[self.kss],self.msk)
+
+    def DMAX(self,q):
+
+        # Largest loop distance q(kp) - q(k) of nt k at position q
+
+        nt = self.nt
+
+        if ( self.iloop == 0 ):
+            return nt - 1 - q
+
+        if ( nt % 2 == 0 ) and ( q >= nt//2 ):
+            return nt//2 - 1
+
+        return nt//2
+
+    def RATES(self,rna):
+
+        # Sets WRK1/WRK2 of the unpaired nt of the loop, returns the sum
+
+        # INTEGER
+        # nt,nfft,dmax,h
+
+        # FLOAT
+        # atot
+
+        nt = self.nt
+        wnuc = rna.wnuc
+
+        rna.wrk1[self.kss] = 0.0
+        rna.wrk2[self.kss] = 0.0
+
+        if self.rate is not None:
+            for a,x in self.rate.items():
+                rna.wrk1[self.kb[a]] = x
+            return self.atot
+
+        self.rate = {}
+
+        #=== Kernel PNUC(d+1), 4 <= d <= DMAX ===#
+
+        if ( self.iloop == 1 ):
+            nfft = nt
+            dmax = nt//2
+        else:
+            nfft = 1
+            while ( nfft < 2*nt ):
+                nfft *= 2
+            dmax = nt - 1
+
+        if ( dmax < 4 ):
+            return self.atot
+
+        f = np.zeros(nfft, dtype=np.float64)
+        f[4:dmax+1] = wnuc[5:dmax+2]
+
+        fhat = np.conj(np.fft.rfft(f))
+
+        #=== Correlation with each bucket ===#
+
+        corr = {}
+
+        for c in (1,2,3,4):
+
+            qc = self.qb[c]
+
+            if ( len(qc) == 0 ):
+                continue
+
+            x = np.zeros(nfft, dtype=np.float64)
+            x[qc] = 1.0
+
+            corr[c] = np.fft.irfft(np.fft.rfft(x) * fhat, nfft)[:nt]
+
+        #=== Rates of each nt ===#
+
+        atot = 0.0
+        eps = tol * f.max()
+
+        for a in (1,2,3,4):
+
+            qa = self.qb[a]
+
+            if ( len(qa) == 0 ):
+                continue
+
+            x = np.zeros(len(qa), dtype=np.float64)
+
+            for (b,c) in ipair:
+                if ( b == a ) and ( c in corr ):
+                    x += corr[c][qa]
+
+                    # even internal loops: the pair at NT/2 is counted
+                    # from the first half only
+                    if ( self.iloop == 1 ) and ( nt % 2 == 0 ):
+                        h = nt//2
+                        ix = ( qa >= h )
+                        if np.any(ix):
+                            iq = ( qa[ix] + h ) % nt
+                            x[ix] -= np.isin(iq,self.qb[c]) * f[h]
+
+            x[x < eps] = 0.0
+
+            rna.wrk1[self.kb[a]] = x
+            atot += float(x.sum())
+
+            self.rate[a] = x
+
+        self.atot = atot
+
+        return atot
+
+    def CANDIDATES(self,a):
+
+        # Positions and nt of the partners of base A, in walk order
+
+        # INTEGER
+        # a,b,c
+
+        if a not in self.qa:
+
+            qq = np.concatenate([ self.qb[c] for (b,c) in ipair if b == a ])
+            kk = np.concatenate([ self.kb[c] for (b,c) in ipair if b == a ])
+
+            ix = np.argsort(qq,kind='stable')
+
+            self.qa[a] = qq[ix]
+            self.ka[a] = kk[ix]
+
+        return self.qa[a],self.ka[a]
+
+    def PICK(self,rna,k,amax):
+
+        # Partner kp of the pair nucleated by k at the partial sum AMAX
+
+        # INTEGER
+        # q,nt,dmax,l1,l2,m
+
+        nt = self.nt
+
+        q = self.qof[k]
+
+        qa,ka = self.CANDIDATES(rna.iseq[k])
+
+        dmax = self.DMAX(q)
+
+        #=== Window of k, q+4 <= q' <= q+DMAX ===#
+
+        l1 = int(np.searchsorted(qa,q+4))
+        l2 = int(np.searchsorted(qa,q+dmax,side='right'))
+
+        d = qa[l1:l2] - q
+        kp = ka[l1:l2]
+
+        # internal loops wrap at NT, the wrapped part comes after
+        if ( self.iloop == 1 ) and ( q + dmax >= nt ):
+
+            l1 = int(np.searchsorted(qa,q+4-nt))
+            l2 = int(np.searchsorted(qa,q+dmax-nt,side='right'))
+
+            d = np.concatenate((d,qa[l1:l2] + nt - q))
+            kp = np.concatenate((kp,ka[l1:l2]))
+
+        if ( len(d) == 0 ):
+            raise Exception('ERROR: No nucleation candidate for nt {}'.format(k))
+
+        w = np.cumsum(rna.wnuc[d+1])
+
+        # round-off can leave AMAX above the last candidate
+        m = min(int(np.searchsorted(w,amax)),len(w)-1)
+
+        return int(kp[m])
@@ -0,0 +1,247 @@
+"""
+Class: SSA_PROFILER
+
+Description: Opt-in instrumentation of the SSA hot path. Counts the fired
+             events by reaction type, the calls and cumulative wall time of
+             the DELTAG_* and E* energy functions and of the loop and
+             partial sum routines, and the histogram of the loop sizes NT
+             seen by LOOP_REAC. The totals are exported as JSON.
+
+Method: Nothing is instrumented until ENABLE, so a run without a profiler
+        executes the original functions. ENABLE replaces every module
+        binding of a profiled function (including the names bound by
+        "from X import F") and the profiled PSUM_TREE methods with timing
+        wrappers, and DISABLE puts the originals back.
+
+          LOOP_FIRE - after the move, counts RNA%MOVE(1) as one of the
+                      six reactions of LOOP_REAC (nucleation, extension,
+                      retraction, morphing, diffusion, open).
+          LOOP_GROW - counts an addition (co-transcriptional folding).
+          LOOP_REAC - adds NT = NSGL + 2*NHLX of the loop to the histogram.
+
+        Times are inclusive: ELOOP includes the EHAIR, EBULGE and EDANGLE
+        calls it makes. DELTAG_* are only called on a miss (or a check) of
+        the memo table (see DG_MEMO), so their counts are evaluations.
+        Moves made inside a flicker block of SSA_HYBRID do not go through
+        LOOP_FIRE and are not counted.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: json
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import sys
+import json
+import functools
+import time as timer
+
+from rnavar import inuc,iext,iret,imor,idif,iopn,iadd
+
+import loop_reac
+import helx_reac
+import loop_fire
+import loop_grow
+
+from psum_tree import PSUM_TREE
+
+from ENERGY.deltag_he import DELTAG_HE
+from ENERGY.deltag_hr import DELTAG_HR
+from ENERGY.deltag_hm import DELTAG_HM
+from ENERGY.deltag_hd import DELTAG_HD
+from ENERGY.eloop import ELOOP
+from ENERGY.estack import ESTACK
+from ENERGY.estruc import ESTRUC
+from ENERGY.ehair import EHAIR
+from ENERGY.ebulge import EBULGE
+from ENERGY.edangle import EDANGLE
+
+# Reaction names of the move types
+evnames = {inuc: 'nucleation', iext: 'extension', iret: 'retraction',
+           imor: 'morphing', idif: 'diffusion', iopn: 'open',
+           iadd: 'addition'}
+
+# Energy functions timed wherever they are bound
+efuncs = (DELTAG_HE,DELTAG_HR,DELTAG_HM,DELTAG_HD,
+          ELOOP,ESTACK,ESTRUC,EHAIR,EBULGE,EDANGLE)
+
+# Partial sum table methods timed
+pmethods = ('UPDATE','SEARCH')
+
+
+class SSA_PROFILER(object):
+
+    def __init__(self):
+
+        self.patched = []
+
+        self.nevent = dict( (name,0) for name in evnames.values() )
+        self.ncall = {}
+        self.tcall = {}
+        self.hist = {}
+        self.meta = {}
+
+        self.wall = 0.0
+        self.t0 = None
+
+    def CLEAR(self):
+
+        # In place, the wrappers hold on to the tables
+
+        for name in self.nevent:
+            self.nevent[name] = 0
+        for name in self.ncall:
+            self.ncall[name] = 0
+            self.tcall[name] = 0.0
+
+        self.hist.clear()
+        self.meta.clear()
+
+        self.wall = 0.0
+        if self.t0 is not None:
+            self.t0 = timer.perf_counter()
+
+    #=== Instrumentation ===#
+
+    def ENABLE(self):
+
+        if self.patched:
+            return
+
+        for fn in efuncs:
+            self.PATCH_ALL(fn,self.TIMED(fn.__name__,fn))
+
+        self.PATCH(loop_reac,'LOOP_REAC',self.REAC_WRAP(loop_reac.LOOP_REAC))
+        self.PATCH(helx_reac,'HELX_REAC',self.TIMED('HELX_REAC',helx_reac.HELX_REAC))
+        self.PATCH(loop_fire,'LOOP_FIRE',self.FIRE_WRAP(loop_fire.LOOP_FIRE))
+        self.PATCH(loop_grow,'LOOP_GROW',self.GROW_WRAP(loop_grow.LOOP_GROW))
+
+        for name in pmethods:
+            fn = getattr(PSUM_TREE,name)
+            self.PATCH(PSUM_TREE,name,self.TIMED('PSUM_TREE.'+name,fn))
+
+        self.t0 = timer.perf_counter()
+
+    def DISABLE(self):
+
+        # Originals back in reverse order of patching
+
+        for owner,name,fn in reversed(self.patched):
+            setattr(owner,name,fn)
+
+        self.patched = []
+
+        if self.t0 is not None:
+            self.wall += timer.perf_counter() - self.t0
+            self.t0 = None
+
+    def PATCH(self,owner,name,wrap):
+
+        self.patched.append((owner,name,getattr(owner,name)))
+        setattr(owner,name,wrap)
+
+    def PATCH_ALL(self,fn,wrap):
+
+        # Every module that bound FN under its name, by definition or import
+
+        name = fn.__name__
+
+        for mod in list(sys.modules.values()):
+            if getattr(mod,name,None) is fn:
+                self.PATCH(mod,name,wrap)
+
+    def TIMED(self,name,fn):
+
+        ncall = self.ncall
+        tcall = self.tcall
+
+        # totals carry over from an earlier ENABLE
+        ncall.setdefault(name,0)
+        tcall.setdefault(name,0.0)
+
+        @functools.wraps(fn)
+        def wrap(*args,**kwargs):
+            t0 = timer.perf_counter()
+            out = fn(*args,**kwargs)
+            tcall[name] += timer.perf_counter() - t0
+            ncall[name] += 1
+            return out
+
+        return wrap
+
+    def REAC_WRAP(self,fn):
+
+        timed = self.TIMED('LOOP_REAC',fn)
+        hist = self.hist
+
+        @functools.wraps(fn)
+        def wrap(rna,indx):
+            nt = int(rna.nsgl[indx] + 2 * rna.nhlx[indx])
+            hist[nt] = hist.get(nt,0) + 1
+            return timed(rna,indx)
+
+        return wrap
+
+    def FIRE_WRAP(self,fn):
+
+        timed = self.TIMED('LOOP_FIRE',fn)
+        nevent = self.nevent
+
+        @functools.wraps(fn)
+        def wrap(rna,indx,amax):
+            out = timed(rna,indx,amax)
+            name = evnames.get(rna.move[0])
+            if name is not None:
+                nevent[name] += 1
+            return out
+
+        return wrap
+
+    def GROW_WRAP(self,fn):
+
+        timed = self.TIMED('LOOP_GROW',fn)
+        nevent = self.nevent
+
+        @functools.wraps(fn)
+        def wrap(rna):
+            nevent['addition'] += 1
+            return timed(rna)
+
+        return wrap
+
+    #=== Export ===#
+
+    def REPORT(self):
+
+        out = {}
+        out['meta']   = dict(self.meta)
+        out['wall']   = self.wall
+        out['events'] = dict(self.nevent)
+
+        out['functions'] = {}
+        for name in sorted(self.ncall):
+            ncall = self.ncall[name]
+            tcall = self.tcall[name]
+            out['functions'][name] = {'calls': ncall, 'time': tcall,
+                                      'mean': tcall / ncall if ncall else 0.0}
+
+        # JSON keys are strings, sorted by loop size
+        out['loop_nt'] = dict( (str(nt),self.hist[nt]) for nt in sorted(self.hist) )
+
+        return out
+
+    def JSON(self,fname=None,indent=2):
+
+        text = json.dumps(self.REPORT(),indent=indent,sort_keys=False)
+
+        if fname is not None:
+            with open(fname,'w') as f:
+                f.write(text)
+                f.write('\n')
+
+        return text
@@ -0,0 +1,217 @@
+"""
+Class: PSUM_TREE (LMAX)
+
+Description: Partial sum table of the loop transition rates used by the
+             SSA to draw the loop element of the next reaction.
+
+Method: The leaves PTOT(1..NSUM) hold the total rate of each loop element
+        and the internal nodes are stored in order in PSUM. For NSUM = 8,
+
+                              PSUM(4)
+                      PSUM(2)         PSUM(6)
+                  PSUM(1) PSUM(3) PSUM(5) PSUM(7)
+                  P1  P2  P3  P4  P5  P6  P7  P8
+
+        the node at index i with lowest set bit h covers the leaves
+        (i-h,i+h] and the root is PSUM(NSUM/2). NSUM is the smallest
+        power of 2 >= NL (at least 2).
+
+          UPDATE - sets PTOT(INDX) and resums the path to the root,
+                   O(LOG_2(NSUM)).
+          SEARCH - descends from the root to the leaf INDX whose
+                   prefix sum first exceeds AMAX, O(LOG_2(NSUM)).
+          GROW   - doubles NSUM when NL > NSUM. The old tree becomes the
+                   left subtree of the new root PSUM(NSUM) and the right
+                   subtree only holds empty leaves, so the new root is the
+                   old root and no other node changes, O(1). The storage
+                   itself is doubled when full (amortized O(1)).
+          SHRINK - halves NSUM while NL <= NSUM/2. The right subtree is
+                   empty, so the old root PSUM(NSUM/2) is simply cleared.
+
+        UPDATE is eager. Resumming the leaves changed by an SSA step
+        together, one level at a time, saves the node sums of the shared
+        ancestors, but a step changes 1-2 leaves on average and the
+        bookkeeping costs more than it saves (BENCH/dirty_resum.py).
+
+Arguments:
+
+        LMAX - Initial size of the PSUM and PTOT arrays.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code (from LOOP_RESUM and SSAREACTION)
+            10/17/2026      Batched resums (MARK/FLUSH) with counters
+            10/17/2026      Batched resums removed, UPDATE is eager
+            10/17/2026      SEARCH never descends into an empty subtree
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+
+
+class PSUM_TREE(object):
+
+    __slots__ = ('psum','ptot','nsum','nupdate')
+
+    def __init__(self,lmax=8):
+
+        self.psum = np.zeros(lmax, dtype=np.float64)
+        self.ptot = np.zeros(lmax, dtype=np.float64)
+        self.nsum = 2
+
+        # Resum counter
+        self.nupdate = 0
+
+    def CLEAR(self):
+
+        self.psum[:] = 0.0
+        self.ptot[:] = 0.0
+        self.nsum = 2
+
+    def RESET(self,nl):
+
+        # Size of the table for NL loops, all rates zero
+
+        self.CLEAR()
+        self.RESERVE(self.nsum)
+        self.GROW(nl)
+
+    def RESERVE(self,m):
+
+        # Storage for leaves and nodes up to index m
+
+        lmax = len(self.ptot)
+
+        if ( m < lmax ):
+            return
+
+        while ( lmax <= m ):
+            lmax *= 2
+
+        psum = np.zeros(lmax, dtype=np.float64)
+        ptot = np.zeros(lmax, dtype=np.float64)
+
+        psum[:len(self.psum)] = self.psum
+        ptot[:len(self.ptot)] = self.ptot
+
+        self.psum = psum
+        self.ptot = ptot
+
+    def TOTAL(self):
+
+        return self.psum[self.nsum//2]
+
+    def UPDATE(self,indx,atot=None):
+
+        # INTEGER
+        # i,j,k,nsum
+        # n,n1,n2
+
+        psum = self.psum
+        ptot = self.ptot
+        nsum = self.nsum
+
+        if atot is not None:
+            ptot[indx] = atot
+
+        self.nupdate += 1
+
+        #=== Resum Partial Sum Table ===#
+
+        n = 1
+        n1 = 2
+        n2 = 4
+
+        if ( indx % 2 == 1 ): i = indx
+        if ( indx % 2 == 0 ): i = indx - 1
+
+        psum[i] = ptot[i] + ptot[i+1]
+
+        while ( n1 < nsum ):
+
+            i = (i//n2) * n2 + n1
+
+            j = i - n
+            k = i + n
+
+            psum[i] = psum[j] + psum[k]
+
+            n = n1
+            n1 = n2
+            n2 = 2 * n2
+
+    def SEARCH(self,amax):
+
+        # Returns the leaf INDX and the remainder of AMAX within it
+
+        # INTEGER
+        # i,j,n,indx
+
+        # FLOAT
+        # r,amax
+
+        psum = self.psum
+        ptot = self.ptot
+
+        n = self.nsum//2
+        i = n
+
+        while ( n % 2 == 0 ):
+            n = n//2
+            j = i - n
+            r = psum[j]
+            # round-off can leave AMAX above an empty right subtree
+            if ( r >= amax ) or ( psum[i+n] == 0.0 ):
+                i = j
+            else:
+                i += n
+                amax -= r
+
+        #=== Choose between i and i+1 ===#
+
+        # round-off can leave AMAX above the last non-empty leaf
+        r = ptot[i]
+        if ( r >= amax ) or ( ptot[i+1] == 0.0 ):
+            indx = i
+        else:
+            indx = i + 1
+            amax -= r
+
+        return indx,amax
+
+    def GROW(self,nl):
+
+        # INTEGER
+        # nsum
+
+        nsum = self.nsum
+
+        while ( nl > nsum ):
+
+            self.RESERVE(2*nsum+1)
+
+            # old root is the left child of the new root
+            self.psum[nsum] = self.psum[nsum//2]
+
+            nsum = 2 * nsum
+
+        self.nsum = nsum
+
+    def SHRINK(self,nl):
+
+        # INTEGER
+        # nsum
+
+        nsum = self.nsum
+
+        while ( nsum > 2 ) and ( nl <= nsum//2 ):
+
+            nsum = nsum//2
+            self.psum[nsum] = 0.0e0
+
+        self.nsum = nsum
@@ -8,6 +8,25 @@ History:
 Version     Date            Comment
 --------    -------         --------------------
             09/28/2017      Original Code
+            10/17/2026      Split into PYFOLD_SETUP and PYFOLD_TRAJECTORY
+                            so trajectories can be run by PYFOLD_ENSEMBLE
+            10/17/2026      Optional trajectory sink
+            10/17/2026      Optional move log
+            10/17/2026      Running structure energy, ESTRUC check mode
+            10/17/2026      Energy kernel built once per sequence
+            10/17/2026      Simulation temperature (temp)
+            10/17/2026      Parameters and pnuc can be passed in (FoldingSession)
+            10/17/2026      Co-transcriptional folding (elong,pauses,nstart)
+            10/17/2026      Accelerated helix flicker SSA (hybrid)
+            10/17/2026      O(1) stop structure check, first passage time
+            10/17/2026      Buffered random number streams (rngmode)
+            10/17/2026      Memo table of the DELTAG_* energies (dgmemo)
+            10/17/2026      Opt-in hot path profiler (profile)
+            10/17/2026      Co-translational folding (orf,codon_rates,kinit)
+            10/17/2026      Start/stop structures through DBCONV
+            10/17/2026      Output checkpoints through TOUT_CLOCK
+            10/17/2026      Seed argument, flicker blocks per trajectory
+            10/17/2026      Trajectories with no reaction left end at TMAX
 
 Dependencies:
 
@@ -15,117 +34,355 @@ Author(s): Alex Reis
            Copyright (c) 2017 (Please refer to LICENCE)
 """
 
+import os
 import re
-from rnavar import parameters
-from rnavar import mxnt
+import numpy as np
+from rnavar import mxnt,iwc
+from PARAMS.readpar import readpar
+from ENERGY.ekernel import ENERGY_KERNEL
+from ENERGY.dgmemo import DG_MEMO
 from ssareaction import SSAREACTION
+from tclock import TOUT_CLOCK
 from readdata import READDATA
-
-def PYFOLD(seq,fld_start=None,fld_stop=None,nsim=1,tmax=1.0):
+from setupnuc import SETUPNUC
+from convert import CONVERT
+from dbconv import DB2IBSP
+from class_rnafold import RNA_STRUC
+from transcribe import TRANSCRIPTION
+from translate import TRANSLATION
+from ssa_hybrid import SSA_HYBRID
+from rng import RNG_STREAM
+from profiler import SSA_PROFILER
+
+# Default energy parameter file
+parfile = os.path.join(os.path.dirname(os.path.abspath(__file__)),'PARAMS','rna_turner2004.par')
+
+def PYFOLD_SETUP(seq,fld_start=None,fld_stop=None,echeck=False,params=None,temp=None,pnuc=None,
+                 dgmemo=65536,dgverify=0.0):
 
     # VARIABLES
-    
+
     # STRINGS
     # seq,fld
 
     # ARRAYS
-    # iseq,ibpi,ibpf
+    # ibpi,ibpf
 
     # INTEGERS
-    # i,j,k,n,nn,is,io,isim,nsim,narg,iseed
-
-    # FLOAT
-    # random,tstart,time,tout,tmax,dt
+    # n,nn
 
     # LOGICAL
     # istart,istop
 
-    # DEFAULT SETTINGS
-
-    READDATA()
+    # FLOAT
+    # temp - temperature (K), None for the 37 C tables
+    # pnuc - nucleation table of length >= nn (SETUPNUC), None to compute
+    # dgverify - fraction of DG_MEMO hits recomputed as a check
 
-    parameters.read()
+    # INTEGERS
+    # dgmemo - size of the DELTAG_* memo table, 0 or None for no memo
 
-    rna = RNA_STRUC()
+    # DEFAULT SETTINGS
 
-    tstart = 0.0
-    iseed = 61928712
+    # Pairing and AU penalty tables of RNAVAR, once per process
+    if not iwc:
+        READDATA()
 
-    # Initial and final structure
-    iseq = [0]*mxnt
-    ibpi = [0]*mxnt
-    ibpf = [0]*mxnt
+    if ( params is None ):
+        params = readpar(parfile)
 
-    istart = False
-    istop  = False
+    if ( temp is not None ):
+        params = params.at_temperature(temp)
 
     nn = len(seq)
 
     # Check seq
     assert nn <= mxnt, "Error: Maximum number of nt = {}".format(mxnt)
     assert isinstance(seq,str), "Error: seq must be a string."
+
+    rna = RNA_STRUC(nn)
+
+    # Initial and final structure
+    ibpi = np.zeros(rna.nmax, dtype=np.int32)
+    ibpf = np.zeros(rna.nmax, dtype=np.int32)
+
+    istart = False
+    istop  = False
+
     seq = seq.upper().replace("T","U")
     exp = re.compile('[AGCU]',re.IGNORECASE)
     if exp.match(seq) == None:
         raise ValueError("Invalid letters found in sequence: {}. Only AGCU accepted.".format(seq))
 
-    # Check and process start and stop structures
-    exp = re.compile('[\.\(\)]')
+    # Check and process start and stop structures, 1-based pair tables
+    # of the kinetics core (DB2IBSP raises on anything but balanced .())
     if not fld_start is None:
         assert isinstance(fld_start,str)
-        if exp.match(fld_start) == None:
-            raise ValueError("Invalid letters found in start structure: {}. Only .() accepted.".format(fld_start))
+        if len(fld_start) != nn:
+            raise ValueError("Start structure has {} nt, the sequence {}.".format(len(fld_start),nn))
         istart = True
-        ibpi = V2CT(fld_start,'C',nn)
+        ibpi[:] = DB2IBSP(fld_start,rna.nmax)
 
     if not fld_stop is None:
         assert isinstance(fld_stop,str)
-        if exp.match(fld_stop) == None:
-            raise ValueError("Invalid letters found in stop structure: {}. Only .() accepted.".format(fld_stop))
+        if len(fld_stop) != nn:
+            raise ValueError("Stop structure has {} nt, the sequence {}.".format(len(fld_stop),nn))
         istop = True
-        ibpf = V2CT(fld_stop,'C',nn)
+        ibpf[:] = DB2IBSP(fld_stop,rna.nmax)
 
     # Set up RNA
-    SETUPNUC(nn) #!
+    if ( pnuc is None ):
+        pnuc = SETUPNUC(nn,params.beta)
 
     rna.seq = seq
-    rna.iseq = CONVERT(seq,nn)
-    rna.n = nn
+    rna.iseq[1:nn+1] = CONVERT(seq,rna.iseq,nn)
+
+    # Energy tables of the sequence
+    rna.ekern = ENERGY_KERNEL(params,rna.iseq,nn)
+    rna.pnuc = pnuc
+    rna.wnuc[:] = 0.0
+    rna.wnuc[:min(len(pnuc),rna.nmax)] = pnuc[:rna.nmax]
+
+    # Compare the running energy against ESTRUC after every move
+    rna.echeck = echeck
+
+    # Memo table of the loop energy changes
+    if dgmemo:
+        rna.dgmemo = DG_MEMO(dgmemo,dgverify)
+
+    return rna,ibpi,ibpf,istop
+
+
+def PYFOLD_TRAJECTORY(rna,ibpi,ibpf,istop,rng,tstart=0.0,tmax=1.0,sink=None,mlog=None,tx=None,hybrid=None,
+                      tl=None):
+
+    # VARIABLES
+
+    # INTEGERS
+    # nevent
+
+    # FLOAT
+    # tstart,time,tmax,tnext
+
+    # LOGICAL
+    # istop,ifpt
+
+    # OBJECT
+    # rng - random number stream (RNG_STREAM) of the trajectory
+    # tx - elongation clock (TRANSCRIPTION) or None for a full length RNA
+    # hybrid - accelerated SSA (SSA_HYBRID) or None for the exact SSA
+    # tl - ribosome traffic (TRANSLATION) or None
+
+    clock = TOUT_CLOCK(tmax)
+    time = tstart
+
+    nevent = 0
+    ifpt = False
+
+    rna.ibsp[:] = ibpi
+    rna.imask[:] = 0
+
+    # Co-transcriptional folding starts from the prefix
+    tnext = None
+    if tx is not None:
+        rna.n = tx.nstart
+        tnext = tx.TNEXT(rna.n,tstart)
+
+    rna.LOOP_INIT()
+
+    # Co-translational folding starts without ribosomes
+    if tl is not None:
+        tl.RESET(rng,tstart)
+        tnext = tl.TNEXT()
+
+    # Number of nt that agree with the stop structure
+    rna.MATCH_INIT(ibpf if istop else None)
+
+    if hybrid is not None:
+        hybrid.RESET(rng)
+        nblock = hybrid.nblock
+        nflick = hybrid.nflick
+
+    if mlog is not None:
+        mlog.KEYFRAME(time,rna)
+
+    # Stochastic simulation
+    while time < tmax:
+
+        if hybrid is not None:
+            rna,time = hybrid.STEP(rna,rng,time,clock,sink,mlog,tnext)
+        else:
+            rna,time = SSAREACTION(rna,rng,time,clock,sink,mlog,tnext)
+
+        if ( tnext is not None ) and ( time >= tnext ) and ( tl is not None ):
+
+            # Ribosome loads, advances or leaves
+            nbrk = tl.FIRE(rna,time)
+            tnext = tl.TNEXT()
+
+            if ( mlog is not None ) and ( nbrk > 0 ):
+                mlog.KEYFRAME(time,rna)
+
+        elif ( tnext is not None ) and ( time >= tnext ):
+
+            # Polymerase adds the next nt
+            rna.LOOP_GROW()
+            tnext = tx.TNEXT(rna.n,tstart)
+
+            if mlog is not None:
+                mlog.WRITE(time,rna)
+
+        elif ( time == float('inf') ):
+
+            # No reaction left, the structure is held to TMAX
+            time = tmax
+
+        else:
+            nevent += 1
+
+        # Check for stop structure
+        if istop:
+            if rna.AT_TARGET():
+                ifpt = True
+                break
+
+    # Trajectory summary
+    res = {}
+    res['time']   = time
+    res['energy'] = rna.etot
+    res['fpt']    = ifpt
+    res['tfpt']   = time if ifpt else None
+    res['nevent'] = nevent
+    res['ibsp']   = rna.ibsp[:rna.n+1].copy()
+
+    if hybrid is not None:
+        res['nblock'] = hybrid.nblock - nblock
+        res['nflick'] = hybrid.nflick - nflick
+
+    if tl is not None:
+        res['ribosomes'] = tl.STATS()
+
+    return res
+
+
+def PYFOLD(seq,fld_start=None,fld_stop=None,nsim=1,tmax=1.0,sink=None,mlog=None,echeck=False,temp=None,
+           elong=None,pauses=None,nstart=None,hybrid=None,rngmode=None,
+           dgmemo=65536,dgverify=0.0,profile=None,
+           orf=None,codon_rates=None,kinit=0.1,footprint=30,iseed=61928712):
+
+    # INTEGERS
+    # isim,nsim
+    # iseed - seed of the random number streams of the ensemble
+
+    # FLOAT
+    # tstart,tmax
+    # temp - temperature (K), None for the 37 C tables
+
+    # OBJECT
+    # sink - trajectory sink (TEXT_SINK, BINARY_SINK) or None
+    # mlog - move log (MOVE_LOG) or None
+
+    # LOGICAL
+    # echeck - check the running energy against ESTRUC after every move
+
+    # TRANSCRIPTION
+    # elong  - elongation rate (nt/s), None to fold the full length RNA
+    # pauses - dict {k: dwell time (s)} before nt k is added
+    # nstart - length of the initial transcript (default 10)
+
+    # FLOAT
+    # hybrid - flicker tolerance of SSA_HYBRID, None for the exact SSA
+
+    # STRING
+    # rngmode - 'pcg64' (default), 'philox' or 'legacy' (see RNG)
+
+    # MEMO
+    # dgmemo   - size of the DELTAG_* memo table, 0 or None for no memo
+    # dgverify - fraction of memo hits recomputed as a check
+
+    # TRANSLATION
+    # orf         - (istart,istop) first nt of the start and stop codons for
+    #               co-translational folding, None for no ribosomes; either
+    #               may be None for the first AUG and in frame stop
+    # codon_rates - elongation rate (codons/s), or dict {codon: rate}
+    # kinit       - initiation rate (1/s)
+    # footprint   - nt covered by a ribosome
+
+    # PROFILE
+    # profile - JSON file name or SSA_PROFILER to instrument the run with,
+    #           None for no instrumentation
+
+    if ( elong is not None ) and ( fld_start is not None ):
+        raise ValueError("Co-transcriptional folding starts from an unfolded prefix, fld_start must be None.")
+
+    if ( elong is not None ) and ( orf is not None ):
+        raise ValueError("Co-translational folding needs the full length mRNA, elong must be None.")
+
+    rna,ibpi,ibpf,istop = PYFOLD_SETUP(seq,fld_start,fld_stop,echeck,temp=temp,
+                                       dgmemo=dgmemo,dgverify=dgverify)
+
+    tx = None
+    if elong is not None:
+        tx = TRANSCRIPTION(len(seq),elong,pauses,nstart)
+
+    tl = None
+    if orf is not None:
+        tl = TRANSLATION(seq,orf[0],orf[1],codon_rates,kinit=kinit,footprint=footprint)
+
+    ssa = None
+    if hybrid is not None:
+        ssa = SSA_HYBRID(hybrid)
+
+    tstart = 0.0
+
+    # One stream per trajectory; the legacy stream runs on from one
+    # trajectory to the next as the original RANDOM seed did
+    rng = RNG_STREAM(iseed,rngmode)
+
+    if ( rng.mode == 'legacy' ):
+        streams = [rng]*nsim
+    else:
+        streams = rng.SPAWN(nsim)
+
+    prof = None
+    if profile is not None:
+        prof = profile if isinstance(profile,SSA_PROFILER) else SSA_PROFILER()
+        prof.ENABLE()
 
     # Simulate RNA kinetics
 
-    for isim in range(1,nsim+1):
+    results = []
 
-        io = 1
-        dt = 1.0e-2
+    try:
 
-        tout = dt
-        time = tstart
+        for isim in range(1,nsim+1):
 
-        rna.ibsp = ibpi
+            if sink is not None:
+                sink.BEGIN(isim)
 
-        rna.LOOP_INIT()
+            if mlog is not None:
+                mlog.BEGIN(isim)
 
-        # Stochastic simulation
-        while time < tmax:
+            res = PYFOLD_TRAJECTORY(rna,ibpi,ibpf,istop,streams[isim-1],tstart,tmax,sink,mlog,tx,ssa,tl)
+            res['isim'] = isim
 
-            rna,iseed = SSAREACTION(rna,iseed,time,tout)
+            results.append(res)
 
-            # Increment tout
-            if time > tout:
-                tout = tout + dt
-                io = io + 1
-                if io > 9:
-                    io = 1
-                    dt = dt*10.0
+    finally:
+        if prof is not None:
+            prof.DISABLE()
 
-            # Check for stop structure
-            if istop:
-                if ibpf == rna.ibsp:
+    if prof is not None:
 
-                    # Write or whatever
-                    return 
+        prof.meta.update({'n': len(seq), 'nsim': nsim, 'tmax': tmax, 'temp': temp,
+                          'elong': elong, 'hybrid': hybrid, 'rngmode': rng.mode,
+                          'nevent': sum(res['nevent'] for res in results),
+                          'counters': rna.COUNTERS()})
 
-    return
+        if rna.dgmemo is not None:
+            prof.meta['dgmemo'] = rna.dgmemo.STATS()
 
+        if not isinstance(profile,SSA_PROFILER):
+            prof.JSON(profile)
 
+    return results
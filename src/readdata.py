@@ -3,10 +3,15 @@ Function: READDATA
 
 Description: Reads in the RNA energy data files and sets up some tables.
 
+Method: IWC and EAUP of RNAVAR are filled in place, indexed by the
+        numerical code of RNA%ISEQ (A=1,C=2,G=3,U=4, see CONVERT). Row
+        and column 0 (the padding) are zero.
+
 History:
 Version     Date            Comment
 --------    -------         --------------------
             09/28/2017      Original Code
+            10/17/2026      IWC, EAUP in the ISEQ code, filled in RNAVAR
 
 Dependencies:
 
@@ -23,20 +28,20 @@ def READDATA():
     # INTEGERS
     # i,j,k
 
-    #=== A=0,C=1,G=2,U=3 ===#
+    #=== A=1,C=2,G=3,U=4 ===#
 
-    iwc = [ [0]*4 for _ in range(4) ]
-    iwc[0][3] = 1
-    iwc[3][0] = 1
-    iwc[1][2] = 1
-    iwc[2][1] = 1
+    iwc[:] = [ [0]*5 for _ in range(5) ]
+    iwc[1][4] = 1
+    iwc[4][1] = 1
     iwc[2][3] = 1
     iwc[3][2] = 1
-
-    eaup = [ [0.0e0]*4 for _ in range(4) ]
-    eaup[0][3] = eau
-    eaup[3][0] = eau
-    eaup[2][3] = eau
-    eaup[3][2] = eau
+    iwc[3][4] = 1
+    iwc[4][3] = 1
+
+    eaup[:] = [ [0.0e0]*5 for _ in range(5) ]
+    eaup[1][4] = eau
+    eaup[4][1] = eau
+    eaup[3][4] = eau
+    eaup[4][3] = eau
 
     return
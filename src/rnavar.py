@@ -30,8 +30,8 @@ pnuc = []
 # Variables
 beta = 0.16225023135094183147e1
 
-iwc = [] # 4x4 matrix integer
-eaup = [] # 4x4 matrix real
+iwc = [] # 5x5 matrix integer, ISEQ code
+eaup = [] # 5x5 matrix real, ISEQ code
 
 # Parameters
 gcons = 1.987206e-3
@@ -43,6 +43,15 @@ rated = 5.0e0 # helix diffusion (1/uS)
 
 mxnt = 10000
 
+# Reaction (move) types, see LOOP_REAC
+inuc = 1 # nucleation
+iext = 2 # helix extension
+iret = 3 # helix retraction
+imor = 4 # helix morphing
+idif = 5 # defect diffusion
+iopn = 6 # open internal helix bp
+iadd = 7 # nucleotide added to the 3' end (transcription)
+
 em = 10.10e0
 eh = -0.30e0
 es = -0.30e0
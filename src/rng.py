@@ -0,0 +1,209 @@
+"""
+Module: RNG
+
+Description: Random number streams for the SSA. A stream pre-generates
+             uniforms in blocks into a buffer that SSAREACTION reads
+             directly (RNG%BUF(RNG%POS)), so no function is called per
+             draw and no seed is threaded through return values.
+
+Method: MODE selects the generator of the stream:
+
+          'pcg64'  - NumPy PCG64 (default)
+          'philox' - NumPy Philox (counter based)
+          'legacy' - Park-Miller minimal standard generator of RANDOM.
+                     The block of NBUF states is computed at once as
+
+                         X(k) = A**k * X(0) MOD M,   k = 1,...,NBUF
+
+                     with the powers A**k MOD M precomputed, so the
+                     uniforms X(k)/M are bit for bit those of successive
+                     RANDOM calls (regression mode).
+
+        Uniforms of the NumPy modes are in (0,1], those of the legacy
+        mode in (0,1), so LOG(1/R) is always finite.
+
+        SPAWN(N) returns N independent child streams for parallel
+        trajectories: children of the SeedSequence for the NumPy modes,
+        and seeds jumped ahead by disjoint strides of the period for the
+        legacy mode. SPAWN_SEEDS gives the same seeds without building
+        the streams (they are sent to worker processes).
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            09/28/2017      Original Code (RANDOM)
+            10/17/2026      Buffered streams (RNG_STREAM), renamed from
+                            random.py to stop shadowing the stdlib module
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+
+# Default generator and buffer size
+rngmode = 'pcg64'
+nbuf = 4096
+
+# Park-Miller constants
+a = 16807
+m = 2147483647
+
+
+def RANDOM(iseed):
+
+    # Generates a random number of the interval [0,1] given an integer
+    # seed.
+    #
+    # Efficient Fortran Programming, John Wiley and Sons, New York (1990)
+    # pp. 17-18 Library of Congress code QA76.73.F25 K78
+
+    # INTEGERS
+    # iseed, hi,lo,test,a,m,q,r
+
+    # FLOAT
+    # random
+
+    q = 127773
+    r = 2836
+
+    hi = int(iseed/q)
+    lo = iseed % q
+
+    test = a * lo - r * hi
+
+    if ( test > 0 ):
+        iseed = test
+    else:
+        iseed = test + m
+
+    random = float(iseed) / float(m)
+
+    return random,iseed
+
+
+def SPAWN_SEEDS(iseed,n,mode=None):
+
+    # Seeds of N independent streams from the master seed ISEED
+
+    # INTEGERS
+    # stride,jump,iseed,n
+
+    if mode is None:
+        mode = rngmode
+
+    if ( mode != 'legacy' ):
+        if not isinstance(iseed,np.random.SeedSequence):
+            iseed = np.random.SeedSequence(iseed)
+        return iseed.spawn(n)
+
+    # Jump ahead (k-1)*STRIDE steps of the Park-Miller sequence
+    stride = (m - 1) // max(n,1)
+    jump = pow(a,stride,m)
+
+    seeds = []
+    for k in range(n):
+        seeds.append(iseed)
+        iseed = (iseed * jump) % m
+
+    return seeds
+
+
+class RNG_STREAM(object):
+
+    __slots__ = ('mode','seed','gen','iseed','apow','buf','pos','nbuf')
+
+    def __init__(self,seed=61928712,mode=None,nbuf=nbuf):
+
+        if mode is None:
+            mode = rngmode
+
+        self.mode = mode
+        self.nbuf = nbuf
+
+        self.gen = None
+        self.iseed = None
+        self.apow = None
+
+        if ( mode == 'legacy' ):
+
+            if not ( 0 < seed < m ):
+                raise ValueError("Legacy seed must be in [1,{}], got {}.".format(m-1,seed))
+
+            self.seed = seed
+            self.iseed = int(seed)
+
+            # A**k MOD M, k = 1,...,NBUF
+            apow = np.empty(nbuf,dtype=np.int64)
+            x = 1
+            for k in range(nbuf):
+                x = (x * a) % m
+                apow[k] = x
+            self.apow = apow
+
+        elif ( mode == 'pcg64' ) or ( mode == 'philox' ):
+
+            if not isinstance(seed,np.random.SeedSequence):
+                seed = np.random.SeedSequence(seed)
+
+            self.seed = seed
+
+            if ( mode == 'pcg64' ):
+                self.gen = np.random.Generator(np.random.PCG64(seed))
+            else:
+                self.gen = np.random.Generator(np.random.Philox(seed))
+
+        else:
+            raise ValueError("Unknown generator {}, use 'pcg64', 'philox' or 'legacy'.".format(mode))
+
+        self.buf = []
+        self.pos = 0
+
+        self.FILL()
+
+    def FILL(self):
+
+        # Next block of NBUF uniforms, POS back to 0
+
+        if ( self.mode == 'legacy' ):
+            x = (self.iseed * self.apow) % m
+            self.iseed = int(x[-1])
+            self.buf = (x / float(m)).tolist()
+        else:
+            self.buf = (1.0 - self.gen.random(self.nbuf)).tolist()
+
+        self.pos = 0
+
+    def UNIFORM(self):
+
+        # Single draw, for code off the hot path
+
+        k = self.pos
+
+        if ( k == self.nbuf ):
+            self.FILL()
+            k = 0
+
+        self.pos = k + 1
+
+        return self.buf[k]
+
+    def GENERATOR(self):
+
+        # NumPy Generator for non-uniform draws (gamma, geometric, ...)
+
+        if self.gen is not None:
+            return self.gen
+
+        return np.random.default_rng(self.iseed)
+
+    def SPAWN(self,n):
+
+        if ( self.mode == 'legacy' ):
+            seeds = SPAWN_SEEDS(self.seed,n,'legacy')
+        else:
+            seeds = self.seed.spawn(n)
+
+        return [ RNG_STREAM(s,self.mode,self.nbuf) for s in seeds ]
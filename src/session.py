@@ -0,0 +1,180 @@
+"""
+Module: SESSION
+
+Description: Batch folding API for scoring many sequences with the same
+             energy parameters. A FoldingSession reads the parameters and
+             builds the nucleation table once, and simulate_many streams
+             the trajectories of each sequence back as soon as that
+             sequence finishes.
+
+Method: READDATA/readpar are called once per session (once per worker
+        process when a pool is used) and the parameter set is passed to
+        PYFOLD_SETUP for every sequence.
+
+        PNUC(i) from SETUPNUC only depends on the loop size i, so the
+        table computed for the longest sequence seen so far is valid for
+        every shorter sequence. It is only recomputed when a longer
+        sequence arrives.
+
+        With NPROC > 1 the sequences are run on a process pool. At most
+        NWINDOW sequences are in flight, so batches of many thousands of
+        designs are streamed without queueing them all at once. Results
+        are yielded in completion order and carry the position of the
+        sequence in the input.
+
+Arguments:
+
+      PARAMFILE - Energy parameter file (default rna_turner2004.par).
+           TEMP - Temperature (K), None for the 37 C parameters.
+        RNGMODE - Random number generator, see RNG (default 'pcg64').
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Per-trajectory RNG streams (RNGMODE)
+
+Dependencies: concurrent.futures
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from readdata import READDATA
+from setupnuc import SETUPNUC
+from PARAMS.readpar import readpar
+from pyfold import parfile, PYFOLD_SETUP, PYFOLD_TRAJECTORY
+from ensemble import ENSEMBLE_SEEDS
+from rng import RNG_STREAM
+
+# Session of a pool worker, see SESSION_INIT
+worker = None
+
+
+class FoldingSession(object):
+
+    def __init__(self,paramfile=None,temp=None,rngmode=None):
+
+        if paramfile is None:
+            paramfile = parfile
+
+        self.paramfile = paramfile
+        self.temp = temp
+        self.rngmode = rngmode
+
+        READDATA()
+
+        params = readpar(paramfile)
+
+        if temp is not None:
+            params = params.at_temperature(temp)
+
+        self.params = params
+
+        # Nucleation table of the longest sequence seen
+        self.pnuc = []
+
+    def PNUC(self,n):
+
+        if len(self.pnuc) < n:
+            self.pnuc = SETUPNUC(n,self.params.beta)
+
+        return self.pnuc
+
+    def simulate(self,seq,fld_start=None,fld_stop=None,nsim=1,tmax=1.0,
+                 iseed=61928712):
+
+        # All trajectories of one sequence, seeded as in PYFOLD_ENSEMBLE
+
+        rna,ibpi,ibpf,istop = PYFOLD_SETUP(seq,fld_start,fld_stop,
+                                           params=self.params,
+                                           pnuc=self.PNUC(len(seq)))
+
+        seeds = ENSEMBLE_SEEDS(iseed,nsim,self.rngmode)
+
+        results = []
+
+        for isim in range(1,nsim+1):
+            res = PYFOLD_TRAJECTORY(rna,ibpi,ibpf,istop,RNG_STREAM(seeds[isim-1],self.rngmode),
+                                    0.0,tmax)
+            res['isim'] = isim
+            results.append(res)
+
+        return results
+
+    def simulate_many(self,seqs,nsim=1,tmax=1.0,iseed=61928712,
+                      nproc=1,nwindow=None):
+
+        # Generator over (indx,seq,results) for every entry of seqs, an
+        # entry is a sequence or a (seq,fld_start,fld_stop) tuple
+
+        #=== Serial run ===#
+
+        if nproc == 1:
+
+            for indx,item in enumerate(seqs):
+                seq,fld_start,fld_stop = SESSION_ITEM(item)
+                yield indx,seq,self.simulate(seq,fld_start,fld_stop,nsim,tmax,iseed)
+
+            return
+
+        #=== Pool run ===#
+
+        if nproc is None:
+            nproc = os.cpu_count() or 1
+
+        if nwindow is None:
+            nwindow = 4 * nproc
+
+        items = enumerate(seqs)
+
+        with ProcessPoolExecutor(max_workers=nproc,initializer=SESSION_INIT,
+                                 initargs=(self.paramfile,self.temp,self.rngmode)) as pool:
+
+            pending = set()
+
+            while True:
+
+                # keep the window full
+                for indx,item in items:
+                    seq,fld_start,fld_stop = SESSION_ITEM(item)
+                    pending.add(pool.submit(SESSION_TASK,indx,seq,fld_start,
+                                            fld_stop,nsim,tmax,iseed))
+                    if len(pending) >= nwindow:
+                        break
+
+                if not pending:
+                    break
+
+                done,pending = wait(pending,return_when=FIRST_COMPLETED)
+
+                for f in done:
+                    yield f.result()
+
+
+def SESSION_ITEM(item):
+
+    if isinstance(item,str):
+        return item,None,None
+
+    seq = item[0]
+    fld_start = item[1] if len(item) > 1 else None
+    fld_stop  = item[2] if len(item) > 2 else None
+
+    return seq,fld_start,fld_stop
+
+
+def SESSION_INIT(paramfile,temp,rngmode):
+
+    # Every worker loads the parameters once
+
+    global worker
+    worker = FoldingSession(paramfile,temp,rngmode)
+
+
+def SESSION_TASK(indx,seq,fld_start,fld_stop,nsim,tmax,iseed):
+
+    return indx,seq,worker.simulate(seq,fld_start,fld_stop,nsim,tmax,iseed)
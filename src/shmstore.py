@@ -0,0 +1,258 @@
+"""
+Module: SHMSTORE
+
+Description: Ensemble result store in shared memory. The worker processes
+             of PYFOLD_ENSEMBLE write the structures, times and energies
+             of their trajectories straight into preallocated arrays, and
+             the parent reads them as NumPy views of the same memory, so
+             no structure is pickled between processes.
+
+Method: One multiprocessing.shared_memory block holds, for NSIM
+        trajectories of N nt and NCHECK checkpoints,
+
+            TIME(NSIM,NCHECK)      f8  - time of each record (uS)
+            ENERGY(NSIM,NCHECK)    f8  - energy of each record
+            IBSP(NSIM,NCHECK,N)    i2  - pair table IBSP(1..N) of each record
+            NREC(NSIM)             i4  - checkpoints written
+            FINAL(NSIM,N)          i2  - final structure
+            TFIN,EFIN(NSIM)        f8  - final time and energy
+            TFPT(NSIM)             f8  - first passage time (NaN if none)
+            NEVENT(NSIM)           i8  - SSA events
+            DONE(NSIM)             i1  - 1 once the trajectory is stored
+
+        Trajectory ISIM owns row ISIM-1 of every array, so workers never
+        write the same memory. The parent creates the store and passes
+        SPEC() to the workers, which attach with SHM_ATTACH. SHM_SINK is
+        a trajectory sink (see TRAJECTORY) filling the rows of the store
+        at the TOUT checkpoints of PYFOLD: record K of a row is checkpoint
+        K (see TCLOCK), of which NCHECK(TMAX) fit in a run of TMAX.
+        Records past NCHECK are counted in NREC but dropped.
+
+        The views share the memory of the block. Copy what must outlive
+        the store before CLOSE, and UNLINK it in the parent once done.
+
+Arguments:
+
+         NSIM - Number of trajectories.
+            N - Length of the RNA (at most 32767 for int16 pair tables).
+       NCHECK - Records kept per trajectory.
+         NAME - Name of an existing block to attach to (optional).
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Records by checkpoint index, NCHECK from TCLOCK
+
+Dependencies: numpy, multiprocessing.shared_memory
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from tclock import ICHECK, NCHECK
+
+# Largest pair table entry of an int16 row
+nmax16 = np.iinfo(np.int16).max
+
+
+def SHM_ATTACH(spec):
+
+    # Store of the block described by SPEC (see SHM_STORE%SPEC)
+
+    name,nsim,n,ncheck = spec
+
+    return SHM_STORE(nsim,n,ncheck,name)
+
+
+class SHM_STORE(object):
+
+    def __init__(self,nsim,n,ncheck,name=None):
+
+        if ( n < 1 ) or ( n > nmax16 ):
+            raise ValueError("Shared store needs 1 <= n <= {}, got {}.".format(nmax16,n))
+
+        if ( nsim < 1 ) or ( ncheck < 1 ):
+            raise ValueError("Shared store needs nsim, ncheck >= 1, got {}, {}.".format(nsim,ncheck))
+
+        self.nsim = nsim
+        self.n = n
+        self.ncheck = ncheck
+
+        #=== Layout of the block, 8 byte aligned ===#
+
+        self.layout = []
+
+        nbyte = 0
+        for key,shape,dtype in (('time',   (nsim,ncheck),   np.float64),
+                                ('energy', (nsim,ncheck),   np.float64),
+                                ('tfin',   (nsim,),         np.float64),
+                                ('efin',   (nsim,),         np.float64),
+                                ('tfpt',   (nsim,),         np.float64),
+                                ('nevent', (nsim,),         np.int64),
+                                ('nrec',   (nsim,),         np.int32),
+                                ('done',   (nsim,),         np.int8),
+                                ('ibsp',   (nsim,ncheck,n), np.int16),
+                                ('final',  (nsim,n),        np.int16)):
+
+            self.layout.append((key,shape,dtype,nbyte))
+
+            size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            nbyte += (size + 7) // 8 * 8
+
+        self.nbyte = nbyte
+
+        #=== Create or attach ===#
+
+        self.owner = name is None
+
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True,size=nbyte)
+        else:
+            try:
+                # the creator alone unlinks the block
+                self.shm = shared_memory.SharedMemory(name=name,track=False)
+            except TypeError:
+                self.shm = shared_memory.SharedMemory(name=name)
+
+        if ( self.shm.size < nbyte ):
+            raise ValueError("Shared block {} holds {} bytes, the store needs {}.".format(
+                             self.shm.name,self.shm.size,nbyte))
+
+        self.VIEWS()
+
+        if self.owner:
+            self.CLEAR()
+
+    def VIEWS(self):
+
+        # NumPy views of the block, no copies
+
+        buf = self.shm.buf
+
+        for key,shape,dtype,offset in self.layout:
+            setattr(self,key,np.ndarray(shape,dtype=dtype,buffer=buf,offset=offset))
+
+    def CLEAR(self):
+
+        self.time[:] = 0.0
+        self.energy[:] = 0.0
+        self.tfin[:] = 0.0
+        self.efin[:] = 0.0
+        self.tfpt[:] = np.nan
+        self.nevent[:] = 0
+        self.nrec[:] = 0
+        self.done[:] = 0
+        self.ibsp[:] = 0
+        self.final[:] = 0
+
+    def SPEC(self):
+
+        # Picklable description for SHM_ATTACH in a worker
+        return (self.shm.name,self.nsim,self.n,self.ncheck)
+
+    #=== Writers, row ISIM-1 ===#
+
+    def BEGIN(self,isim):
+
+        m = isim - 1
+
+        self.nrec[m] = 0
+        self.done[m] = 0
+        self.tfpt[m] = np.nan
+
+    def RECORD(self,isim,time,rna):
+
+        # Stores the current structure of RNA as the record of ISIM at
+        # checkpoint TIME
+
+        m = isim - 1
+        k = ICHECK(time)
+
+        self.nrec[m] = max(self.nrec[m],k+1)
+
+        if ( k >= self.ncheck ):
+            return
+
+        n = rna.n
+
+        self.time[m,k] = time
+        self.energy[m,k] = rna.etot
+
+        self.ibsp[m,k,:n] = rna.ibsp[1:n+1]
+        self.ibsp[m,k,n:] = 0
+
+    def PUT(self,isim,res):
+
+        # Final state of trajectory ISIM from the PYFOLD_TRAJECTORY summary
+
+        m = isim - 1
+
+        ibsp = res['ibsp']
+        n = len(ibsp) - 1
+
+        self.final[m,:n] = ibsp[1:]
+        self.final[m,n:] = 0
+
+        self.tfin[m] = res['time']
+        self.efin[m] = res['energy']
+        self.tfpt[m] = res['tfpt'] if res['fpt'] else np.nan
+        self.nevent[m] = res['nevent']
+
+        self.done[m] = 1
+
+    #=== Readers ===#
+
+    def RECORDS(self,isim):
+
+        # (TIME,ENERGY,IBSP) views of the records kept for ISIM
+
+        m = isim - 1
+        k = min(int(self.nrec[m]),self.ncheck)
+
+        return self.time[m,:k],self.energy[m,:k],self.ibsp[m,:k]
+
+    def CLOSE(self):
+
+        # Drops the views (the block cannot close while they are exported)
+
+        for key,shape,dtype,offset in self.layout:
+            setattr(self,key,None)
+
+        self.shm.close()
+
+    def UNLINK(self):
+
+        # Frees the block, by the process that created it
+
+        self.CLOSE()
+
+        if self.owner:
+            self.shm.unlink()
+
+
+class SHM_SINK(object):
+
+    # Trajectory sink writing the TOUT records into an SHM_STORE
+
+    def __init__(self,store):
+
+        self.store = store
+        self.isim = 0
+
+    def BEGIN(self,isim):
+
+        self.isim = isim
+        self.store.BEGIN(isim)
+
+    def WRITE(self,time,rna):
+
+        self.store.RECORD(self.isim,time,rna)
+
+    def CLOSE(self):
+
+        pass
@@ -0,0 +1,286 @@
+"""
+Class: SSA_HYBRID (TOL)
+
+Description: Accelerated SSA for long (second scale) trajectories. Fast,
+             reversible fraying of helix ends (IEXT/IRET at RATEH) is not
+             fired one event at a time: the flicker between the two
+             structures is sampled as a single block and only the move
+             that leaves the pair is fired explicitly.
+
+Method: After SSAREACTION fires a helix extension or retraction S -> S'
+        that keeps the helix (same number of loops), the pair {S,S'} is a
+        two state subsystem. With
+
+            A   = total rate of S,   AF = rate of S -> S'
+            A'  = total rate of S',  AR = rate of S' -> S
+
+        the chain leaves S' for S with probability Q2 = AR/A' and returns
+        from S with probability Q1 = AF/A. The extension/retraction rates
+        are RATEH*EXP(-BETA*DG/2), so AF and AR follow from the energies
+        of S and S' (RNA%ETOT). AR is checked against the rate stored in
+        the work arrays; if they differ the step is left to the exact SSA.
+
+        When the escape probability per cycle 1 - Q1*Q2 is below TOL the
+        block is sampled exactly:
+
+            K      ~ Geometric(1-Q1*Q2)  number of S'->S->S' cycles
+            exit   from S' with probability (1-Q2)/(1-Q1*Q2), else from S
+            TAU    = GAMMA(K+1,1/A') + GAMMA(K+X,1/A),  X = 1 if exit from S
+
+        and the exit move is drawn from the exit state with the flicker
+        move excluded (its work array entry and loop rate are zeroed for
+        the draw). An exit from S first restores S by firing the flicker
+        move with LOOP_MOVE, which only updates the loops it changes.
+
+        TOL is the error/speed knob: the block itself is exact, but it is
+        only worth its bookkeeping when many cycles are expected (1/TOL
+        on average). Structures written to the sink at TOUT inside a block
+        and the state at a TNEXT inside a block (which is drawn from the
+        time fractions of S and S') are the only partial equilibrium
+        approximations.
+
+Arguments:
+
+        TOL - Largest escape probability per flicker cycle that is
+              aggregated (default 0.05, 0 disables aggregation).
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Exclude the end from the loop table (LOOP_RX)
+            10/17/2026      Checkpoints inside a block through TOUT_CLOCK
+            10/17/2026      Incremental return to S (LOOP_MOVE)
+            10/17/2026      Eager rate updates, no FLUSH
+
+Dependencies:
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import math
+
+from rnavar import rateh, iext, iret
+from ssareaction import SSAREACTION
+from loop_ener import CHECK_ENERGY
+from loop_move import LOOP_MOVE
+
+# Relative mismatch allowed between the model and stored flicker rates
+rtol = 1.0e-6
+
+
+def END_SLOT(rna,ityp,ip,jp):
+
+    # Loop and work array entry of the extension (IEXT) or retraction
+    # (IRET) of the helix end (ip,jp), see LOOP_REAC. The end faces the
+    # loop RNA%LINK(jp).
+
+    if ( ityp == iext ):
+        return rna.link[jp],rna.wrk2,ip
+
+    if ( ip > jp ):
+        return rna.link[jp],rna.wrk1,ip
+
+    return rna.link[jp],rna.wrk1,jp
+
+
+class SSA_HYBRID(object):
+
+    def __init__(self,tol=0.05):
+
+        if ( tol < 0.0 ) or ( tol >= 1.0 ):
+            raise ValueError("Hybrid tolerance must be in [0,1), got {}.".format(tol))
+
+        self.tol = tol
+        self.rng = None
+
+        # Blocks sampled, flicker events they replaced, SSA steps
+        self.nblock = 0
+        self.nflick = 0
+        self.nstep  = 0
+
+    def RESET(self,rng):
+
+        # Block sampling stream of one trajectory
+        self.rng = rng.GENERATOR()
+
+    def STEP(self,rna,rng,time,clock,sink=None,mlog=None,tnext=None):
+
+        # One SSAREACTION step, followed by a flicker block if the move
+        # fired starts one
+
+        # FLOAT
+        # atot,etot
+
+        # INTEGER
+        # nl
+
+        if self.rng is None:
+            self.RESET(rng)
+
+        atot = rna.ptree.TOTAL()
+        etot = rna.etot
+        nl = rna.nl
+
+        rna.move = (0,0,0,0,0)
+
+        rna,time = SSAREACTION(rna,rng,time,clock,sink,mlog,tnext)
+
+        self.nstep += 1
+
+        if ( self.tol > 0.0 ) and ( rna.nl == nl ) and \
+           ( rna.move[0] == iext or rna.move[0] == iret ):
+            time = self.FLICKER(rna,rng,time,clock,sink,mlog,tnext,atot,etot)
+
+        return rna,time
+
+    def FLICKER(self,rna,rng,time,clock,sink,mlog,tnext,atot,etot):
+
+        # INTEGER
+        # ityp,ip,jp,ncyc,indx,k
+
+        # FLOAT
+        # de,af,ar,a2,q1,q2,c,tau,beta
+
+        # LOGICAL
+        # iexit
+
+        ityp,ip,jp = rna.move[:3]
+
+        beta = rna.ekern.beta
+
+        #=== Helix ends of S' (end1) and S (end0) ===#
+
+        if ( ityp == iext ):
+            end1 = (iret,ip,jp)
+            end0 = (iext,ip+1,jp-1)
+        else:
+            if ( rna.ibsp[ip+1] != jp-1 ):
+                return time
+            end1 = (iext,ip+1,jp-1)
+            end0 = (iret,ip,jp)
+
+        indx,arr,k = END_SLOT(rna,*end1)
+
+        if ( indx == 0 ):
+            return time
+
+        #=== Flicker rates ===#
+
+        de = rna.etot - etot
+
+        af = rateh * math.exp(-0.5*beta*de)
+        ar = rateh * math.exp( 0.5*beta*de)
+
+        a2 = rna.ptree.TOTAL()
+
+        if ( abs(arr[k] - ar) > rtol*ar ) or ( af > atot ) or ( ar > a2 ):
+            return time
+
+        q1 = af / atot
+        q2 = ar / a2
+        c = q1 * q2
+
+        if ( 1.0 - c > self.tol ) or ( c >= 1.0 ):
+            return time
+
+        #=== Sample the block ===#
+
+        gen = self.rng
+
+        ncyc = int(gen.geometric(1.0 - c)) - 1
+
+        iexit = ( gen.random() * (1.0 - c) >= (1.0 - q2) )
+
+        tau = gen.gamma(ncyc+1,1.0/a2)
+        if ( ncyc + int(iexit) > 0 ):
+            tau += gen.gamma(ncyc+int(iexit),1.0/atot)
+
+        self.nblock += 1
+        self.nflick += 2*ncyc + int(iexit)
+
+        #=== Scheduled event inside the block ===#
+
+        if ( tnext is not None ) and ( time + tau > tnext ):
+
+            # state at tnext from the time fractions of S and S'
+            if ( gen.random() * (atot + a2) < a2 ):
+                self.BACK(rna,end1,tnext,mlog)
+
+            clock.CROSS(tnext,rna,sink)
+
+            return tnext
+
+        time += tau
+
+        clock.CROSS(time,rna,sink)
+
+        #=== Leave the pair ===#
+
+        if ( iexit ):
+            self.BACK(rna,end1,time,mlog)
+            self.EXIT(rna,rng,end0)
+        else:
+            self.EXIT(rna,rng,end1)
+
+        if ( mlog is not None ):
+            mlog.WRITE(time,rna)
+
+        if ( rna.echeck ):
+            CHECK_ENERGY(rna)
+
+        return time
+
+    def BACK(self,rna,end,time,mlog):
+
+        # Fires the flicker move END of the current structure by hand
+
+        # INTEGER
+        # ityp,ip,jp,indx
+
+        ityp,ip,jp = end
+
+        indx = END_SLOT(rna,ityp,ip,jp)[0]
+
+        if ( ityp == iret ):
+            LOOP_MOVE(rna,indx,((min(ip,jp),max(ip,jp)),),())
+        else:
+            ip -= 1
+            jp += 1
+            LOOP_MOVE(rna,indx,(),((min(ip,jp),max(ip,jp)),))
+
+        rna.move = (ityp,ip,jp,0,0)
+        rna.MATCH_MOVE()
+
+        if ( mlog is not None ):
+            mlog.WRITE(time,rna)
+
+    def EXIT(self,rna,rng,end):
+
+        # Fires a move of the current structure other than the flicker
+        # move END
+
+        # INTEGER
+        # indx,jndx,k,ip,jp
+
+        # FLOAT
+        # amax
+
+        ityp,ip,jp = end
+
+        indx,arr,k = END_SLOT(rna,ityp,ip,jp)
+
+        # LOOP_FIRE searches the loop table, the move is removed from it
+        rna.ptree.UPDATE(indx,rna.lrx[rna.loop[indx]].EXCLUDE(ityp,ip,jp))
+        arr[k] = 0.0e0
+
+        amax = rng.UNIFORM() * rna.ptree.TOTAL()
+
+        jndx,amax = rna.ptree.SEARCH(amax)
+
+        rna.LOOP_FIRE(jndx,amax)
+
+        # Restore the excluded rate if the end survived the move
+        if ( rna.ibsp[ip] == jp ) and ( rna.link[jp] != 0 ):
+            rna.LOOP_REAC(rna.link[jp])
@@ -1,5 +1,5 @@
 """
-Subroutine: SSAREACTION (RNA,ISEED,TIME,TOUT)
+Subroutine: SSAREACTION (RNA,RNG,TIME,CLOCK,SINK,MLOG,TNEXT)
 
 Description: Calculates an RNA folding reaction to fire based on the
              (S)tochastic (S)imulation (A)lgorithm of Gillespie.
@@ -11,14 +11,34 @@ Arguments:
 
     RNA     - Class structure containing information on the
                 RNA secondary structure and possible reactions.
-    ISEED   - Integer seed for the random number generator.
+    RNG     - Random number stream (RNG_STREAM), read in place.
     TIME    - Current Time
-    TOUT    - Time to write next trajectory output.
+    CLOCK   - Output checkpoints (TOUT_CLOCK) of the trajectory.
+    SINK    - Trajectory sink (see TRAJECTORY) receiving the structure
+                at every checkpoint TOUT the step passes, or None.
+    MLOG    - Move log (see MOVELOG) receiving every fired move, or None.
+    TNEXT   - Time of the next scheduled (non-SSA) event, e.g. the next
+                nucleotide addition of TRANSCRIBE, or None. If the next
+                reaction would fall after TNEXT, TIME is advanced to TNEXT
+                and no reaction is fired.
+
+With no reaction left (total rate 0) and no scheduled event, TIME is
+returned infinite after the remaining checkpoints are written, and no
+reaction is fired.
 
 History:
 Version     Date            Comment
 --------    -------         --------------------
             09/28/2017      Original Code
+            10/17/2026      Trajectory output through SINK
+            10/17/2026      Move log through MLOG
+            10/17/2026      Scheduled events through TNEXT
+            10/17/2026      Loop search with PSUM_TREE
+            10/17/2026      Buffered random number stream (RNG)
+            10/17/2026      Flush deferred rate updates before the draw
+            10/17/2026      Every checkpoint passed is written (TOUT_CLOCK)
+            10/17/2026      No reaction fired with a zero total rate
+            10/17/2026      No deferred rate updates to flush
 
 Dependencies:
 
@@ -29,10 +49,10 @@ Author(s): Alex Reis
 import math
 
 from rnavar import mxnt
-from random import RANDOM
+from loop_ener import CHECK_ENERGY
 
 
-def SSAREACTION(rna,iseed,time,tout):
+def SSAREACTION(rna,rng,time,clock,sink=None,mlog=None,tnext=None):
 
     # VARIABLES
 
@@ -40,61 +60,70 @@ def SSAREACTION(rna,iseed,time,tout):
     # e
 
     # INTEGER
-    # i,j,k,n
-    # n1,n2,indx
+    # indx,k
 
     # STRING
     # fld(mxnt)
 
     # FLOAT
     # r,tau,random
-    # atot,amax
+    # atot,amax,tnext
+
+    # LOGICAL
+    # iskip
 
 
     #=== Total transition rate ===#
-    n = rna.nsum / 2
-    atot = rna.psum[n]
+    atot = rna.ptree.TOTAL()
 
     #=== Compute time increment ===#
-    r,iseed = RANDOM(iseed)
-
-    tau = math.log(1.0/r)
-    tau = tau / atot
+    k = rng.pos
+    if ( k == rng.nbuf ):
+        rng.FILL()
+        k = 0
+    r = rng.buf[k]
+    rng.pos = k + 1
+
+    if ( atot > 0.0e0 ):
+        tau = math.log(1.0/r)
+        tau = tau / atot
+    else:
+        tau = float('inf')
 
     time += tau
 
+    #=== Scheduled event first? ===#
+    iskip = ( tnext is not None ) and ( time > tnext )
+
+    if ( iskip ):
+        time = tnext
+
     #=== Output current structure? ===#
-    if time > tout:
-        pass
-        # do write things
+    clock.CROSS(time,rna,sink)
+
+    if ( iskip ) or ( atot <= 0.0e0 ):
+        return rna,time
 
     #=== Fire reaction ===#
-    r,iseed = RANDOM(iseed)
+    k = rng.pos
+    if ( k == rng.nbuf ):
+        rng.FILL()
+        k = 0
+    r = rng.buf[k]
+    rng.pos = k + 1
     amax = r * atot
 
     #=== Find reaction to fire ===#
-    i = n
-
-    while (n % 2 == 0):
-        n = n / 2
-        j = i - n
-        r = rna.psum[j]
-        if (r >= amax):
-            i = j
-        else:
-            i += n
-            amax -= r
-
-    #=== Choose between i and i+1 ===#
-    r = rna.ptot[i]
-    if ( r >= amax ):
-        indx = i
-    else:
-        indx = i + 1
-        amax -= r
+    indx,amax = rna.ptree.SEARCH(amax)
 
     #=== Fire reaction ===#
     rna.LOOP_FIRE(indx,amax)
 
-    return rna,iseed,time
+    if ( mlog is not None ):
+        mlog.WRITE(time,rna)
+
+    if ( rna.echeck ):
+        CHECK_ENERGY(rna)
+
+    return rna,time
 
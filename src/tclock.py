@@ -0,0 +1,112 @@
+"""
+Class: TOUT_CLOCK (TMAX)
+
+Description: Output checkpoints of a trajectory. The structure is written
+             at the log-spaced times
+
+                 TOUT = 0.01, 0.02, ..., 0.09, 0.1, 0.2, ..., 0.9, 1, 2, ...
+
+             (nine per decade, uS) up to TMAX. SSAREACTION and the flicker
+             blocks of SSA_HYBRID write through CROSS, the sinks that
+             store the records by checkpoint (BP_AGGREGATOR, SHM_SINK) key
+             them with ICHECK and SHM_STORE is sized with NCHECK.
+
+Method: Checkpoint IC (0-based) is TOUT(IC) = IO*DT with IO = 1..9 and
+        DT = 10**(EDT0+IC/9). The time is read from its decimal form
+        IO E (EDT0+IC/9) at every checkpoint, not summed, so TOUT(IC) is
+        the float nearest to the decimal value (0.3, not 0.1+0.1+0.1),
+        the same in every trajectory and worker process.
+
+        An event at TIME ends the interval over which the structure before
+        it was held, so CROSS writes that structure at every checkpoint
+        TOUT < TIME, however many the event jumps over, and stops at TMAX
+        (a trajectory with no reactions left jumps to an infinite TIME).
+
+Arguments:
+
+         TMAX - End time of the trajectory (uS).
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies:
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import math
+
+# First checkpoint 10**EDT0 (uS) and checkpoints per decade
+edt0 = -2
+ndec = 9
+
+
+def TOUT(ic):
+
+    # Time of checkpoint IC
+
+    # INTEGER
+    # ic,io
+
+    io = ic % ndec + 1
+
+    return float('{}e{}'.format(io,edt0 + ic // ndec))
+
+
+def ICHECK(tout):
+
+    # Index of the checkpoint at time TOUT
+
+    # INTEGER
+    # idec,io
+
+    idec = int(math.floor(math.log10(tout) + 1.0e-9))
+    io = int(round(tout / 10.0**idec))
+
+    return ( idec - edt0 ) * ndec + io - 1
+
+
+def NCHECK(tmax):
+
+    # Number of checkpoints TOUT <= TMAX, the records of a run of TMAX
+
+    # INTEGER
+    # ic
+
+    ic = 0
+
+    while ( TOUT(ic) <= tmax ):
+        ic += 1
+
+    return ic
+
+
+class TOUT_CLOCK(object):
+
+    __slots__ = ('ic','tout','tmax')
+
+    def __init__(self,tmax):
+
+        self.tmax = tmax
+
+        self.ic = 0
+        self.tout = TOUT(0)
+
+    def ADVANCE(self):
+
+        self.ic += 1
+        self.tout = TOUT(self.ic)
+
+    def CROSS(self,time,rna,sink=None):
+
+        # Writes the structure of RNA at the checkpoints before TIME
+
+        while ( time > self.tout ) and ( self.tout <= self.tmax ):
+
+            if sink is not None:
+                sink.WRITE(self.tout,rna)
+
+            self.ADVANCE()
@@ -0,0 +1,206 @@
+"""
+Module: TRAJECTORY
+
+Description: Streaming trajectory sinks for the "output current structure"
+             hook of SSAREACTION. A sink receives a (time, structure,
+             energy) record at each of the log-spaced TOUT checkpoints of
+             PYFOLD and writes it out in large buffered chunks, so a
+             trajectory is never held in memory.
+
+Method: Every sink implements
+
+            BEGIN(ISIM)      - start of trajectory ISIM
+            WRITE(TIME,RNA)  - record the current structure of RNA
+            CLOSE()          - flush the buffer and close the file
+
+        TEXT_SINK writes one "time energy dot-bracket" line per record.
+
+        SINK_GROUP passes every call on to a list of sinks.
+
+        BINARY_SINK writes a compact little-endian stream in which each
+        record only holds the base pairs that changed since the previous
+        record of the same trajectory:
+
+            header  : b'PYFTRAJ1' n(int32)
+            begin   : time(f8) energy(f8) 0xFFFFFFFF isim(int32)
+            record  : time(f8) energy(f8) nchg(uint32) nchg*(i,ibsp(i))(int32)
+
+Arguments:
+
+          FILE - Output file name.
+          NBUF - Size in bytes of the write buffer.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+            10/17/2026      Several sinks on one trajectory (SINK_GROUP)
+            10/17/2026      Dot-brackets from DBCONV (IBSP2DB)
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import struct
+import numpy as np
+
+from dbconv import IBSP2DB
+
+nbuf_default = 1 << 22
+
+magic = b'PYFTRAJ1'
+ibegin = 0xFFFFFFFF
+
+rec = struct.Struct('<ddI')
+hdr = struct.Struct('<i')
+
+
+class TEXT_SINK(object):
+
+    def __init__(self,file,nbuf=nbuf_default):
+
+        self.f = open(file,'w')
+        self.nbuf = nbuf
+        self.buf = []
+        self.nb = 0
+
+    def BEGIN(self,isim):
+
+        self.PUT("# trajectory {}\n".format(isim))
+
+    def WRITE(self,time,rna):
+
+        n = rna.n
+
+        self.PUT("{:.6e} {:10.4f} {}\n".format(time,rna.etot,IBSP2DB(rna.ibsp,n)))
+
+    def PUT(self,line):
+
+        self.buf.append(line)
+        self.nb += len(line)
+
+        if ( self.nb >= self.nbuf ):
+            self.FLUSH()
+
+    def FLUSH(self):
+
+        self.f.write(''.join(self.buf))
+        self.buf = []
+        self.nb = 0
+
+    def CLOSE(self):
+
+        self.FLUSH()
+        self.f.close()
+
+
+class BINARY_SINK(object):
+
+    def __init__(self,file,n,nbuf=nbuf_default):
+
+        self.f = open(file,'wb')
+        self.n = n
+        self.nbuf = nbuf
+        self.buf = bytearray()
+
+        # Last structure written for the current trajectory
+        self.iprev = np.zeros(n+1,dtype=np.int32)
+
+        self.buf += magic
+        self.buf += hdr.pack(n)
+
+    def BEGIN(self,isim):
+
+        self.iprev[:] = 0
+
+        self.buf += rec.pack(0.0,0.0,ibegin)
+        self.buf += hdr.pack(isim)
+
+    def WRITE(self,time,rna):
+
+        n = self.n
+        e = rna.etot
+
+        ibsp = rna.ibsp[:n+1]
+        ichg = np.flatnonzero(ibsp != self.iprev)
+
+        self.buf += rec.pack(time,e,len(ichg))
+
+        if ( len(ichg) > 0 ):
+            delta = np.empty((len(ichg),2),dtype='<i4')
+            delta[:,0] = ichg
+            delta[:,1] = ibsp[ichg]
+            self.buf += delta.tobytes()
+            self.iprev[ichg] = ibsp[ichg]
+
+        if ( len(self.buf) >= self.nbuf ):
+            self.FLUSH()
+
+    def FLUSH(self):
+
+        self.f.write(self.buf)
+        del self.buf[:]
+
+    def CLOSE(self):
+
+        self.FLUSH()
+        self.f.close()
+
+
+class SINK_GROUP(object):
+
+    def __init__(self,sinks):
+
+        self.sinks = list(sinks)
+
+    def BEGIN(self,isim):
+
+        for sink in self.sinks:
+            sink.BEGIN(isim)
+
+    def WRITE(self,time,rna):
+
+        for sink in self.sinks:
+            sink.WRITE(time,rna)
+
+    def CLOSE(self):
+
+        for sink in self.sinks:
+            sink.CLOSE()
+
+
+def READ_BINARY(file):
+
+    # Generator over the records of a BINARY_SINK file, yielding
+    # (isim,time,energy,ibsp) with ibsp rebuilt from the deltas
+
+    with open(file,'rb') as f:
+
+        if ( f.read(len(magic)) != magic ):
+            raise ValueError("{} is not a PYFOLD binary trajectory.".format(file))
+
+        n = hdr.unpack(f.read(hdr.size))[0]
+
+        ibsp = np.zeros(n+1,dtype=np.int32)
+        isim = 0
+
+        while True:
+
+            head = f.read(rec.size)
+            if ( len(head) < rec.size ):
+                break
+
+            time,e,nchg = rec.unpack(head)
+
+            if ( nchg == ibegin ):
+                isim = hdr.unpack(f.read(hdr.size))[0]
+                ibsp[:] = 0
+                continue
+
+            if ( nchg > 0 ):
+                delta = np.frombuffer(f.read(8*nchg),dtype='<i4').reshape(nchg,2)
+                ibsp[delta[:,0]] = delta[:,1]
+
+            yield isim,time,e,ibsp
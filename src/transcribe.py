@@ -0,0 +1,80 @@
+"""
+Module: TRANSCRIBE
+
+Description: Polymerase elongation clock for co-transcriptional folding.
+
+Method: The RNA starts as a prefix of NSTART nucleotides and nucleotide k
+        (k = NSTART+1,...,N) is appended at time
+
+            TADD(k) = TADD(k-1) + 1/RATE + PAUSE(k),   TADD(NSTART) = 0
+
+        where RATE is the elongation rate (nt/s) and PAUSE(k) the dwell
+        time (s) of the polymerase before adding nucleotide k. Times are
+        converted to the uS of the kinetics core.
+
+        The next addition time TNEXT is passed to SSAREACTION, which
+        stops at TNEXT instead of firing when the next folding event
+        would fall after it (exact, since the waiting times of the SSA
+        are memoryless). PYFOLD_TRAJECTORY then appends the nucleotide
+        with LOOP_GROW.
+
+Arguments:
+
+            N - Full length of the transcript.
+         RATE - Elongation rate (nt/s).
+       PAUSES - Dict {k: dwell time (s)} of pause sites (optional).
+       NSTART - Length of the initial prefix (default min(N,10)).
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import numpy as np
+
+# seconds -> uS
+tunit = 1.0e6
+
+class TRANSCRIPTION(object):
+
+    def __init__(self,n,rate,pauses=None,nstart=None):
+
+        if ( rate <= 0.0 ):
+            raise ValueError("Elongation rate must be positive, got {}.".format(rate))
+
+        if nstart is None:
+            nstart = min(n,10)
+
+        if ( nstart < 1 ) or ( nstart > n ):
+            raise ValueError("Initial prefix length {} outside [1,{}].".format(nstart,n))
+
+        self.n = n
+        self.rate = rate
+        self.nstart = nstart
+
+        # Time of addition of nt k, relative to the start of the trajectory
+        dwell = np.full(n+1,1.0/rate)
+
+        if pauses is not None:
+            for k,t in pauses.items():
+                if ( k > nstart ) and ( k <= n ):
+                    dwell[k] += t
+
+        dwell[:nstart+1] = 0.0
+
+        self.tadd = tunit * np.cumsum(dwell)
+
+    def TNEXT(self,n,tstart=0.0):
+
+        # Time nt n+1 is added, None once the transcript is complete
+
+        if ( n >= self.n ):
+            return None
+
+        return tstart + float(self.tadd[n+1])
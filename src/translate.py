@@ -0,0 +1,239 @@
+"""
+Module: TRANSLATE
+
+Description: Ribosome traffic on an mRNA for co-translational folding.
+             Ribosomes load at the start codon, advance one codon at a
+             time at a codon dependent rate and mask a footprint of
+             FOOTPRINT nt from base pairing (see LOOP_MASK).
+
+Method: A ribosome with its P site at nt p covers
+
+            [p - OFFSET, p - OFFSET + FOOTPRINT - 1]
+
+        (clipped to 1..N). The traffic is a continuous time exclusion
+        process (TASEP) with extended particles:
+
+          - initiation at rate KINIT (1/s) puts a ribosome at ISTART if
+            the last one loaded has moved at least FOOTPRINT nt on,
+          - a ribosome at p advances to p+3 at the rate of its codon
+            (codons/s) if the ribosome ahead is at least FOOTPRINT+3 nt
+            away,
+          - the ribosome at ISTOP terminates at the rate of the stop
+            codon and leaves the mRNA.
+
+        Every ribosome and the initiation have their own exponential
+        clock. A clock that rings on a blocked move is redrawn, which is
+        exact for memoryless clocks. The next event time TNEXT is passed
+        to SSAREACTION as for TRANSCRIPTION, and FIRE moves the masks: an
+        advance uncovers the 3 nt at the trailing edge and covers the
+        3 nt at the leading edge, so only the loops at the edges of the
+        footprint are recomputed.
+
+Arguments:
+
+          SEQ - mRNA sequence.
+       ISTART - First nt of the start codon (default, the first AUG).
+        ISTOP - First nt of the stop codon (default, the first in frame
+                UAA, UAG or UGA after ISTART, else the last full codon).
+        RATES - Elongation rate (codons/s), a single rate or a dict
+                {codon: rate} with RATE for the missing codons.
+         RATE - Default elongation rate (codons/s).
+        KINIT - Initiation rate (1/s).
+    FOOTPRINT - Nucleotides covered by a ribosome.
+       OFFSET - Nucleotides covered 5' of the P site.
+
+History:
+Version     Date            Comment
+--------    -------         --------------------
+            10/17/2026      Original Code
+
+Dependencies: numpy
+
+Author(s): Alex Reis
+           Copyright (c) 2017 (Please refer to LICENCE)
+"""
+
+import math
+
+import numpy as np
+
+from transcribe import tunit
+
+stops = ('UAA','UAG','UGA')
+
+class TRANSLATION(object):
+
+    def __init__(self,seq,istart=None,istop=None,rates=None,rate=10.0,kinit=0.1,
+                 footprint=30,offset=12):
+
+        seq = seq.upper().replace('T','U')
+        n = len(seq)
+
+        if istart is None:
+            istart = seq.find('AUG') + 1
+            if ( istart == 0 ):
+                raise ValueError("No start codon (AUG) in the sequence.")
+
+        if istop is None:
+            istop = istart
+            while ( istop + 2 <= n ) and ( seq[istop-1:istop+2] not in stops ):
+                istop += 3
+            if ( istop + 2 > n ):
+                istop -= 3
+
+        if ( istart < 1 ) or ( istop + 2 > n ) or ( istop < istart ) or \
+           ( (istop - istart) % 3 != 0 ):
+            raise ValueError("Open reading frame {}-{} is not a whole number of codons in 1-{}.".format(
+                             istart,istop+2,n))
+
+        if ( kinit <= 0.0 ) or ( footprint < 3 ) or ( offset < 0 ) or ( offset >= footprint ):
+            raise ValueError("Invalid ribosome settings: kinit={}, footprint={}, offset={}.".format(
+                             kinit,footprint,offset))
+
+        self.n = n
+        self.istart = istart
+        self.istop = istop
+        self.kinit = kinit
+        self.footprint = footprint
+        self.offset = offset
+
+        # Rate of the codon at each P site of the frame (codons/s)
+        self.rate = {}
+
+        for p in range(istart,istop+1,3):
+
+            codon = seq[p-1:p+2]
+
+            if isinstance(rates,dict):
+                r = rates.get(codon,rate)
+            elif rates is not None:
+                r = rates
+            else:
+                r = rate
+
+            if ( r <= 0.0 ):
+                raise ValueError("Rate of codon {} at {} must be positive, got {}.".format(codon,p,r))
+
+            self.rate[p] = r
+
+        self.RESET(None)
+
+    def RESET(self,rng,tstart=0.0):
+
+        # No ribosomes, initiation clock started at TSTART
+
+        self.rng = rng
+
+        # P sites from the 3' end, and the ring times of their clocks
+        self.pos = []
+        self.tpos = []
+
+        self.tinit = None
+        if rng is not None:
+            self.tinit = tstart + self.CLOCK(self.kinit)
+
+        # Events fired, blocked and pairs unwound
+        self.ninit = 0
+        self.nstep = 0
+        self.nterm = 0
+        self.nblock = 0
+        self.nunwind = 0
+
+    def CLOCK(self,rate):
+
+        # Exponential waiting time (uS) of a move of RATE (1/s)
+
+        return tunit * math.log(1.0/self.rng.UNIFORM()) / rate
+
+    def WINDOW(self,p):
+
+        return p - self.offset, p - self.offset + self.footprint - 1
+
+    def TNEXT(self):
+
+        if not self.tpos:
+            return self.tinit
+
+        return min(self.tinit,min(self.tpos))
+
+    def FIRE(self,rna,time):
+
+        # Fires the ribosome event due at TIME, returns the number of pairs
+        # unwound
+
+        # INTEGER
+        # k,p,ia,ib,nbrk
+
+        nbrk = 0
+
+        #=== Initiation ===#
+
+        if ( not self.tpos ) or ( self.tinit <= min(self.tpos) ):
+
+            self.tinit = time + self.CLOCK(self.kinit)
+
+            if self.pos and ( self.pos[-1] - self.istart < self.footprint ):
+                self.nblock += 1
+                return 0
+
+            p = self.istart
+
+            self.pos.append(p)
+            self.tpos.append(time + self.CLOCK(self.rate[p]))
+
+            ia,ib = self.WINDOW(p)
+            nbrk = rna.LOOP_MASK(ia,ib,1)
+
+            self.ninit += 1
+            self.nunwind += nbrk
+
+            return nbrk
+
+        #=== Elongation or termination of ribosome k ===#
+
+        k = int(np.argmin(self.tpos))
+        p = self.pos[k]
+
+        ia,ib = self.WINDOW(p)
+
+        if ( p == self.istop ):
+
+            del self.pos[k]
+            del self.tpos[k]
+
+            rna.LOOP_MASK(ia,ib,-1)
+
+            self.nterm += 1
+
+            return 0
+
+        # ribosome ahead (k-1) must stay clear of the new footprint
+        if ( k > 0 ) and ( self.pos[k-1] - (p + 3) < self.footprint ):
+            self.tpos[k] = time + self.CLOCK(self.rate[p])
+            self.nblock += 1
+            return 0
+
+        p += 3
+
+        self.pos[k] = p
+        self.tpos[k] = time + self.CLOCK(self.rate[p])
+
+        rna.LOOP_MASK(ia,ia+2,-1)
+        nbrk = rna.LOOP_MASK(ib+1,ib+3,1)
+
+        self.nstep += 1
+        self.nunwind += nbrk
+
+        return nbrk
+
+    def STATS(self):
+
+        out = {}
+        out['init']    = self.ninit
+        out['step']    = self.nstep
+        out['term']    = self.nterm
+        out['blocked'] = self.nblock
+        out['unwound'] = self.nunwind
+        out['loaded']  = len(self.pos)
+
+        return out
@@ -1,80 +1,50 @@
 """
-Subroutine: V2CT (IBSP,FLD,JOB,N)
+Subroutine: V2CT (FLD), CT2V (IBSP,N)
 
-Description: Converts a secondary structure from either Vienna format
-       to CT format, or CT to Vienna.
+Description: Converts a secondary structure from Vienna format to CT
+       format (V2CT), or CT to Vienna (CT2V).
 
 Arguments:
 
-      IBSP - Base-pair information for the RNA.
-       FLD - Vienna fold for the RNA.
-       JOB - Conversion job to perform.
-         JOB = 'V' Convert to Vienna Format
-         JOB = 'C' Convert to CT Format.
-       N - Number of nucleotides in the RNA.
+       FLD - Vienna fold for the RNA, nested ('(' and ')').
+      IBSP - Base-pair information for the RNA, 0-based with -1 for an
+             unpaired nucleotide (see DBCONV).
+         N - Number of nucleotides in the RNA.
+
+       V2CT returns IBSP and CT2V returns FLD. Both raise ValueError on a
+       malformed structure, CT2V also on crossing pairs.
 
 History:
 Version     Date            Comment
 --------    -------         --------------------
       09/28/2017      Original Code
+      10/17/2026      Wrappers of DBCONV, -1 for unpaired
+      10/17/2026      Header and arguments of the wrappers
 
-Dependencies:
+Dependencies: numpy
 
 Author(s): Alex Reis
        Copyright (c) 2017 (Please refer to LICENCE)
 """
 
+from dbconv import DB2PT, PT2DB
+
 def V2CT(fld):
 
   # INTEGERS
-  # n,ibsp(n),i,j,count,istack(n)
+  # ibsp(n)
 
   # STRING
   # fld(n)
 
-  n = len(fld)
-
-  s = 0
-
-  ibsp   = [0]*n
-  istack = [0]*n
-
-  for i in range(0,n):
-
-    if fld[i] == '.':
-      ibsp[i] = 0
-
-    elif fld[i] == '(':
-      s += 1
-      istack[s] = i
-
-    elif fld[i] == ')':
-      j = istack[s]
-      ibsp[j] = i
-      ibsp[i] = j
-      s -= 1
-
-  return ibsp
+  return DB2PT(fld,'()')
 
 def CT2V(ibsp,n):
 
   # INTEGERS
-  # n,ibsp(n),i,j,count,istack(n)
+  # n,ibsp(n)
 
   # STRING
   # fld(n)
 
-  for i in range(0,n):
-
-    if ( ibsp[i] == 0 ):
-      fld[i] = '.'
-    else:
-      j = ibsp[i]
-      if ( j > i ):
-        fld[i] = '('
-        fld[j] = ')'
-      else:
-        fld[i] = ')'
-        fld[j] = '('
-
-  return fld
\ No newline at end of file
+  return PT2DB(ibsp[:n])